@@ -0,0 +1,75 @@
+"""Benchmarks for checking child cells in worker processes.
+
+Run with `python benchmarks/bench_checks.py [--cells 40] [--straights 60]
+[--workers 1 2 4]`.
+
+The top cell places `--cells` child cells, each a chain of `--straights`
+connected straights with a width mismatch at every other connection. The
+recursive `connectivity_check` is timed for each number of workers and the
+reports are compared with the serial one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import TYPE_CHECKING
+
+import kfactory as kf
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def build(n_cells: int, n_straights: int) -> kf.KCell:
+    kcl = kf.KCLayout("bench_checks")
+    wg = kf.kdb.LayerInfo(1, 0)
+    straight = kf.factories.straight.straight_dbu_factory(kcl=kcl)
+    top = kcl.kcell("top")
+    for i in range(n_cells):
+        c = kcl.kcell(f"chain_{i}")
+        prev = None
+        for j in range(n_straights):
+            s = c << straight(
+                width=500 + 100 * (j % 2), length=10_000 + i * 1000, layer=wg
+            )
+            if prev is not None:
+                s.connect("o1", prev, "o2", allow_width_mismatch=True)
+            prev = s
+        top.create_inst(c, kf.kdb.Trans(0, i * 10_000))
+    return top
+
+
+def items(db: kf.rdb.ReportDatabase) -> list[tuple[str, str, list[str]]]:
+    return [
+        (
+            db.cell_by_id(item.cell_id()).qname(),
+            db.category_by_id(item.category_id()).path(),
+            [value.to_s() for value in item.each_value()],
+        )
+        for item in db.each_item()
+    ]
+
+
+def run(n_cells: int, n_straights: int, workers: Sequence[int]) -> None:
+    top = build(n_cells, n_straights)
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'workers':>8} {'time':>8} {'items':>7} {'same':>5}")
+    reference = None
+    for n in workers:
+        t = time.perf_counter()
+        db = top.connectivity_check(max_workers=n)
+        t = time.perf_counter() - t
+        result = items(db)
+        reference = reference or result
+        print(f"{n:>8} {t:8.3f} {len(result):>7} {result == reference!s:>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=int, default=40)
+    parser.add_argument("--straights", type=int, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    run(args.cells, args.straights, args.workers)
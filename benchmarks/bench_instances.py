@@ -0,0 +1,83 @@
+"""Benchmarks for bulk instance creation via `create_insts`.
+
+Run with `python benchmarks/bench_instances.py [--sizes 1000 10000]`.
+
+The placement distributions:
+
+- `lattice`: a full regular grid, inserted as one instance array.
+- `irregular`: uniformly scattered displacements which don't form a lattice.
+- `rotated`: irregular displacements with alternating rotations, so the
+  placements don't share a common base transformation.
+
+Each distribution is compared with a loop of `create_inst` calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import kfactory as kf
+from kfactory import kdb
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+CHIP = 10_000_000
+
+
+def lattice(n: int, rng: np.random.Generator) -> list[kdb.Trans]:
+    cols = int(np.sqrt(n))
+    pitch = CHIP // cols
+    return [kdb.Trans((i % cols) * pitch, (i // cols) * pitch) for i in range(n)]
+
+
+def irregular(n: int, rng: np.random.Generator) -> list[kdb.Trans]:
+    return [kdb.Trans(int(x), int(y)) for x, y in rng.integers(0, CHIP, (n, 2))]
+
+
+def rotated(n: int, rng: np.random.Generator) -> list[kdb.Trans]:
+    return [
+        kdb.Trans(i % 4, False, int(x), int(y))
+        for i, (x, y) in enumerate(rng.integers(0, CHIP, (n, 2)))
+    ]
+
+
+def timed(f: Callable[[], object]) -> float:
+    t = time.perf_counter()
+    f()
+    return time.perf_counter() - t
+
+
+def run(sizes: Sequence[int]) -> None:
+    rng = np.random.default_rng(42)
+    kcl = kf.KCLayout("bench_instances")
+    child = kcl.kcell("child")
+    child.shapes(kcl.layer(1, 0)).insert(kdb.Box(1000))
+    print(f"{'distribution':>12} {'n':>7} {'loop':>8} {'bulk':>8} {'access':>8}")
+    for name, gen in (
+        ("lattice", lattice),
+        ("irregular", irregular),
+        ("rotated", rotated),
+    ):
+        for n in sizes:
+            transs = gen(n, rng)
+            loop_cell = kcl.kcell(f"loop_{name}_{n}")
+            t_loop = timed(
+                lambda: [loop_cell.create_inst(child, t) for t in transs]  # noqa: B023
+            )
+            bulk_cell = kcl.kcell(f"bulk_{name}_{n}")
+            t_bulk = timed(lambda: bulk_cell.create_insts(child, transs))  # noqa: B023
+            group = bulk_cell.create_insts(child, transs)
+            t_access = timed(lambda: [inst.trans for inst in group])  # noqa: B023
+            print(f"{name:>12} {n:>7} {t_loop:8.3f} {t_bulk:8.3f} {t_access:8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+    run(args.sizes)
@@ -0,0 +1,369 @@
+"""Benchmarks for the routers in `kfactory.routing`.
+
+Run with `python benchmarks/bench_routing.py [--sizes 10 100 1000 10000]`.
+
+Every scenario is generated for `n` routes (or obstacles) on a fresh layout:
+
+- `bundle`: N-to-N bundle between two facing port columns with an offset.
+- `uturn`: 180° turns, start and end ports face the same direction.
+- `waypoints`: bundle routed through two waypoints.
+- `fanin`: wide pitch start ports fanning into a dense end port array.
+- `fanin_unsorted`: `fanin` with shuffled end ports and `sort_ports=True`.
+- `length_match`: `fanin` with a `PathLengthMatch` constraint on all routes.
+- `electrical`: `bundle` placed with `routing.electrical.route_bundle`.
+- `obstacles`: four routes across a part of a field of `n` obstacles with
+  `route_around_obstacles` (routing only, nothing is placed).
+- `all_angle`: bundle along a non-manhattan backbone with the all-angle router.
+- `bundles`: independent bundles of eight routes each with `route_smart`
+  (routing only, nothing is placed).
+- `bundles_parallel`: `bundles` routed by four worker processes.
+
+Time is measured without tracing. Memory is the peak of Python allocations
+(`tracemalloc`) in a second run, allocations of KLayout itself are not
+included. Use `--json` to store the results for comparison between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from functools import partial
+from itertools import count
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import kfactory as kf
+from kfactory import kdb
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+PITCH = 5_000
+WIDTH = 500
+SEPARATION = 2_000
+RADIUS = 10  # um
+
+_layout_ids = count()
+
+
+class Layers(kf.LayerInfos):
+    WG: kdb.LayerInfo = kdb.LayerInfo(1, 0)
+    M1: kdb.LayerInfo = kdb.LayerInfo(20, 0)
+
+
+LAYERS = Layers()
+
+
+def _layout(name: str) -> tuple[kf.KCLayout, kf.KCell]:
+    kcl = kf.KCLayout(f"bench_{name}_{next(_layout_ids)}", infos=Layers)
+    return kcl, kcl.kcell(name)
+
+
+def _ports(
+    kcl: kf.KCLayout,
+    prefix: str,
+    transformations: Sequence[kdb.Trans],
+    layer_info: kdb.LayerInfo = LAYERS.WG,
+    width: int = WIDTH,
+) -> list[kf.Port]:
+    return [
+        kf.Port(
+            name=f"{prefix}{i}",
+            trans=trans,
+            width=width,
+            layer_info=layer_info,
+            kcl=kcl,
+        )
+        for i, trans in enumerate(transformations)
+    ]
+
+
+def _optical(
+    c: kf.KCell,
+    start_ports: list[kf.Port],
+    end_ports: list[kf.Port],
+    **kwargs: object,
+) -> Callable[[], object]:
+    straight = partial(
+        kf.factories.straight.straight_dbu_factory(kcl=c.kcl), layer=LAYERS.WG
+    )
+    bend90 = kf.factories.circular.bend_circular_factory(kcl=c.kcl)(
+        width=WIDTH * c.kcl.dbu, radius=RADIUS, layer=LAYERS.WG, angle=90
+    )
+    return partial(
+        kf.routing.optical.route_bundle,
+        c,
+        start_ports,
+        end_ports,
+        separation=SEPARATION,
+        straight_factory=straight,
+        bend90_cell=bend90,
+        on_collision=None,
+        on_placer_error="error",
+        **kwargs,
+    )
+
+
+def bundle(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    kcl, c = _layout("bundle")
+    start = [kdb.Trans(0, False, 0, i * PITCH) for i in range(n)]
+    end = [kdb.Trans(2, False, 500_000, 200_000 + i * PITCH) for i in range(n)]
+    return _optical(c, _ports(kcl, "in", start), _ports(kcl, "out", end))
+
+
+def uturn(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    kcl, c = _layout("uturn")
+    start = [kdb.Trans(0, False, 0, i * PITCH) for i in range(n)]
+    end = [kdb.Trans(0, False, 0, -100_000 - i * PITCH) for i in range(n)]
+    return _optical(c, _ports(kcl, "in", start), _ports(kcl, "out", end))
+
+
+def waypoints(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    kcl, c = _layout("waypoints")
+    start = [kdb.Trans(0, False, 0, i * PITCH) for i in range(n)]
+    end = [kdb.Trans(2, False, 500_000, 0) * t for t in start]
+    return _optical(
+        c,
+        _ports(kcl, "in", start),
+        _ports(kcl, "out", end),
+        waypoints=[kdb.Point(250_000, 0), kdb.Point(250_000, 100_000)],
+    )
+
+
+def _fanin(
+    name: str, n: int, rng: np.random.Generator, *, shuffle: bool = False
+) -> tuple[kf.KCell, list[kf.Port], list[kf.Port]]:
+    kcl, c = _layout(name)
+    wide = 10 * PITCH
+    start = [kdb.Trans(1, False, i * wide, 0) for i in range(n)]
+    x0 = (n - 1) * (wide - PITCH) // 2
+    height = 200_000 + n * PITCH
+    end = [kdb.Trans(3, False, x0 + i * PITCH, height) for i in range(n)]
+    if shuffle:
+        end = [end[i] for i in rng.permutation(n)]
+    return c, _ports(kcl, "in", start), _ports(kcl, "out", end)
+
+
+def fanin(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    return _optical(*_fanin("fanin", n, rng))
+
+
+def fanin_unsorted(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    return _optical(*_fanin("fanin_unsorted", n, rng, shuffle=True), sort_ports=True)
+
+
+def length_match(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    return _optical(
+        *_fanin("length_match", n, rng),
+        constraints=[kf.PathLengthMatch(route_names=["bench"])],
+        route_name="bench",
+    )
+
+
+def electrical(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    kcl, c = _layout("electrical")
+    width = 2 * WIDTH
+    start = [kdb.Trans(0, False, 0, i * PITCH) for i in range(n)]
+    end = [kdb.Trans(2, False, 500_000, 200_000 + i * PITCH) for i in range(n)]
+    return partial(
+        kf.routing.electrical.route_bundle,
+        c,
+        _ports(kcl, "in", start, LAYERS.M1, width),
+        _ports(kcl, "out", end, LAYERS.M1, width),
+        separation=SEPARATION,
+        on_collision=None,
+        on_placer_error="error",
+    )
+
+
+def obstacles(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    cols = max(int(np.sqrt(n)), 1)
+    rows = -(-n // cols)
+    cell = 80_000
+    # one obstacle per grid cell, inside `[10um, 60um)` of the cell, so there
+    # are free corridors around `-5um` of every cell
+    sizes = rng.integers(10_000, 30_000, (n, 2))
+    offsets = rng.integers(10_000, 30_000, (n, 2))
+    boxes = [
+        kdb.Box(
+            (i % cols) * cell + int(ox),
+            (i // cols) * cell + int(oy),
+            (i % cols) * cell + int(ox + w),
+            (i // cols) * cell + int(oy + h),
+        )
+        for i, ((w, h), (ox, oy)) in enumerate(zip(sizes, offsets, strict=True))
+    ]
+    # the routes cross a few cells in the middle of the field and change rows
+    x = (cols // 2 - 3) * cell - 5_000
+    ys = [(rows // 2 - 2 + i) * cell - 5_000 for i in range(4)]
+    start = [kdb.Trans(0, False, x, y) for y in ys]
+    end = [kdb.Trans(2, False, x + 6 * cell, y + cell) for y in ys]
+    return partial(
+        kf.routing.manhattan.route_around_obstacles,
+        start_ports=start,
+        end_ports=end,
+        widths=[WIDTH] * 4,
+        bend90_radius=RADIUS * 1000,
+        separation=SEPARATION,
+        starts=[[]] * 4,
+        ends=[[]] * 4,
+        obstacles=boxes,
+    )
+
+
+def all_angle(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    kcl, c = _layout("all_angle")
+    width, separation = WIDTH * kcl.dbu, SEPARATION * kcl.dbu
+    # horizontal, 45° and horizontal again
+    d = n * (width + separation) + 200
+    backbone = [
+        kdb.DPoint(100, 0),
+        kdb.DPoint(100 + d, 0),
+        kdb.DPoint(100 + 2 * d, d),
+        kdb.DPoint(100 + 3 * d, d),
+    ]
+    # the ports are in line with the lanes of the bundle
+    lanes = kf.routing.aa.optical.backbone2bundle(
+        backbone, [width] * n, [separation] * n
+    )
+    start_ports = [
+        c.create_port(
+            name=f"in{i}",
+            dcplx_trans=kdb.DCplxTrans(1, 0, False, 0, lane[0].y),
+            layer_info=LAYERS.WG,
+            width=WIDTH,
+        )
+        for i, lane in enumerate(lanes)
+    ]
+    end_ports = [
+        c.create_port(
+            name=f"out{i}",
+            dcplx_trans=kdb.DCplxTrans(1, 180, False, 200 + 3 * d, lane[-1].y),
+            layer_info=LAYERS.WG,
+            width=WIDTH,
+        )
+        for i, lane in enumerate(lanes)
+    ]
+    return partial(
+        kf.routing.aa.optical.route_bundle,
+        c,
+        start_ports=start_ports,
+        end_ports=end_ports,
+        backbone=backbone,
+        separation=[separation] * n,
+        straight_factory=partial(
+            kf.factories.virtual.straight.virtual_straight_factory(kcl=kcl),
+            layer=LAYERS.WG,
+        ),
+        bend_factory=partial(
+            kf.factories.virtual.euler.virtual_bend_euler_factory(kcl=kcl),
+            layer=LAYERS.WG,
+            radius=RADIUS,
+            width=width,
+        ),
+    )
+
+
+def _bundles(n: int, max_workers: int) -> Callable[[], object]:
+    start: list[kdb.Trans] = []
+    end: list[kdb.Trans] = []
+    for i in range(n):
+        x = i // 8 * 1_000_000 + i % 8 * PITCH
+        start.append(kdb.Trans(1, False, x, 0))
+        end.append(kdb.Trans(3, False, x + 300_000, 500_000))
+    return partial(
+        kf.routing.manhattan.route_smart,
+        start_ports=start,
+        end_ports=end,
+        widths=[WIDTH] * n,
+        bend90_radius=RADIUS * 1000,
+        separation=SEPARATION,
+        starts=[[]] * n,
+        ends=[[]] * n,
+        max_workers=max_workers,
+    )
+
+
+def bundles(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    return _bundles(n, 1)
+
+
+def bundles_parallel(n: int, rng: np.random.Generator) -> Callable[[], object]:
+    return _bundles(n, 4)
+
+
+SCENARIOS: dict[str, Callable[[int, np.random.Generator], Callable[[], object]]] = {
+    "bundle": bundle,
+    "uturn": uturn,
+    "waypoints": waypoints,
+    "fanin": fanin,
+    "fanin_unsorted": fanin_unsorted,
+    "length_match": length_match,
+    "electrical": electrical,
+    "obstacles": obstacles,
+    "all_angle": all_angle,
+    "bundles": bundles,
+    "bundles_parallel": bundles_parallel,
+}
+
+
+def measure(
+    scenario: Callable[[int, np.random.Generator], Callable[[], object]],
+    n: int,
+    *,
+    memory: bool,
+) -> tuple[float, float | None]:
+    """Time and peak traced memory (MiB) of one routing call."""
+    route = scenario(n, np.random.default_rng(42))
+    t = time.perf_counter()
+    route()
+    t_route = time.perf_counter() - t
+    if not memory:
+        return t_route, None
+    route = scenario(n, np.random.default_rng(42))
+    tracemalloc.start()
+    try:
+        route()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return t_route, peak / 2**20
+
+
+def run(
+    scenarios: Sequence[str],
+    sizes: Sequence[int],
+    *,
+    memory: bool,
+    json_path: str | None,
+) -> None:
+    results: list[dict[str, object]] = []
+    print(f"{'scenario':>14} {'n':>7} {'time':>9} {'memory':>10}")
+    for name in scenarios:
+        for n in sizes:
+            t, peak = measure(SCENARIOS[name], n, memory=memory)
+            mem = f"{peak:7.1f}MiB" if peak is not None else f"{'-':>10}"
+            print(f"{name:>14} {n:>7} {t:9.3f} {mem}", flush=True)
+            results.append(
+                {"scenario": name, "n": n, "time": t, "peak_memory_mib": peak}
+            )
+    if json_path is not None:
+        with open(json_path, "w") as f:  # noqa: PTH123
+            json.dump({"kfactory": kf.__version__, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the traced memory run."
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+    run(args.scenarios, args.sizes, memory=not args.no_memory, json_path=args.json)
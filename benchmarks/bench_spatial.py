@@ -0,0 +1,120 @@
+"""Benchmarks for the spatial index in `kfactory.spatial`.
+
+Run with `python benchmarks/bench_spatial.py [--sizes 1000 10000]`.
+
+The box distributions mimic typical layouts:
+
+- `devices`: small, uniformly scattered instance bounding boxes.
+- `buses`: long horizontal waveguides/buses spanning the whole chip plus
+  devices. All buses share one x-range, the worst case for a 1D sweep.
+- `array`: a regular array of abutting cells.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from kfactory import kdb
+from kfactory.spatial import BoxIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+CHIP = 10_000_000
+
+
+def devices(n: int, rng: np.random.Generator) -> list[kdb.Box]:
+    x, y = rng.integers(0, CHIP, (2, n))
+    w, h = rng.integers(10_000, 200_000, (2, n))
+    return [
+        kdb.Box(int(x_), int(y_), int(x_ + w_), int(y_ + h_))
+        for x_, y_, w_, h_ in zip(x, y, w, h, strict=True)
+    ]
+
+
+def buses(n: int, rng: np.random.Generator) -> list[kdb.Box]:
+    n_bus = n // 4
+    pitch = CHIP // n_bus
+    return [
+        kdb.Box(0, i * pitch, CHIP, i * pitch + pitch // 2) for i in range(n_bus)
+    ] + devices(n - n_bus, rng)
+
+
+def array(n: int, rng: np.random.Generator) -> list[kdb.Box]:
+    cols = int(np.sqrt(n))
+    pitch = CHIP // cols
+    return [
+        kdb.Box(
+            (i % cols) * pitch,
+            (i // cols) * pitch,
+            (i % cols + 1) * pitch,
+            (i // cols + 1) * pitch,
+        )
+        for i in range(n)
+    ]
+
+
+def sweep_pairs(boxes: Sequence[kdb.Box]) -> Iterator[tuple[int, int]]:
+    """The previous 1D sweep of `iter_overlapping_bbox_pairs`, as reference."""
+    ordered = sorted(enumerate(boxes), key=lambda item: (item[1].left, item[1].bottom))
+    active: dict[int, kdb.Box] = {}
+    active_rights: list[tuple[int, int]] = []
+    for idx, bbox in ordered:
+        while active_rights and active_rights[0][0] < bbox.left:
+            _, old_idx = heapq.heappop(active_rights)
+            active.pop(old_idx, None)
+        for other_idx, other_bbox in active.items():
+            if not (other_bbox & bbox).empty():
+                yield idx, other_idx
+        active[idx] = bbox
+        heapq.heappush(active_rights, (bbox.right, idx))
+
+
+def timed(f: Callable[[], object]) -> float:
+    t = time.perf_counter()
+    f()
+    return time.perf_counter() - t
+
+
+def run(sizes: Sequence[int], sweep_limit: int) -> None:
+    rng = np.random.default_rng(42)
+    print(
+        f"{'distribution':>12} {'n':>7} {'build':>8} {'pairs':>8} {'sweep':>8}"
+        f" {'1k query':>9} {'100 nn':>8}"
+    )
+    for name, gen in (("devices", devices), ("buses", buses), ("array", array)):
+        for n in sizes:
+            boxes = gen(n, rng)
+            t_build = timed(lambda: BoxIndex(boxes))  # noqa: B023
+            index = BoxIndex(boxes)
+            t_pairs = timed(index.overlapping_pairs)
+            t_sweep = (
+                f"{timed(lambda: list(sweep_pairs(boxes))):8.3f}"  # noqa: B023
+                if n <= sweep_limit
+                else f"{'-':>8}"
+            )
+            queries = devices(1000, rng)
+            t_query = timed(lambda: [index.query(q) for q in queries])  # noqa: B023
+            t_nn = timed(lambda: [index.nearest(q, 5) for q in queries[:100]])  # noqa: B023
+            print(
+                f"{name:>12} {n:>7} {t_build:8.3f} {t_pairs:8.3f} {t_sweep}"
+                f" {t_query:9.3f} {t_nn:8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument(
+        "--sweep-limit",
+        type=int,
+        default=10_000,
+        help="Skip the 1D sweep reference for more boxes than this.",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.sweep_limit)
@@ -8,7 +8,24 @@ verification, but can be called individually for narrower checks.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import hashlib
+import json
+import multiprocessing
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    NamedTuple,
+    Self,
+    TextIO,
+    TypedDict,
+    cast,
+    overload,
+)
+from xml.sax.saxutils import escape as xml_escape
 
 from kfnetlist import PortCheck, check_connection
 
@@ -17,16 +34,22 @@ from .layer import LayerEnum
 from .port import create_port_error, port_polygon
 from .ports import Ports
 from .spatial import collect_instance_region, iter_overlapping_bbox_pairs
+from .utilities import get_session_directory
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import Callable, Iterable, Iterator
 
     from .instance import ProtoTInstance
     from .kcell import KCell, ProtoTKCell
+    from .layout import KCLayout
     from .port import Port, ProtoPort
 
 
 __all__ = [
+    "CheckCache",
+    "ReportSink",
+    "StreamingReport",
+    "SummaryReport",
     "dangling_ports_check",
     "instance_overlap_check",
     "port_mismatch_check",
@@ -39,10 +62,11 @@ type InstPortMap = dict[
     LayerEnum | int,
     dict[tuple[int, int], list[tuple[Port, KCell, str, ProtoTInstance[Any]]]],
 ]
+type ReportDB = rdb.ReportDatabase | ReportSink
 
 
 def _layer_cat_factory(
-    db: rdb.ReportDatabase, cell: ProtoTKCell[Any]
+    db: ReportDB, cell: ProtoTKCell[Any]
 ) -> Callable[[int], rdb.RdbCategory]:
     """Return a memoised helper that maps a layer index to its RDB category."""
     layer_cats: dict[int, rdb.RdbCategory] = {}
@@ -61,7 +85,7 @@ def _layer_cat_factory(
 
 
 def _get_or_create_subcategory(
-    db: rdb.ReportDatabase, parent: rdb.RdbCategory, name: str
+    db: ReportDB, parent: rdb.RdbCategory, name: str
 ) -> rdb.RdbCategory:
     return db.category_by_path(f"{parent.path()}.{name}") or db.create_category(
         parent, name
@@ -113,23 +137,630 @@ def _collect_inst_ports(
     return inst_ports
 
 
+type _CellCheck = Callable[[ProtoTKCell[Any], ReportDB, CheckCache | None], object]
+
+
+class _WorkerResult(NamedTuple):
+    report: _CachedReport
+    cache_entries: dict[str, _CachedReport]
+    cache_hits: int
+    cache_misses: int
+
+
+_worker_job: tuple[_CellCheck, KCLayout, CheckCache | None] | None = None
+
+
+def _init_worker(job: tuple[_CellCheck, KCLayout, CheckCache | None]) -> None:
+    global _worker_job  # noqa: PLW0603
+    _worker_job = job
+
+
+def _check_in_worker(cell_index: int) -> _WorkerResult:
+    """Check one cell in a forked worker and return the serialized report.
+
+    The worker's copy of the cache is used as well. Its new entries and counter
+    changes are returned so the parent can add them to its cache.
+    """
+    assert _worker_job is not None
+    check, kcl, cache = _worker_job
+    db = rdb.ReportDatabase(kcl[cell_index].name)
+    if cache is None:
+        check(kcl[cell_index], db, None)
+        return _WorkerResult(_serialize_report(db), {}, 0, 0)
+    known = set(cache._reports)
+    hits, misses = cache.hits, cache.misses
+    check(kcl[cell_index], db, cache)
+    return _WorkerResult(
+        _serialize_report(db),
+        {k: v for k, v in cache._reports.items() if k not in known},
+        cache.hits - hits,
+        cache.misses - misses,
+    )
+
+
+def _run_per_cell(
+    cells: list[ProtoTKCell[Any]],
+    check: _CellCheck,
+    db: ReportDB,
+    *,
+    max_workers: int = 1,
+    cache: CheckCache | None = None,
+) -> None:
+    """Run the non-recursive `check` on each of `cells` and collect the findings.
+
+    With `max_workers > 1` the cells are checked by a pool of forked processes,
+    which inherit the layout instead of receiving a copy of it. Every cell is
+    checked into its own report database, these are serialized and written into
+    `db` in the order of `cells`, so the report is the same as for a serial run.
+    Without `fork` (e.g. on Windows) the cells are always checked serially.
+    """
+    if (
+        max_workers <= 1
+        or len(cells) < 2
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        for c in cells:
+            check(c, db, cache)
+        return
+
+    kcl = cells[0].kcl
+    # Build the lazy bboxes and shape trees once instead of in every worker.
+    kcl.layout.update()
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(cells)),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=((check, kcl, cache),),
+    ) as pool:
+        results = pool.map(
+            _check_in_worker,
+            [c.cell_index() for c in cells],
+            chunksize=max(1, len(cells) // (4 * max_workers)),
+        )
+        for result in results:
+            if cache is not None:
+                cache._reports.update(result.cache_entries)
+                cache.hits += result.cache_hits
+                cache.misses += result.cache_misses
+            _restore_report(db, result.report)
+
+
 def _recurse(
     cell: ProtoTKCell[Any],
-    db: rdb.ReportDatabase,
-    check: Callable[..., rdb.ReportDatabase],
+    db: ReportDB,
+    check: Callable[..., ReportDB],
+    *,
+    max_workers: int = 1,
+    cache: CheckCache | None = None,
     **kwargs: Any,
 ) -> None:
     """Run `check` on every called child cell, bottom-up, with recursive=False."""
     called = cell.called_cells()
-    for c in cell.kcl.each_cell_bottom_up():
-        if c in called:
-            check(cell.kcl[c], db=db, recursive=False, **kwargs)
 
+    def run(c: ProtoTKCell[Any], db_: ReportDB, cache_: CheckCache | None) -> None:
+        check(c, db=db_, recursive=False, cache=cache_, **kwargs)
 
-def _ensure_db(
-    cell: ProtoTKCell[Any], db: rdb.ReportDatabase | None, label: str
-) -> rdb.ReportDatabase:
-    return db or rdb.ReportDatabase(f"{label} {cell.name}")
+    _run_per_cell(
+        [cell.kcl[c] for c in cell.kcl.each_cell_bottom_up() if c in called],
+        run,
+        db,
+        max_workers=max_workers,
+        cache=cache,
+    )
+
+
+def _ensure_db[R: ReportDB](cell: ProtoTKCell[Any], db: R | None, label: str) -> R:
+    return db or cast("R", rdb.ReportDatabase(f"{label} {cell.name}"))
+
+
+# ---------------------------------------------------------------------------
+# Report sinks
+# ---------------------------------------------------------------------------
+
+
+class _SinkItem:
+    """Item handed out by a [`ReportSink`][kfactory.checks.ReportSink].
+
+    Mirrors the parts of `rdb.RdbItem` the checks use.
+    """
+
+    category: rdb.RdbCategory
+    cell: rdb.RdbCell
+    values: list[rdb.RdbItemValue]
+    tags_str: str
+    comment: str
+
+    def __init__(self, cell: rdb.RdbCell, category: rdb.RdbCategory) -> None:
+        self.cell = cell
+        self.category = category
+        self.values = []
+        self.tags_str = ""
+        self.comment = ""
+
+    def add_value(self, value: Any) -> None:
+        """Add a value (string, shape or `rdb.RdbItemValue`) to the item."""
+        if not isinstance(value, rdb.RdbItemValue):
+            value = rdb.RdbItemValue(value)
+        self.values.append(value)
+
+
+class ReportSink(ABC):
+    """Destination for check results which does not keep all items in memory.
+
+    A sink can be passed as `db` to all checks in place of an
+    `rdb.ReportDatabase`. Categories and cells are few and are stored in an
+    internal (item-less) report database, items are handed to
+    [`_emit`][kfactory.checks.ReportSink._emit] once they are complete.
+
+    Args:
+        name: Name of the report.
+    """
+
+    _db: rdb.ReportDatabase
+    _pending: _SinkItem | None
+    _num_items: int
+
+    def __init__(self, name: str = "Report") -> None:
+        """Create an empty sink."""
+        self._db = rdb.ReportDatabase(name)
+        self._pending = None
+        self._num_items = 0
+
+    def category_by_path(self, path: str) -> rdb.RdbCategory | None:
+        """Emulate `rdb.ReportDatabase.category_by_path`."""
+        return self._db.category_by_path(path)
+
+    @overload
+    def create_category(self, name: str, /) -> rdb.RdbCategory: ...
+
+    @overload
+    def create_category(
+        self, parent: rdb.RdbCategory, name: str, /
+    ) -> rdb.RdbCategory: ...
+
+    def create_category(
+        self, parent_or_name: rdb.RdbCategory | str, name: str | None = None, /
+    ) -> rdb.RdbCategory:
+        """Emulate `rdb.ReportDatabase.create_category`."""
+        if isinstance(parent_or_name, str):
+            return self._db.create_category(parent_or_name)
+        assert name is not None
+        return self._db.create_category(parent_or_name, name)
+
+    def each_category(self) -> Iterator[rdb.RdbCategory]:
+        """Emulate `rdb.ReportDatabase.each_category`."""
+        yield from self._db.each_category()
+
+    def create_cell(self, name: str) -> rdb.RdbCell:
+        """Emulate `rdb.ReportDatabase.create_cell`."""
+        return self._db.create_cell(name)
+
+    def each_cell(self) -> Iterator[rdb.RdbCell]:
+        """Emulate `rdb.ReportDatabase.each_cell`."""
+        yield from self._db.each_cell()
+
+    def create_item(self, cell: rdb.RdbCell, category: rdb.RdbCategory) -> _SinkItem:
+        """Emulate `rdb.ReportDatabase.create_item`.
+
+        The previously created item is complete at this point and is emitted.
+        """
+        self.flush()
+        self._num_items += 1
+        self._pending = _SinkItem(cell, category)
+        return self._pending
+
+    def num_items(self) -> int:
+        """Total number of items written to the sink."""
+        return self._num_items
+
+    def flush(self) -> None:
+        """Emit the last created item."""
+        if self._pending is not None:
+            item, self._pending = self._pending, None
+            self._emit(item)
+
+    @abstractmethod
+    def _emit(self, item: _SinkItem) -> None: ...
+
+    def close(self) -> None:
+        """Emit all outstanding items."""
+        self.flush()
+
+    def __enter__(self) -> Self:
+        """Use the sink as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the sink."""
+        self.close()
+
+
+class StreamingReport(ReportSink):
+    """Report sink which appends items to a `.lyrdb` file as they are found.
+
+    Items are written to a temporary file next to `path` and only the
+    categories and cells are held in memory. On
+    [`close`][kfactory.checks.StreamingReport.close] the final report, which can
+    be opened with KLayout's marker browser, is assembled at `path`.
+
+    Args:
+        path: The `.lyrdb` file to write.
+        name: Name of the report.
+    """
+
+    path: Path
+    _items_path: Path
+    _items_file: TextIO
+
+    def __init__(self, path: Path | str, name: str = "Report") -> None:
+        """Open the temporary item file."""
+        super().__init__(name)
+        self.path = Path(path)
+        self._items_path = self.path.with_name(f"{self.path.name}.items")
+        self._items_file = self._items_path.open("wt", encoding="utf-8")
+
+    def _emit(self, item: _SinkItem) -> None:
+        values = "".join(
+            f"    <value>{xml_escape(value.to_s())}</value>\n" for value in item.values
+        )
+        tags = (
+            f"<tags>{xml_escape(item.tags_str)}</tags>" if item.tags_str else "<tags/>"
+        )
+        comment = (
+            f"<comment>{xml_escape(item.comment)}</comment>"
+            if item.comment
+            else "<comment/>"
+        )
+        self._items_file.write(
+            "  <item>\n"
+            f"   {tags}\n"
+            f"   <category>{xml_escape(item.category.path())}</category>\n"
+            f"   <cell>{item.cell.rdb_id()}</cell>\n"
+            "   <visited>false</visited>\n"
+            "   <multiplicity>1</multiplicity>\n"
+            f"   {comment}\n"
+            "   <image/>\n"
+            "   <values>\n"
+            f"{values}"
+            "   </values>\n"
+            "  </item>\n"
+        )
+
+    def close(self) -> None:
+        """Write the final report to `path` and remove the temporary file."""
+        if self._items_file.closed:
+            return
+        super().close()
+        self._items_file.close()
+        # KLayout writes categories and cells, the items are spliced in. Cells
+        # are written by id, as their qualified names (variants) are only known
+        # now.
+        self._db.save(str(self.path))
+        header, footer = self.path.read_text(encoding="utf-8").split(" <items>\n")
+        cells = {
+            f"   <cell>{c.rdb_id()}</cell>\n": f"   <cell>{xml_escape(qname)}</cell>\n"
+            for c in self._db.each_cell()
+            if (qname := c.qname())
+        }
+        with self.path.open("wt", encoding="utf-8") as f:
+            f.write(header)
+            f.write(" <items>\n")
+            with self._items_path.open("rt", encoding="utf-8") as items:
+                f.writelines(cells.get(line, line) for line in items)
+            f.write(footer)
+        self._items_path.unlink()
+
+
+class SummaryReport(ReportSink):
+    """Report sink which only counts the items per category and cell.
+
+    For every category a bounded number of sample items is kept, e.g. to
+    show a few markers of a failing check in CI.
+
+    Args:
+        name: Name of the report.
+        max_samples: Maximum number of sample items kept per category.
+    """
+
+    max_samples: int
+    counts: dict[str, dict[str, int]]
+    samples: dict[str, list[_SinkItem]]
+
+    def __init__(self, name: str = "Report", max_samples: int = 10) -> None:
+        """Create an empty summary."""
+        super().__init__(name)
+        self.max_samples = max_samples
+        self.counts = {}
+        self.samples = {}
+
+    def create_item(self, cell: rdb.RdbCell, category: rdb.RdbCategory) -> _SinkItem:
+        """Count the item, keep it if there are less than `max_samples` yet."""
+        item = super().create_item(cell, category)
+        path = category.path()
+        by_cell = self.counts.setdefault(path, {})
+        by_cell[cell.name()] = by_cell.get(cell.name(), 0) + 1
+        samples = self.samples.setdefault(path, [])
+        if len(samples) < self.max_samples:
+            samples.append(item)
+        return item
+
+    def _emit(self, item: _SinkItem) -> None:
+        pass
+
+    def to_dict(self) -> dict[str, Any]:
+        """Counts and samples (as strings) of all categories, json serializable."""
+        return {
+            path: {
+                "count": sum(by_cell.values()),
+                "cells": by_cell,
+                "samples": [
+                    [value.to_s() for value in item.values]
+                    for item in self.samples.get(path, [])
+                ],
+            }
+            for path, by_cell in self.counts.items()
+        }
+
+
+# ---------------------------------------------------------------------------
+# Check result cache
+# ---------------------------------------------------------------------------
+
+
+class _CachedReport(TypedDict):
+    cells: list[str]
+    categories: list[tuple[str | None, str, str]]
+    items: list[tuple[int, str, list[str], str, str]]
+
+
+def _serialize_report(db: rdb.ReportDatabase) -> _CachedReport:
+    """Convert a (per-cell) report database to a JSON serializable dict."""
+    categories: list[tuple[str | None, str, str]] = []
+
+    def add_category(cat: rdb.RdbCategory, parent: str | None) -> None:
+        categories.append((parent, cat.name(), cat.description))
+        for sub_cat in cat.each_sub_category():
+            add_category(sub_cat, cat.path())
+
+    for cat in db.each_category():
+        add_category(cat, None)
+    cell_ids = [c.rdb_id() for c in db.each_cell()]
+    return {
+        "cells": [c.name() for c in db.each_cell()],
+        "categories": categories,
+        "items": [
+            (
+                cell_ids.index(item.cell_id()),
+                db.category_by_id(item.category_id()).path(),
+                [value.to_s() for value in item.each_value()],
+                item.tags_str,
+                item.comment,
+            )
+            for item in db.each_item()
+        ],
+    }
+
+
+def _restore_report(db: ReportDB, report: _CachedReport) -> None:
+    """Write a serialized report into `db`, the inverse of `_serialize_report`."""
+    for parent, name, description in report["categories"]:
+        path = f"{parent}.{name}" if parent else name
+        if db.category_by_path(path) is None:
+            if parent:
+                parent_cat = db.category_by_path(parent)
+                assert parent_cat is not None
+                cat = db.create_category(parent_cat, name)
+            else:
+                cat = db.create_category(name)
+            cat.description = description
+    cells = [db.create_cell(name) for name in report["cells"]]
+    for cell_pos, cat_path, values, tags, comment in report["items"]:
+        category = db.category_by_path(cat_path)
+        assert category is not None
+        it = db.create_item(cells[cell_pos], category)
+        for value in values:
+            it.add_value(rdb.RdbItemValue.from_s(value))
+        if tags:
+            it.tags_str = tags
+        if comment:
+            it.comment = comment
+
+
+def _layer_key(kcl: Any, layer: int | kdb.LayerInfo | str) -> str:
+    if isinstance(layer, int):
+        return str(kcl.get_info(layer))
+    return str(layer)
+
+
+def _shapes_gds(cell: ProtoTKCell[Any], layers: list[int]) -> bytes:
+    """The shapes of `cell` on `layers` (not of its children) as GDS bytes.
+
+    KLayout serializes the shapes, which is a lot faster than converting every
+    shape in Python. The layers are written with their position in `layers`, so
+    layers without a GDS layer number are kept apart.
+    """
+    opts = kdb.SaveLayoutOptions()
+    opts.format = "GDS2"
+    opts.gds2_write_timestamps = False
+    opts.write_context_info = False
+    opts.select_this_cell(cell.cell_index())
+    opts.deselect_all_layers()
+    for i, layer in enumerate(layers):
+        opts.add_layer(layer, kdb.LayerInfo(i, 0))
+    return cell.kcl.layout.write_bytes(opts)
+
+
+class CheckCache:
+    """Cache of per-cell check results.
+
+    Results are keyed by the check's name, its parameters and a fingerprint of
+    the checked cell's content (shapes, ports and instances, including the
+    fingerprints of the instantiated cells). Cells which did not change since
+    the last run are therefore not checked again.
+
+    The cache can be written to disk with [`save`][kfactory.checks.CheckCache.save]
+    and restored with [`load`][kfactory.checks.CheckCache.load]. By default it
+    is stored next to the session cache.
+
+    Attributes:
+        hits: Number of per-cell results taken from the cache.
+        misses: Number of per-cell results which had to be computed.
+    """
+
+    hits: int
+    misses: int
+    _reports: dict[str, _CachedReport]
+    _lock: Lock
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self.hits = 0
+        self.misses = 0
+        self._reports = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Number of cached per-cell results."""
+        return len(self._reports)
+
+    def clear(self) -> None:
+        """Remove all cached results and reset the counters."""
+        self._reports.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def default_path() -> Path:
+        """Location of the cache file next to the session cache."""
+        return (get_session_directory() / "../check_cache.json").resolve()
+
+    def save(self, path: Path | None = None) -> None:
+        """Write the cached results to a json file.
+
+        Args:
+            path: Target file. Defaults to
+                [`default_path`][kfactory.checks.CheckCache.default_path].
+        """
+        path = path or self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wt") as f:
+            json.dump(self._reports, f)
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> CheckCache:
+        """Create a cache from a file written by `save`.
+
+        Returns an empty cache if the file does not exist.
+
+        Args:
+            path: Source file. Defaults to
+                [`default_path`][kfactory.checks.CheckCache.default_path].
+        """
+        cache = cls()
+        path = path or cls.default_path()
+        if path.is_file():
+            with path.open("rt") as f:
+                cache._reports = json.load(f)
+        return cache
+
+    def fingerprint(self, cell: ProtoTKCell[Any]) -> str:
+        """Hash of the cell's content and the content of all its child cells.
+
+        The hash of a locked cell's own shapes and ports is memoized on the cell,
+        as they cannot change. The memo is only used while the cell is locked
+        and dropped when it is unlocked. Child cells are always fingerprinted
+        again (mostly from their memos), so edits of unlocked children are
+        never hidden behind a locked parent.
+        """
+        return self._fingerprint(cell, {})
+
+    def _fingerprint(self, cell: ProtoTKCell[Any], seen: dict[int, str]) -> str:
+        ci = cell.cell_index()
+        fp = seen.get(ci)
+        if fp is not None:
+            return fp
+        h = hashlib.sha256(self._content_fingerprint(cell).encode())
+        for inst in cell.insts:
+            h.update(self._fingerprint(inst.cell, seen).encode())
+            h.update(inst.instance.cell_inst.to_s().encode())
+            h.update(str(inst.name).encode())
+        fp = seen[ci] = h.hexdigest()
+        return fp
+
+    @staticmethod
+    def _content_fingerprint(cell: ProtoTKCell[Any]) -> str:
+        """Hash of the cell's name, shapes and ports, memoized while locked."""
+        base = cell._base
+        if not cell.locked:
+            base._check_fingerprint = None
+        elif base._check_fingerprint is not None:
+            return base._check_fingerprint
+        kcl = cell.kcl
+        h = hashlib.sha256(cell.name.encode())
+        layers = [
+            layer
+            for layer in kcl.layout.layer_indexes()
+            if not cell.shapes(layer).is_empty()
+        ]
+        h.update(str([kcl.get_info(layer) for layer in layers]).encode())
+        h.update(_shapes_gds(cell, layers))
+        for port in cell.ports:
+            h.update(repr(port).encode())
+        fp = h.hexdigest()
+        if cell.locked:
+            base._check_fingerprint = fp
+        return fp
+
+    def key(
+        self, check: Callable[..., Any], cell: ProtoTKCell[Any], **kwargs: Any
+    ) -> str:
+        """Cache key of running `check` with `kwargs` on `cell`."""
+        params = {
+            name: sorted(_layer_key(cell.kcl, layer) for layer in value)
+            if name.endswith("layers") and value
+            else value
+            for name, value in kwargs.items()
+        }
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    getattr(check, "__qualname__", repr(check)),
+                    params,
+                    self.fingerprint(cell),
+                ],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+    def run(
+        self,
+        check: Callable[..., ReportDB],
+        cell: ProtoTKCell[Any],
+        db: ReportDB,
+        **kwargs: Any,
+    ) -> None:
+        """Run `check` non-recursively on `cell` or take the result from the cache.
+
+        Args:
+            check: One of the check functions of this module.
+            cell: The cell to check.
+            db: The result is written into this report database.
+            kwargs: Parameters of the check.
+        """
+        key = self.key(check, cell, **kwargs)
+        report = self._reports.get(key)
+        if report is None:
+            local_db = rdb.ReportDatabase(cell.name)
+            check(cell, db=local_db, recursive=False, **kwargs)
+            report = _serialize_report(local_db)
+            with self._lock:
+                self._reports[key] = report
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+        _restore_report(db, report)
 
 
 # ---------------------------------------------------------------------------
@@ -139,7 +770,7 @@ def _ensure_db(
 
 def _emit_cell_port(
     cell: ProtoTKCell[Any],
-    db: rdb.ReportDatabase,
+    db: ReportDB,
     db_cell: rdb.RdbCell,
     layer_cat: Callable[[int], rdb.RdbCategory],
     port: ProtoPort[Any],
@@ -153,7 +784,7 @@ def _emit_cell_port(
 
 def _emit_physical_shape_issue(
     cell: ProtoTKCell[Any],
-    db: rdb.ReportDatabase,
+    db: ReportDB,
     db_cell: rdb.RdbCell,
     layer_cat: Callable[[int], rdb.RdbCategory],
     port: ProtoPort[Any],
@@ -211,7 +842,7 @@ def _check_cell_port_physical_shape(
 
 def _emit_port_overlap(
     cell: ProtoTKCell[Any],
-    db: rdb.ReportDatabase,
+    db: ReportDB,
     db_cell: rdb.RdbCell,
     layer_cat_for_layer: rdb.RdbCategory,
     ports: list[tuple[Port, KCell, str, ProtoTInstance[Any]]],
@@ -256,13 +887,15 @@ def _resolve_layer_indexes(
     return out
 
 
-def port_mismatch_check(
+def port_mismatch_check[R: ReportDB](
     cell: ProtoTKCell[Any],
     *,
     port_types: list[str] | None = None,
     layers: list[int] | None = None,
-    db: rdb.ReportDatabase | None = None,
+    db: R | None = None,
     recursive: bool = True,
+    max_workers: int = 1,
+    cache: CheckCache | None = None,
     add_cell_ports: bool = False,
     check_width: bool = True,
     check_angle: bool = True,
@@ -271,7 +904,7 @@ def port_mismatch_check(
     check_missing_physical_shape: bool = True,
     check_partial_physical_shape: bool = True,
     width_mismatch_ignore_layers: list[int | kdb.LayerInfo | str] | None = None,
-) -> rdb.ReportDatabase:
+) -> R:
     """Report port-pair / port-shape mismatches as one logical check.
 
     Aggregates width / angle / port-type mismatches between coincident ports,
@@ -284,8 +917,14 @@ def port_mismatch_check(
         port_types: If given, only ports whose `port_type` is in this list are
             considered.
         layers: If given, only ports on these layers are considered.
-        db: Reuse an existing report database. A new one is created otherwise.
+        db: Reuse an existing report database or write into a
+            [`ReportSink`][kfactory.checks.ReportSink]. A new report database is
+            created otherwise.
         recursive: Run the same check on every called child cell as well.
+        max_workers: Number of worker processes checking the child cells if
+            `recursive` is set. The report does not depend on it.
+        cache: Take the results of unchanged cells from this cache and add the
+            results of new or changed cells to it.
         add_cell_ports: Add a `CellPorts` category listing the cell's own
             (filtered) ports for visual inspection in the report.
         check_width: Emit `WidthMismatch` items.
@@ -304,22 +943,30 @@ def port_mismatch_check(
     layers = layers or []
     db_ = _ensure_db(cell, db, "Port Mismatch Check")
     ignore_width_layers = _resolve_layer_indexes(cell.kcl, width_mismatch_ignore_layers)
+    params: dict[str, Any] = {
+        "port_types": port_types,
+        "layers": layers,
+        "add_cell_ports": add_cell_ports,
+        "check_width": check_width,
+        "check_angle": check_angle,
+        "check_type": check_type,
+        "check_port_overlap": check_port_overlap,
+        "check_missing_physical_shape": check_missing_physical_shape,
+        "check_partial_physical_shape": check_partial_physical_shape,
+        "width_mismatch_ignore_layers": width_mismatch_ignore_layers,
+    }
     if recursive:
         _recurse(
             cell,
             db_,
             port_mismatch_check,
-            port_types=port_types,
-            layers=layers,
-            add_cell_ports=add_cell_ports,
-            check_width=check_width,
-            check_angle=check_angle,
-            check_type=check_type,
-            check_port_overlap=check_port_overlap,
-            check_missing_physical_shape=check_missing_physical_shape,
-            check_partial_physical_shape=check_partial_physical_shape,
-            width_mismatch_ignore_layers=width_mismatch_ignore_layers,
+            max_workers=max_workers,
+            cache=cache,
+            **params,
         )
+    if cache is not None:
+        cache.run(port_mismatch_check, cell, db_, **params)
+        return db_
 
     db_cell = db_.create_cell(cell.name)
     layer_cat = _layer_cat_factory(db_, cell)
@@ -573,15 +1220,17 @@ def _siblings_connected(
     return False
 
 
-def dangling_ports_check(
+def dangling_ports_check[R: ReportDB](
     cell: ProtoTKCell[Any],
     *,
     port_types: list[str] | None = None,
     layers: list[int] | None = None,
-    db: rdb.ReportDatabase | None = None,
+    db: R | None = None,
     recursive: bool = True,
+    max_workers: int = 1,
+    cache: CheckCache | None = None,
     equivalent_ports: dict[str, list[list[str]]] | None = None,
-) -> rdb.ReportDatabase:
+) -> R:
     """Report dangling instance ports — ports with no matching counterpart.
 
     A dangling port is an instance port at a coord where no other instance
@@ -592,8 +1241,14 @@ def dangling_ports_check(
         port_types: If given, only ports whose `port_type` is in this list are
             considered.
         layers: If given, only ports on these layers are considered.
-        db: Reuse an existing report database. A new one is created otherwise.
+        db: Reuse an existing report database or write into a
+            [`ReportSink`][kfactory.checks.ReportSink]. A new report database is
+            created otherwise.
         recursive: Run the same check on every called child cell as well.
+        max_workers: Number of worker processes checking the child cells if
+            `recursive` is set. The report does not depend on it.
+        cache: Take the results of unchanged cells from this cache and add the
+            results of new or changed cells to it.
         equivalent_ports: Per-cell groups of electrically-equivalent port
             names (same shape as `Netlist.lvs_equivalent`'s argument).
             When provided, an instance port is **not** reported as dangling if
@@ -604,15 +1259,23 @@ def dangling_ports_check(
     port_types = port_types or []
     layers = layers or []
     db_ = _ensure_db(cell, db, "Dangling Ports Check")
+    params: dict[str, Any] = {
+        "port_types": port_types,
+        "layers": layers,
+        "equivalent_ports": equivalent_ports,
+    }
     if recursive:
         _recurse(
             cell,
             db_,
             dangling_ports_check,
-            port_types=port_types,
-            layers=layers,
-            equivalent_ports=equivalent_ports,
+            max_workers=max_workers,
+            cache=cache,
+            **params,
         )
+    if cache is not None:
+        cache.run(dangling_ports_check, cell, db_, **params)
+        return db_
 
     db_cell = db_.create_cell(cell.name)
     layer_cat = _layer_cat_factory(db_, cell)
@@ -686,13 +1349,15 @@ def _iter_check_layers(cell: ProtoTKCell[Any], layers: list[int]) -> list[int]:
     return list(cell.kcl.layout.layer_indexes())
 
 
-def instance_overlap_check(
+def instance_overlap_check[R: ReportDB](
     cell: ProtoTKCell[Any],
     *,
     layers: list[int] | None = None,
-    db: rdb.ReportDatabase | None = None,
+    db: R | None = None,
     recursive: bool = True,
-) -> rdb.ReportDatabase:
+    max_workers: int = 1,
+    cache: CheckCache | None = None,
+) -> R:
     """Report instance shapes overlapping shapes of other instances.
 
     For each candidate layer, polygons of one instance that overlap polygons
@@ -701,17 +1366,34 @@ def instance_overlap_check(
     Args:
         cell: Cell to verify.
         layers: If given, only check these layers.
-        db: Reuse an existing report database. A new one is created otherwise.
+        db: Reuse an existing report database or write into a
+            [`ReportSink`][kfactory.checks.ReportSink]. A new report database is
+            created otherwise.
         recursive: Run the same check on every called child cell as well.
+        max_workers: Number of worker processes checking the child cells if
+            `recursive` is set. The report does not depend on it.
+        cache: Take the results of unchanged cells from this cache and add the
+            results of new or changed cells to it.
     """
     layers = layers or []
     db_ = _ensure_db(cell, db, "Instance Overlap Check")
     if recursive:
-        _recurse(cell, db_, instance_overlap_check, layers=layers)
+        _recurse(
+            cell,
+            db_,
+            instance_overlap_check,
+            max_workers=max_workers,
+            cache=cache,
+            layers=layers,
+        )
+    if cache is not None:
+        cache.run(instance_overlap_check, cell, db_, layers=layers)
+        return db_
 
     db_cell = db_.create_cell(cell.name)
     layer_cat = _layer_cat_factory(db_, cell)
 
+    cell_regions: dict[tuple[int, int], kdb.Region] = {}
     for layer in _iter_check_layers(cell, layers):
         error_region = kdb.Region()
         inst_records: list[tuple[ProtoTInstance[Any], kdb.Box]] = [
@@ -725,11 +1407,13 @@ def instance_overlap_check(
             other_inst, _ = inst_records[other_idx]
             inst_region = inst_cache.get(idx)
             if inst_region is None:
-                inst_region = collect_instance_region(cell, layer, inst)
+                inst_region = collect_instance_region(cell, layer, inst, cell_regions)
                 inst_cache[idx] = inst_region
             other_region = inst_cache.get(other_idx)
             if other_region is None:
-                other_region = collect_instance_region(cell, layer, other_inst)
+                other_region = collect_instance_region(
+                    cell, layer, other_inst, cell_regions
+                )
                 inst_cache[other_idx] = other_region
             error_region.insert(other_region & inst_region)
 
@@ -745,13 +1429,15 @@ def instance_overlap_check(
     return db_
 
 
-def shape_instance_overlap_check(
+def shape_instance_overlap_check[R: ReportDB](
     cell: ProtoTKCell[Any],
     *,
     layers: list[int] | None = None,
-    db: rdb.ReportDatabase | None = None,
+    db: R | None = None,
     recursive: bool = True,
-) -> rdb.ReportDatabase:
+    max_workers: int = 1,
+    cache: CheckCache | None = None,
+) -> R:
     """Report top-level cell shapes overlapping with shapes of instances.
 
     Polygons drawn directly into the cell that touch polygons from any of its
@@ -760,13 +1446,29 @@ def shape_instance_overlap_check(
     Args:
         cell: Cell to verify.
         layers: If given, only check these layers.
-        db: Reuse an existing report database. A new one is created otherwise.
+        db: Reuse an existing report database or write into a
+            [`ReportSink`][kfactory.checks.ReportSink]. A new report database is
+            created otherwise.
         recursive: Run the same check on every called child cell as well.
+        max_workers: Number of worker processes checking the child cells if
+            `recursive` is set. The report does not depend on it.
+        cache: Take the results of unchanged cells from this cache and add the
+            results of new or changed cells to it.
     """
     layers = layers or []
     db_ = _ensure_db(cell, db, "Shape/Instance Overlap Check")
     if recursive:
-        _recurse(cell, db_, shape_instance_overlap_check, layers=layers)
+        _recurse(
+            cell,
+            db_,
+            shape_instance_overlap_check,
+            max_workers=max_workers,
+            cache=cache,
+            layers=layers,
+        )
+    if cache is not None:
+        cache.run(shape_instance_overlap_check, cell, db_, layers=layers)
+        return db_
 
     db_cell = db_.create_cell(cell.name)
     layer_cat = _layer_cat_factory(db_, cell)
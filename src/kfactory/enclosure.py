@@ -7,12 +7,11 @@ region.
 
 from __future__ import annotations
 
-import itertools
-import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 from enum import IntEnum
-from functools import lru_cache
+from functools import lru_cache, partial
 from hashlib import sha1
+from threading import Lock
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -23,6 +22,7 @@ from typing import (
 )
 
 import numpy as np
+import numpy.typing as npt
 from pydantic import (
     BaseModel,
     Field,
@@ -40,6 +40,7 @@ from .exceptions import CrossSectionNamingConflictError
 if TYPE_CHECKING:
     from collections.abc import (
         Callable,
+        Hashable,
         Iterable,
         Mapping,
         Sequence,
@@ -51,12 +52,14 @@ if TYPE_CHECKING:
     from .port import Port
 
 __all__ = [
+    "EnclosureCache",
     "KCellEnclosure",
     "LayerEnclosure",
     "extrude_path",
     "extrude_path_cross_section",
     "extrude_path_dynamic",
     "extrude_path_dynamic_points",
+    "extrude_path_offsets",
     "extrude_path_points",
 ]
 
@@ -76,9 +79,6 @@ class Direction(IntEnum):
     BOTH = 3
 
 
-_min_size = -sys.maxsize - 1
-
-
 def is_callable_widths(
     widths: Callable[[float], float] | list[float],
 ) -> TypeGuard[Callable[[float], float]]:
@@ -94,6 +94,128 @@ def path_pts_to_polygon(
     return kdb.DPolygon(pts_top + pts_bot)
 
 
+def _path_array(path: Sequence[kdb.DPoint] | npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """Convert a path to an `(N, 2)` float array."""
+    if isinstance(path, np.ndarray):
+        pts = path.astype(np.float64, copy=False)
+    else:
+        pts = np.array(
+            [(p.x, p.y) if isinstance(p, kdb.DPoint) else p for p in path],  # ty:ignore[not-iterable]
+            dtype=np.float64,
+        )
+    if pts.ndim != 2 or pts.shape[1] != 2 or len(pts) < 2:
+        raise ValueError(
+            f"A path needs at least two points as an (N, 2) array, got {pts.shape}."
+        )
+    return pts
+
+
+def _path_angles(
+    pts: npt.NDArray[np.float64],
+    start_angle: float | None = None,
+    end_angle: float | None = None,
+) -> npt.NDArray[np.float64]:
+    """Direction of the path at every point in degrees.
+
+    Inner points use the direction from their previous to their next point.
+    """
+    angles = np.empty(len(pts))
+    v = pts[2:] - pts[:-2]
+    angles[1:-1] = np.rad2deg(np.arctan2(v[:, 1], v[:, 0]))
+    if start_angle is None:
+        start = pts[1] - pts[0]
+        start_angle = np.rad2deg(np.arctan2(start[1], start[0]))
+    if end_angle is None:
+        end = pts[-1] - pts[-2]
+        end_angle = np.rad2deg(np.arctan2(end[1], end[0]))
+    angles[0] = start_angle
+    angles[-1] = end_angle
+    return angles
+
+
+def extrude_path_offsets(
+    path: Sequence[kdb.DPoint] | npt.ArrayLike,
+    offsets: npt.ArrayLike,
+    start_angle: float | None = None,
+    end_angle: float | None = None,
+) -> npt.NDArray[np.float64]:
+    """Offset a path along its normals, for many offsets at once.
+
+    This is the core of all path extrusions. The normals of the path are calculated
+    once and shared by all offsets.
+
+    Args:
+        path: `(N, 2)` array (or list of floating-point points) of the path
+        offsets: signed offsets from the path, `+` is the left-hand side of the travel
+            direction. Either `(K,)` for constant offsets or `(K, N)` for an offset
+            per point.
+        start_angle: optionally specify a custom starting angle if `None` will
+            be autocalculated from the first two elements
+        end_angle: optionally specify a custom ending angle if `None`
+            will be autocalculated from the last two elements
+
+    Returns:
+        `(K, N, 2)` array with one offset path per offset.
+    """
+    pts = _path_array(path)
+    angles = np.deg2rad(_path_angles(pts, start_angle, end_angle))
+    normals = np.stack([-np.sin(angles), np.cos(angles)], axis=-1)
+    offsets_ = np.asarray(offsets, dtype=np.float64)
+    if offsets_.ndim == 1:
+        offsets_ = offsets_[:, np.newaxis]
+    return pts + offsets_[..., np.newaxis] * normals
+
+
+def _band_pts(
+    top: npt.NDArray[np.float64], bot: npt.NDArray[np.float64]
+) -> list[kdb.DPoint]:
+    """Hull of the band between two offset paths."""
+    return _to_dpoints(np.concatenate([top, bot[::-1]]))
+
+
+def _band_polygon_dbu(
+    top: npt.NDArray[np.float64], bot: npt.NDArray[np.float64], dbu: float
+) -> kdb.Polygon:
+    """Polygon in dbu of the band between two offset paths in um."""
+    pts = np.concatenate([top, bot[::-1]]) * (1 / dbu)
+    # round half away from zero like KLayout
+    return kdb.Polygon(np.trunc(pts + np.copysign(0.5, pts)).astype(np.int64).tolist())
+
+
+def _to_dpoints(pts: npt.NDArray[np.float64]) -> list[kdb.DPoint]:
+    return [kdb.DPoint(x, y) for x, y in pts.tolist()]
+
+
+def _width_profile(
+    pts: npt.NDArray[np.float64],
+    widths: Callable[[float], float]
+    | Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+    | Sequence[float]
+    | npt.ArrayLike,
+) -> npt.NDArray[np.float64]:
+    """Widths at every point of a path.
+
+    A callable is evaluated at the relative length `t` (0 to 1) of every point. It
+    is called once with the array of all `t` and only if that fails or doesn't
+    return one width per point, it is called for every point separately.
+    """
+    if callable(widths):
+        width_f = cast("Callable[[Any], Any]", widths)
+        z = np.concatenate(([0], np.cumsum(np.hypot(*np.diff(pts, axis=0).T))))
+        t = z / z[-1]
+        try:
+            w = np.broadcast_to(np.asarray(width_f(t), dtype=np.float64), t.shape)
+        except (TypeError, ValueError):
+            w = np.array([width_f(x) for x in t.tolist()], dtype=np.float64)
+        return w
+    w = np.asarray(widths, dtype=np.float64)
+    if w.shape != (len(pts),):
+        raise ValueError(
+            f"The path has {len(pts)} points, but {w.shape} widths were given."
+        )
+    return w
+
+
 def _extrude_path_band_points(
     path: Sequence[kdb.DPoint],
     lo: float,
@@ -118,40 +240,8 @@ def _extrude_path_band_points(
         end_angle: optionally specify a custom ending angle if `None`
             will be autocalculated from the last two elements
     """
-    start = path[1] - path[0]
-    end = path[-1] - path[-2]
-    if start_angle is None:
-        start_angle = np.rad2deg(np.arctan2(start.y, start.x))
-    if end_angle is None:
-        end_angle = np.rad2deg(np.rad2deg(np.arctan2(end.y, end.x)))
-
-    p_start = path[0]
-    p_end = path[-1]
-    start_trans = kdb.DCplxTrans(1, start_angle, False, p_start.x, p_start.y)
-    end_trans = kdb.DCplxTrans(1, end_angle, False, p_end.x, p_end.y)
-
-    top_vector = kdb.DCplxTrans(kdb.DVector(0, hi))
-    bot_vector = kdb.DCplxTrans(kdb.DVector(0, lo))
-    vector_top = [start_trans * top_vector]
-    vector_bot = [start_trans * bot_vector]
-
-    p_old = path[0]
-    p = path[1]
-
-    for point in path[2:]:
-        p_new = point
-        v = p_new - p_old
-        angle = np.rad2deg(np.arctan2(v.y, v.x))
-        transformation = kdb.DCplxTrans(1, angle, False, p.x, p.y)
-        vector_top.append(transformation * top_vector)
-        vector_bot.append(transformation * bot_vector)
-        p_old = p
-        p = p_new
-
-    vector_top.append(end_trans * top_vector)
-    vector_bot.append(end_trans * bot_vector)
-
-    return [v.disp.to_p() for v in vector_top], [v.disp.to_p() for v in vector_bot]
+    top, bot = extrude_path_offsets(path, [hi, lo], start_angle, end_angle)
+    return _to_dpoints(top), _to_dpoints(bot)
 
 
 def extrude_path_points(
@@ -175,6 +265,48 @@ def extrude_path_points(
     )
 
 
+def _extrude_layer_sections(
+    pts: npt.NDArray[np.float64],
+    widths: npt.NDArray[np.float64],
+    layer_sec: LayerSection,
+    dbu: float,
+    start_angle: float | None,
+    end_angle: float | None,
+) -> tuple[kdb.Region, list[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]]:
+    """Extrude all sections of a layer in one go.
+
+    Args:
+        pts: `(N, 2)` array of the path in um
+        widths: `(N,)` widths of the reference layer in um
+        layer_sec: the sections to extrude
+        dbu: database unit
+        start_angle: starting angle of the path or `None`
+        end_angle: ending angle of the path or `None`
+
+    Returns:
+        The merged region and the outer edges (top, bottom) of every section.
+    """
+    sections = layer_sec.sections
+    n = len(sections)
+    d_max = np.array([s.d_max for s in sections], dtype=np.float64)
+    d_min = np.array(
+        [s.d_min if s.d_min is not None else np.nan for s in sections],
+        dtype=np.float64,
+    )
+    half_widths = (widths + 2 * np.concatenate([d_max, d_min])[:, np.newaxis] * dbu) / 2
+    bands = extrude_path_offsets(
+        pts, np.concatenate([half_widths, -half_widths]), start_angle, end_angle
+    )
+    reg = kdb.Region()
+    outer = [(bands[i], bands[2 * n + i]) for i in range(n)]
+    for i, section in enumerate(sections):
+        r = kdb.Region(_band_polygon_dbu(*outer[i], dbu))
+        if section.d_min is not None:
+            r -= kdb.Region(_band_polygon_dbu(bands[n + i], bands[3 * n + i], dbu))
+        reg.insert(r)
+    return reg.merge(), outer
+
+
 def extrude_path(
     target: KCell,
     layer: kdb.LayerInfo,
@@ -208,32 +340,15 @@ def extrude_path(
             layer_list = enclosure.layer_sections.copy()
             j = layer_list[layer].add_section(Section(d_max=0))
 
+    pts = _path_array(path)
+    widths = np.full(len(pts), width, dtype=np.float64)
     for _layer, layer_sec in layer_list.items():
-        reg = kdb.Region()
-        for i, section in enumerate(layer_sec.sections):
-            path_ = path_pts_to_polygon(
-                *extrude_path_points(
-                    path,
-                    width + 2 * section.d_max * target.kcl.dbu,
-                    start_angle,
-                    end_angle,
-                )
-            )
-            r = kdb.Region(target.kcl.to_dbu(path_))
-            if section.d_min is not None:
-                path_ = path_pts_to_polygon(
-                    *extrude_path_points(
-                        path,
-                        width + 2 * section.d_min * target.kcl.dbu,
-                        start_angle,
-                        end_angle,
-                    )
-                )
-                r -= kdb.Region(target.kcl.to_dbu(path_))
-            reg.insert(r)
-            if _layer == layer and i == j:
-                ret_path = path_
-        target.shapes(target.kcl.layer(_layer)).insert(reg.merge())
+        reg, outer = _extrude_layer_sections(
+            pts, widths, layer_sec, target.kcl.dbu, start_angle, end_angle
+        )
+        if _layer == layer:
+            ret_path = kdb.DPolygon(_band_pts(*outer[j]))
+        target.shapes(target.kcl.layer(_layer)).insert(reg)
     return ret_path
 
 
@@ -286,88 +401,47 @@ def extrude_path_cross_section(
     for sec in cross_section.sections:
         strips[sec.layer].append((to_um(sec.section_min), to_um(sec.section_max)))
 
+    pts = _path_array(path)
+    dbu = target.kcl.dbu
     for _layer, bands in strips.items():
+        n = len(bands)
+        edges = extrude_path_offsets(
+            pts,
+            [hi for _, hi in bands] + [lo for lo, _ in bands],
+            start_angle,
+            end_angle,
+        )
         reg = kdb.Region()
-        for lo, hi in bands:
-            polygon = path_pts_to_polygon(
-                *_extrude_path_band_points(path, lo, hi, start_angle, end_angle)
-            )
-            reg.insert(target.kcl.to_dbu(polygon))
+        for i in range(n):
+            reg.insert(_band_polygon_dbu(edges[i], edges[n + i], dbu))
         target.shapes(target.kcl.layer(_layer)).insert(reg.merge())
 
 
 def extrude_path_dynamic_points(
-    path: list[kdb.DPoint],
-    widths: Callable[[float], float] | list[float],
+    path: Sequence[kdb.DPoint] | npt.ArrayLike,
+    widths: Callable[[float], float] | Sequence[float] | npt.ArrayLike,
     start_angle: float | None = None,
     end_angle: float | None = None,
 ) -> tuple[list[kdb.DPoint], list[kdb.DPoint]]:
     """Extrude a profile with a list of points and a list of widths.
 
     Args:
-        path: list of floating-points points
+        path: list of floating-points points or `(N, 2)` array
         widths: function (from t==0 to t==1) defining a width profile for the path
-            | list with width for the profile (needs same length as path)
+            | list with width for the profile (needs same length as path). Functions
+            accepting an array of `t` (e.g. numpy expressions) are evaluated for all
+            points at once.
         start_angle: optionally specify a custom starting angle if `None` will be
             autocalculated from the first two elements
         end_angle: optionally specify a custom ending angle if `None` will be
             autocalculated from the last two elements
     """
-    start = path[1] - path[0]
-    end = path[-1] - path[-2]
-    if start_angle is None:
-        start_angle = np.rad2deg(np.arctan2(start.y, start.x))
-    if end_angle is None:
-        end_angle = np.rad2deg(np.rad2deg(np.arctan2(end.y, end.x)))
-
-    p_start = path[0]
-    p_end = path[-1]
-
-    start_trans = kdb.DCplxTrans(1, start_angle, False, p_start.x, p_start.y)
-    end_trans = kdb.DCplxTrans(1, end_angle, False, p_end.x, p_end.y)
-
-    if callable(widths):
-        length = sum(((p2 - p1).abs() for p2, p1 in itertools.pairwise(path)))
-        z: float = 0
-        ref_vector = kdb.DCplxTrans(kdb.DVector(0, widths(z / length) / 2))  # ty:ignore[call-top-callable, unsupported-operator]
-        vector_top = [start_trans * ref_vector]
-        vector_bot = [start_trans * kdb.DCplxTrans.R180 * ref_vector]
-        p_old = path[0]
-        p = path[1]
-        z += (p - p_old).abs()
-        for point in path[2:]:
-            ref_vector = kdb.DCplxTrans(kdb.DVector(0, widths(z / length) / 2))  # ty:ignore[call-top-callable, unsupported-operator]
-            p_new = point
-            v = p_new - p_old
-            angle = np.rad2deg(np.arctan2(v.y, v.x))
-            transformation = kdb.DCplxTrans(1, angle, False, p.x, p.y)
-            vector_top.append(transformation * ref_vector)
-            vector_bot.append(transformation * kdb.DCplxTrans.R180 * ref_vector)
-            z += (p_new - p).abs()
-            p_old = p
-            p = p_new
-        ref_vector = kdb.DCplxTrans(kdb.DVector(0, widths(z / length) / 2))  # ty:ignore[call-top-callable, unsupported-operator]
-    else:
-        ref_vector = kdb.DCplxTrans(kdb.DVector(0, widths[0] / 2))
-        vector_top = [start_trans * ref_vector]
-        vector_bot = [start_trans * kdb.DCplxTrans.R180 * ref_vector]
-        p_old = path[0]
-        p = path[1]
-        for point, w in zip(path[2:], widths[1:-1], strict=False):
-            ref_vector = kdb.DCplxTrans(kdb.DVector(0, w / 2))
-            p_new = point
-            v = p_new - p_old
-            angle = np.rad2deg(np.arctan2(v.y, v.x))
-            transformation = kdb.DCplxTrans(1, angle, False, p.x, p.y)
-            vector_top.append(transformation * ref_vector)
-            vector_bot.append(transformation * kdb.DCplxTrans.R180 * ref_vector)
-            p_old = p
-            p = p_new
-        ref_vector = kdb.DCplxTrans(kdb.DVector(0, widths[-1] / 2))
-    vector_top.append(end_trans * ref_vector)
-    vector_bot.append(end_trans * kdb.DCplxTrans.R180 * ref_vector)
-
-    return [v.disp.to_p() for v in vector_top], [v.disp.to_p() for v in vector_bot]
+    pts = _path_array(path)
+    half_widths = _width_profile(pts, widths) / 2
+    top, bot = extrude_path_offsets(
+        pts, [half_widths, -half_widths], start_angle, end_angle
+    )
+    return _to_dpoints(top), _to_dpoints(bot)
 
 
 def extrude_path_dynamic(
@@ -389,7 +463,8 @@ def extrude_path_dynamic(
         layer: the main layer that should be extruded
         path: list of floating-points points
         widths: function (from t==0 to t==1) defining a width profile for the path |
-            list with width for the profile (needs same length as path)
+            list with width for the profile (needs same length as path). Functions
+            accepting an array of `t` are evaluated for all points at once.
         enclosure: optional enclosure object, specifying necessary layers.this will
             extrude around the `layer`
         start_angle: optionally specify a custom starting angle if `None` will be
@@ -406,84 +481,13 @@ def extrude_path_dynamic(
             layer_list = enclosure.layer_sections.copy()
             for section in layer_list[layer].sections:
                 layer_list[layer].add_section(section)
-    if is_callable_widths(widths):
-        for layer_, layer_sec in layer_list.items():
-            reg = kdb.Region()
-            for section in layer_sec.sections:
-
-                def w_max(x: float, section: Section = section) -> float:
-                    assert section.d_max is not None
-                    return widths(x) + 2 * section.d_max * target.kcl.layout.dbu
-
-                r = kdb.Region(
-                    target.kcl.to_dbu(
-                        path_pts_to_polygon(
-                            *extrude_path_dynamic_points(
-                                path,
-                                w_max,
-                                start_angle,
-                                end_angle,
-                            )
-                        )
-                    )
-                )
-                if section.d_min is not None:
-
-                    def w_min(x: float, section: Section = section) -> float:
-                        assert section.d_min is not None
-                        return widths(x) + 2 * section.d_min * target.kcl.layout.dbu
-
-                    r -= kdb.Region(
-                        target.kcl.to_dbu(
-                            path_pts_to_polygon(
-                                *extrude_path_dynamic_points(
-                                    path,
-                                    w_min,
-                                    start_angle,
-                                    end_angle,
-                                )
-                            )
-                        )
-                    )
-                reg.insert(r)
-            target.shapes(target.kcl.layer(layer_)).insert(reg.merge())
-
-    else:
-        for layer_, layer_sec in layer_list.items():
-            reg = kdb.Region()
-            for section in layer_sec.sections:
-                max_widths = [w + 2 * section.d_max * target.kcl.dbu for w in widths]  # ty:ignore[not-iterable]
-                r = kdb.Region(
-                    target.kcl.to_dbu(
-                        path_pts_to_polygon(
-                            *extrude_path_dynamic_points(
-                                path,
-                                max_widths,
-                                start_angle,
-                                end_angle,
-                            )
-                        )
-                    )
-                )
-                if section.d_min is not None:
-                    min_widths = [
-                        w + 2 * section.d_min * target.kcl.dbu
-                        for w in widths  # ty:ignore[not-iterable]
-                    ]
-                    r -= kdb.Region(
-                        target.kcl.to_dbu(
-                            path_pts_to_polygon(
-                                *extrude_path_dynamic_points(
-                                    path,
-                                    min_widths,
-                                    start_angle,
-                                    end_angle,
-                                )
-                            )
-                        )
-                    )
-                reg.insert(r)
-            target.shapes(target.kcl.layer(layer_)).insert(reg.merge())
+    pts = _path_array(path)
+    widths_ = _width_profile(pts, widths)
+    for layer_, layer_sec in layer_list.items():
+        reg, _ = _extrude_layer_sections(
+            pts, widths_, layer_sec, target.kcl.dbu, start_angle, end_angle
+        )
+        target.shapes(target.kcl.layer(layer_)).insert(reg)
 
 
 class Section(BaseModel):
@@ -777,6 +781,9 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
         c: KCell,
         ref: kdb.LayerInfo | kdb.Region | None,  # layer index or the region
         direction: Direction = Direction.BOTH,
+        *,
+        hierarchical: bool = False,
+        cache: EnclosureCache | None = None,
     ) -> None:
         """Apply an enclosure with a vector in y-direction.
 
@@ -788,6 +795,9 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
             ref: Reference to use as a base for the enclosure.
             direction: X/Y or both directions.
                 Uses a box if both directions are selected.
+            hierarchical: Keep the hierarchy, see
+                [apply_minkowski_custom][kfactory.enclosure.LayerEnclosure.apply_minkowski_custom].
+            cache: Reuse the results of identical reference geometry.
         """
         match direction:
             case Direction.BOTH:
@@ -795,21 +805,27 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
                 def box(d: int) -> kdb.Box:
                     return kdb.Box(-d, -d, d, d)
 
-                self.apply_minkowski_custom(c, ref=ref, shape=box)
+                self.apply_minkowski_custom(
+                    c, ref=ref, shape=box, hierarchical=hierarchical, cache=cache
+                )
 
             case Direction.Y:
 
                 def edge(d: int) -> kdb.Edge:
                     return kdb.Edge(0, -d, 0, d)
 
-                self.apply_minkowski_custom(c, ref=ref, shape=edge)
+                self.apply_minkowski_custom(
+                    c, ref=ref, shape=edge, hierarchical=hierarchical, cache=cache
+                )
 
             case Direction.X:
 
                 def edge(d: int) -> kdb.Edge:
                     return kdb.Edge(-d, 0, d, 0)
 
-                self.apply_minkowski_custom(c, ref=ref, shape=edge)
+                self.apply_minkowski_custom(
+                    c, ref=ref, shape=edge, hierarchical=hierarchical, cache=cache
+                )
 
             case _:
                 raise ValueError("Undefined direction")
@@ -847,6 +863,9 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
         c: KCell,
         shape: Callable[[int], kdb.Edge | kdb.Polygon | kdb.Box],
         ref: kdb.LayerInfo | kdb.Region | None = None,
+        *,
+        hierarchical: bool = False,
+        cache: EnclosureCache | None = None,
     ) -> None:
         """Apply an enclosure with a custom shape.
 
@@ -858,6 +877,13 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
             shape: A function that will return a shape which takes one argument
                 the size of the section in dbu.
             ref: Reference to use as a base for the enclosure.
+            hierarchical: Keep the hierarchy of `c`. The enclosure of each child
+                cell is calculated once into a companion cell
+                (`{child.name}_ENC_{key}`) which is placed along the child. Only
+                instances close to other geometry and the shapes of `c` itself are
+                enclosed flat. Needs a layer as `ref`.
+            cache: Reuse the results of identical reference geometry, see
+                [EnclosureCache][kfactory.enclosure.EnclosureCache].
         """
         if ref is None:
             ref = self.main_layer
@@ -867,19 +893,55 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
                     "The enclosure doesn't have  a reference `main_layer` defined."
                     " Therefore the layer must be defined in calls"
                 )
-        r = (
-            kdb.Region(c.begin_shapes_rec(c.kcl.layer(ref)))
-            if isinstance(ref, kdb.LayerInfo)
-            else ref.dup()
+        if hierarchical and not isinstance(ref, kdb.LayerInfo):
+            raise ValueError(
+                "Hierarchical enclosures need a layer as reference, not a region."
+            )
+        kcl = c.kcl
+        shapes = _section_shapes(self.layer_sections.values(), shape)
+        key = _enclosure_key(
+            [self.unnamed_key],
+            [ref] if isinstance(ref, kdb.LayerInfo) else [],
+            shapes,
         )
-        r.merge()
 
-        for layer, layersec in reversed(self.layer_sections.items()):
-            for section in layersec.sections:
-                c.shapes(c.kcl.layer(layer)).insert(
-                    self.minkowski_region(r, section.d_max, shape)
-                    - self.minkowski_region(r, section.d_min, shape)
+        def enclose(refs: dict[int, kdb.Region]) -> dict[kdb.LayerInfo, kdb.Region]:
+            (r,) = refs.values()
+            enclosure: dict[kdb.LayerInfo, kdb.Region] = {}
+            for layer, layersec in self.layer_sections.items():
+                reg = enclosure[layer] = kdb.Region()
+                for section in layersec.sections:
+                    reg.insert(
+                        self.minkowski_region(r, section.d_max, shape)
+                        - self.minkowski_region(r, section.d_min, shape)
+                    )
+            return enclosure
+
+        regions: Callable[[dict[int, kdb.Region]], dict[kdb.LayerInfo, kdb.Region]] = (
+            partial(cache, enclose, key=key, dbu=kcl.dbu)
+            if cache is not None
+            else enclose
+        )
+
+        if isinstance(ref, kdb.LayerInfo):
+            ref_layer = kcl.layer(ref)
+            if hierarchical:
+                _apply_hierarchical(
+                    c,
+                    [ref_layer],
+                    list(shapes.values()),
+                    _hierarchical_key(key),
+                    regions,
                 )
+                return
+            r = kdb.Region(c.begin_shapes_rec(ref_layer))
+        else:
+            ref_layer = -1
+            r = ref.dup()
+        r.merge()
+
+        for layer, region in regions({ref_layer: r}).items():
+            c.shapes(kcl.layer(layer)).insert(region)
 
     def apply_minkowski_tiled(
         self,
@@ -889,12 +951,14 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
         n_pts: int = 64,
         n_threads: int | None = None,
         carve_out_ports: Iterable[Port] = [],
+        sizing_mode: int | None = None,
     ) -> None:
         """Minkowski regions with tiling processor.
 
         Useful if the target is a big or complicated enclosure. Will split target ref
         into tiles and calculate them in parallel. Uses a circle as a shape for the
-        minkowski sum.
+        minkowski sum. All sections are calculated in one pass per tile, sections
+        with the same distance share the sized region.
 
         Args:
             c: Target KCell to apply the enclosures into.
@@ -909,6 +973,9 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
             n_threads: Number o threads to use. By default (`None`) it will use as many
                 threads as are set to the process (usually all cores of the machine).
             carve_out_ports: Carves out a box of port_width +
+            sizing_mode: Use `Region.sized` with this KLayout sizing mode instead of
+                minkowski sums with a circle. Much faster, but corners are cut
+                according to the mode instead of rounded. `n_pts` is ignored.
         """
         if ref is None:
             ref = self.main_layer
@@ -924,9 +991,7 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
         tp.threads = n_threads or config.n_threads
         maxsize = 0
         for layersection in self.layer_sections.values():
-            maxsize = max(
-                maxsize, *[section.d_max for section in layersection.sections]
-            )
+            maxsize = max(maxsize, *_section_reaches(layersection.sections))
 
         min_tile_size_rec = 10 * maxsize * tp.dbu
 
@@ -955,59 +1020,13 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
         for port in c.ports:
             ports_by_layer[port.layer].append(port)
 
+        outputs: list[tuple[str, str, Sequence[Section]]] = []
         for layer, sections in self.layer_sections.items():
             layer_index = c.kcl.layer(layer)
             operator = RegionOperator(cell=c, layer=layer_index)
             tp.output(f"target_{layer_index}", operator)
-            max_size: int = _min_size
-            for _i, section in enumerate(reversed(sections.sections)):
-                max_size = max(max_size, section.d_max)
-                queue_str = f"var tile_reg = (_tile & _frame).sized({maxsize});"
-                queue_str += (
-                    "var max_shape = Polygon.ellipse("
-                    f"Box.new({section.d_max * 2},{section.d_max * 2}), {n_pts});"
-                )
-                match section.d_max:
-                    case d if d > 0:
-                        max_region = (
-                            "var max_reg = "
-                            "main_layer.minkowski_sum(max_shape).merged();"
-                        )
-                    case d if d < 0:
-                        max_region = "var max_reg = tile_reg - (tile_reg - main_layer);"
-                    case 0:
-                        max_region = "var max_reg = main_layer & tile_reg;"
-                queue_str += max_region
-                if section.d_min is not None:
-                    queue_str += (
-                        "var min_shape = Polygon.ellipse("
-                        f"Box.new({section.d_min * 2},{section.d_min * 2}), 64);"
-                    )
-                    match section.d_min:
-                        case d if d > 0:
-                            min_region = (
-                                "var min_reg = main_layer.minkowski_sum(min_shape);"
-                            )
-                        case d if d < 0:
-                            min_region = (
-                                "var min_reg = tile_reg - "
-                                "(tile_reg - main_layer).minkowski_sum(min_shape);"
-                            )
-                        case 0:
-                            min_region = "var min_reg = main_layer & tile_reg;"
-                    queue_str += min_region
-                    queue_str += (
-                        f"_output(target_{layer_index},"
-                        "(max_reg - min_reg)& _tile, true);"
-                    )
-                else:
-                    queue_str += f"_output(target_{layer_index},max_reg & _tile, true);"
-
-                tp.queue(queue_str)
-                logger.debug(
-                    "String queued for {} on layer {}: {}", c.name, layer, queue_str
-                )
-
+            outputs.append(("main_layer", f"target_{layer_index}", sections.sections))
+            max_size = max(section.d_max for section in sections.sections)
             operators.append((layer_index, operator))
             if carve_out_ports:
                 r = port_holes[layer_index]
@@ -1024,6 +1043,10 @@ class LayerEnclosure(BaseModel, arbitrary_types_allowed=True, frozen=True):
                         )
                 port_holes[layer_index] = r
 
+        queue_str = _minkowski_tiled_script(outputs, maxsize, n_pts, sizing_mode)
+        tp.queue(queue_str)
+        logger.debug("String queued for {}: {}", c.name, queue_str)
+
         c.kcl.start_changes()
         logger.info("Starting minkowski on {}", c.name)
         tp.execute(f"Minkowski {c.name}")
@@ -1378,8 +1401,9 @@ class RegionTilesOperator(kdb.TileOutputReceiver):
 
         if port_hole_map:
             for layer in self.layers:
-                self.merged_region -= port_hole_map[layer]
-            self.kcell.shapes(layer).insert(self.merged_region)
+                self.kcell.shapes(layer).insert(
+                    self.merged_region - port_hole_map[layer]
+                )
         else:
             for layer in self.layers:
                 self.kcell.shapes(layer).insert(self.merged_region)
@@ -1391,6 +1415,449 @@ def port_hole(port_width: int, section_width: int) -> kdb.Box:
     return kdb.Box(0, -w_h, w_h, w_h)
 
 
+def _section_reaches(sections: Iterable[Section]) -> list[int]:
+    """Distances the sections reach away from the reference, inward or outward.
+
+    Shrinking (negative distances) needs the complement of the reference up to
+    this distance as well.
+    """
+    return [
+        abs(d)
+        for section in sections
+        for d in (section.d_max, section.d_min)
+        if d is not None
+    ]
+
+
+def _minkowski_tiled_script(
+    outputs: Iterable[tuple[str, str, Sequence[Section]]],
+    maxsize: int,
+    n_pts: int,
+    sizing_mode: int | None = None,
+) -> str:
+    """Script for a `TilingProcessor` calculating all sections in one pass.
+
+    Every distinct distance of an input is sized only once per tile, all sections
+    using it are derived from that shared region.
+
+    Args:
+        outputs: (input name, output name, sections) to calculate.
+        maxsize: Maximum distance of all sections. [dbu]
+        n_pts: Number of points of the circles used for the minkowski sums.
+        sizing_mode: Use `Region.sized` with this mode instead of minkowski sums.
+    """
+    script = [f"var tile_reg = (_tile & _frame).sized({maxsize});"]
+    shapes: set[int] = set()
+    merged_inputs: set[str] = set()
+    complements: set[str] = set()
+    regions: dict[tuple[str, int], str] = {}
+
+    def sized(inp: str, d: int) -> str:
+        name = regions.get((inp, d))
+        if name is not None:
+            return name
+        if inp not in merged_inputs:
+            script.append(f"var {inp}_merged = {inp}.merged();")
+            merged_inputs.add(inp)
+        size = abs(d)
+        name = f"{inp}_{'n' if d < 0 else 'p'}{size}"
+        if d == 0:
+            expr = f"{inp}_merged & tile_reg"
+        elif sizing_mode is not None:
+            expr = f"{inp}_merged.sized({d}, {sizing_mode})"
+        else:
+            if size not in shapes:
+                script.append(
+                    f"var shape_{size} = "
+                    f"Polygon.ellipse(Box.new({2 * size},{2 * size}), {n_pts});"
+                )
+                shapes.add(size)
+            if d > 0:
+                expr = f"{inp}_merged.minkowski_sum(shape_{size}).merged()"
+            else:
+                if inp not in complements:
+                    script.append(f"var {inp}_inv = tile_reg - {inp}_merged;")
+                    complements.add(inp)
+                expr = f"tile_reg - {inp}_inv.minkowski_sum(shape_{size})"
+        script.append(f"var {name} = {expr};")
+        regions[inp, d] = name
+        return name
+
+    for inp, out, sections in outputs:
+        for section in reversed(sections):
+            max_reg = sized(inp, section.d_max)
+            if section.d_min is not None:
+                min_reg = sized(inp, section.d_min)
+                script.append(f"_output({out}, ({max_reg} - {min_reg}) & _tile, true);")
+            else:
+                script.append(f"_output({out}, {max_reg} & _tile, true);")
+    return "".join(script)
+
+
+def _same_shape(
+    a: list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon,
+    b: list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon,
+) -> bool:
+    """Whether two minkowski shapes cover the same area."""
+    if isinstance(a, kdb.Edge) or isinstance(b, kdb.Edge):
+        return a in (b, b.swapped_points()) if isinstance(b, kdb.Edge) else False
+    return (
+        kdb.Region(kdb.Polygon(a) if not isinstance(a, kdb.Polygon) else a)
+        ^ kdb.Region(kdb.Polygon(b) if not isinstance(b, kdb.Polygon) else b)
+    ).is_empty()
+
+
+def _transformed_shape(
+    shape: list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon, trans: kdb.ICplxTrans
+) -> kdb.Edge | kdb.Polygon:
+    if isinstance(shape, kdb.Edge):
+        return shape.transformed(trans)
+    if isinstance(shape, kdb.Polygon):
+        return shape.transformed(trans)
+    return kdb.Polygon(shape).transformed(trans)
+
+
+class EnclosureCache:
+    """Reuse the enclosure results of identical reference geometry.
+
+    Identical cells (e.g. the same bend built by different factories) result in the
+    same enclosure. The cache stores the calculated regions per output layer keyed by
+    the enclosure, the minkowski shapes, the dbu and a digest of the merged reference
+    geometry relative to its bounding box (polygon count, area, perimeter and bbox
+    per layer). Results with the same digest are only reused if their stored
+    reference geometry is identical to the new one. A hit reinserts the stored
+    regions moved to the location of the new reference geometry instead of
+    calculating the enclosure again.
+
+    Pass it as `cache` to `apply_minkowski_enc`/`apply_minkowski_custom` of a
+    [LayerEnclosure][kfactory.enclosure.LayerEnclosure] or
+    [KCellEnclosure][kfactory.enclosure.KCellEnclosure].
+
+    Args:
+        maxsize: Maximum number of stored results. The oldest result of the least
+            recently used digest is dropped when a new one exceeds the limit. `None`
+            means unlimited.
+
+    Attributes:
+        hits: Number of enclosures taken from the cache.
+        misses: Number of enclosures which had to be calculated.
+    """
+
+    def __init__(self, maxsize: int | None = 256) -> None:
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # reference regions and results of every digest
+        self._results: dict[
+            Hashable, list[tuple[list[kdb.Region], dict[kdb.LayerInfo, kdb.Region]]]
+        ] = {}
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Number of stored results."""
+        return self._size
+
+    def clear(self) -> None:
+        """Remove all results and reset the counters."""
+        with self._lock:
+            self._results.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __call__(
+        self,
+        enclose: Callable[[dict[int, kdb.Region]], dict[kdb.LayerInfo, kdb.Region]],
+        refs: dict[int, kdb.Region],
+        *,
+        key: Hashable,
+        dbu: float,
+    ) -> dict[kdb.LayerInfo, kdb.Region]:
+        """Calculate the enclosure of `refs` or take it from the cache.
+
+        Args:
+            enclose: Calculates the enclosure regions from the reference regions.
+            refs: Reference regions by layer index. The order of the regions is part
+                of the key.
+            key: Key of the enclosure, i.e. everything except the geometry which
+                `enclose` depends on.
+            dbu: Database unit of the layout.
+        """
+        merged = [r.merged() for r in refs.values()]
+        bbox = kdb.Box()
+        for r in merged:
+            bbox += r.bbox()
+        offset = bbox.p1 - kdb.Point() if not bbox.empty() else kdb.Vector()
+        moved = [r.moved(-offset) for r in merged]
+        digest = (
+            key,
+            dbu,
+            tuple((r.count(), r.area(), r.perimeter(), r.bbox()) for r in moved),
+        )
+        regions: dict[kdb.LayerInfo, kdb.Region] | None = None
+        with self._lock:
+            candidates = self._results.pop(digest, None)
+            if candidates is not None:
+                self._results[digest] = candidates
+                for stored, result in candidates:
+                    if all(
+                        (a ^ b).is_empty() for a, b in zip(stored, moved, strict=True)
+                    ):
+                        regions = result
+                        break
+            if regions is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if regions is not None:
+            return {layer: region.moved(offset) for layer, region in regions.items()}
+
+        regions = enclose(refs)
+        with self._lock:
+            self._results.setdefault(digest, []).append(
+                (
+                    moved,
+                    {layer: region.moved(-offset) for layer, region in regions.items()},
+                )
+            )
+            self._size += 1
+            while self.maxsize is not None and self._size > self.maxsize:
+                oldest = next(iter(self._results))
+                candidates = self._results[oldest]
+                candidates.pop(0)
+                if not candidates:
+                    del self._results[oldest]
+                self._size -= 1
+        return regions
+
+
+def _section_shapes(
+    layer_sections: Iterable[LayerSection],
+    shape: Callable[[int], list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon],
+) -> dict[int, list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon]:
+    """All minkowski shapes used by the sections, by their size."""
+    return {
+        abs(d): shape(abs(d))
+        for layersec in layer_sections
+        for section in layersec.sections
+        for d in (section.d_max, section.d_min)
+        if d
+    }
+
+
+def _enclosure_key(
+    enclosure_keys: Iterable[str],
+    ref_layers: Iterable[kdb.LayerInfo],
+    shapes: Mapping[int, list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon],
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[tuple[int, str], ...]]:
+    """Key of an enclosure application, i.e. the enclosures, layers and shapes."""
+    return (
+        tuple(enclosure_keys),
+        tuple(str(layer) for layer in ref_layers),
+        tuple(sorted((size, str(shape)) for size, shape in shapes.items())),
+    )
+
+
+def _hierarchical_key(
+    key: tuple[tuple[str, ...], tuple[str, ...], tuple[tuple[int, str], ...]],
+) -> str:
+    """Short hash of an enclosure key for companion cell names."""
+    return sha1(str(key).encode("UTF-8")).hexdigest()[-8:]  # noqa: S324
+
+
+def _separated_elements(cell_inst: kdb.CellInstArray, box: kdb.Box, reach: int) -> bool:
+    """Whether the elements of an array are out of reach of each other.
+
+    Only orthogonal arrays along the axes are checked, others return False.
+    """
+    box = box.transformed(cell_inst.cplx_trans).enlarged(reach)
+    a, b = cell_inst.a, cell_inst.b
+    if cell_inst.na > 1 and cell_inst.nb > 1 and a.x * b.x + a.y * b.y != 0:
+        return False
+    for v, n in ((a, cell_inst.na), (b, cell_inst.nb)):
+        if n < 2:
+            continue
+        if v.x == 0 and v.y != 0:
+            apart = box.height() < abs(v.y)
+        elif v.y == 0 and v.x != 0:
+            apart = box.width() < abs(v.x)
+        else:
+            return False
+        if not apart:
+            return False
+    return True
+
+
+def _apply_hierarchical(
+    c: KCell,
+    ref_layers: Sequence[int],
+    shapes: Sequence[list[kdb.Point] | kdb.Box | kdb.Edge | kdb.Polygon],
+    key: str,
+    enclose: Callable[[dict[int, kdb.Region]], dict[kdb.LayerInfo, kdb.Region]],
+) -> None:
+    """Apply an enclosure to a cell while keeping its hierarchy.
+
+    The enclosure of every child cell is calculated once per call into a new
+    companion cell named `{child.name}_ENC_{key}` (made unique in the layout). The
+    companion is placed like the child wherever the child has no other reference
+    geometry within reach of the enclosure. Arrays whose elements are apart from
+    each other and from anything else get one companion array. Instances close to
+    other geometry and the shapes of the cell itself are enclosed flat. This is
+    applied recursively to the children, so the work and the output scale with the
+    unique cells instead of the instances.
+
+    Args:
+        c: Cell to apply the enclosure to.
+        ref_layers: Layer indexes of the reference geometry.
+        shapes: All minkowski shapes of the enclosure. Companions are only used for
+            instances which don't change these shapes (e.g. rotations of a circle).
+        key: Unique key of the enclosure and shapes for the companion names.
+        enclose: Calculates the enclosure from flat reference regions.
+    """
+    kcl = c.kcl
+    reach = max(
+        (
+            max(abs(b.left), abs(b.right), abs(b.bottom), abs(b.top))
+            for b in (
+                (kdb.Polygon(s) if isinstance(s, list) else s).bbox() for s in shapes
+            )
+        ),
+        default=0,
+    )
+    companions: dict[int, int | None] = {}
+    invariant: dict[tuple[float, bool, float], bool] = {}
+
+    def ref_bbox(cell: kdb.Cell) -> kdb.Box:
+        box = kdb.Box()
+        for li in ref_layers:
+            box += cell.bbox(li)
+        return box
+
+    def keeps_shapes(trans: kdb.ICplxTrans) -> bool:
+        rot_key = (trans.angle, trans.is_mirror(), trans.mag)
+        if rot_key not in invariant:
+            rot = kdb.ICplxTrans(trans.mag, trans.angle, trans.is_mirror(), 0, 0)
+            invariant[rot_key] = not trans.is_mag() and all(
+                _same_shape(shape, _transformed_shape(shape, rot)) for shape in shapes
+            )
+        return invariant[rot_key]
+
+    def companion(cell_index: int) -> int | None:
+        if cell_index not in companions:
+            child = kcl.layout.cell(cell_index)
+            if ref_bbox(child).empty():
+                companions[cell_index] = None
+            else:
+                # companions of earlier calls may be outdated, the child could
+                # have changed since then
+                target = kcl.kcell(
+                    kcl.layout.unique_cell_name(f"{child.name}_ENC_{key}")
+                )
+                enclose_into(kcl[cell_index], target)
+                companions[cell_index] = target.cell_index()
+        return companions[cell_index]
+
+    def enclose_into(src: KCell, target: KCell) -> None:
+        flat = {li: kdb.Region(src.shapes(li)).merged() for li in ref_layers}
+        boxes: list[kdb.Box] = [
+            polygon.bbox() for r in flat.values() for polygon in r.each()
+        ]
+        # (instance, transformation of the array element, bbox of the element)
+        elements: list[tuple[kdb.Instance, kdb.ICplxTrans, kdb.Box]] = []
+        # arrays which can get a companion array as a whole, with their bbox
+        whole: list[tuple[kdb.Instance, kdb.Box]] = []
+        for inst in src.kdb_cell.each_inst():
+            child_box = ref_bbox(inst.cell)
+            if child_box.empty():
+                continue
+            if (
+                inst.is_regular_array()
+                and keeps_shapes(inst.cplx_trans)
+                and _separated_elements(inst.cell_inst, child_box, reach)
+            ):
+                box = kdb.Box()
+                for li in ref_layers:
+                    box += inst.cell_inst.bbox_per_layer(kcl.layout, li)
+                whole.append((inst, box))
+                continue
+            elements.extend(
+                (inst, trans, child_box.transformed(trans))
+                for trans in inst.cell_inst.each_cplx_trans()
+            )
+        if not elements and not boxes and not whole:
+            return
+
+        def alone_boxes() -> set[kdb.Box]:
+            """Enlarged boxes which don't touch any other enlarged box."""
+            reaches = [box.enlarged(reach) for *_, box in elements + whole] + [
+                box.enlarged(reach) for box in boxes
+            ]
+            parts = kdb.Region()
+            parts.merged_semantics = False
+            for box in reaches:
+                parts.insert(box)
+            counts = Counter(reaches)
+            # boxes which are the only one of their cluster have no neighbours
+            return {
+                polygon.bbox()
+                for polygon in parts.merged().interacting(parts, 1, 1).each()
+                if counts[polygon.bbox()] == 1
+            }
+
+        alone = alone_boxes()
+        # arrays close to other geometry are split into their elements, this only
+        # shrinks the boxes, so everything else stays alone
+        crowded = [
+            (inst, box) for inst, box in whole if box.enlarged(reach) not in alone
+        ]
+        if crowded:
+            for inst, _ in crowded:
+                child_box = ref_bbox(inst.cell)
+                elements.extend(
+                    (inst, trans, child_box.transformed(trans))
+                    for trans in inst.cell_inst.each_cplx_trans()
+                )
+            whole = [(inst, box) for inst, box in whole if box.enlarged(reach) in alone]
+            alone = alone_boxes()
+        for inst, _ in whole:
+            cell_index = companion(inst.cell_index)
+            assert cell_index is not None
+            array = inst.cell_inst.dup()
+            array.cell_index = cell_index
+            target.insert(array)
+
+        isolated: dict[int, list[kdb.ICplxTrans]] = defaultdict(list)
+        arrays: dict[int, kdb.Instance] = {}
+        for inst, trans, box in elements:
+            if box.enlarged(reach) not in alone or not keeps_shapes(trans):
+                for li in ref_layers:
+                    flat[li] += kdb.Region(inst.cell.begin_shapes_rec(li)).transformed(
+                        trans
+                    )
+            else:
+                isolated[id(inst)].append(trans)
+                arrays[id(inst)] = inst
+        for inst_id, transformations in isolated.items():
+            inst = arrays[inst_id]
+            cell_index = companion(inst.cell_index)
+            assert cell_index is not None
+            if len(transformations) == inst.cell_inst.size():
+                array = inst.cell_inst.dup()
+                array.cell_index = cell_index
+                target.insert(array)
+            else:
+                for trans in transformations:
+                    target.insert(kdb.CellInstArray(cell_index, trans))
+
+        if any(not r.is_empty() for r in flat.values()):
+            for layer, region in enclose(flat).items():
+                target.shapes(kcl.layer(layer)).insert(region)
+
+    enclose_into(c, c)
+
+
 class KCellEnclosure(BaseModel):
     """Collection of [enclosures][kfactory.enclosure.LayerEnclosure] for cells."""
 
@@ -1447,6 +1914,9 @@ class KCellEnclosure(BaseModel):
         self,
         c: KCell,
         direction: Direction = Direction.BOTH,
+        *,
+        hierarchical: bool = False,
+        cache: EnclosureCache | None = None,
     ) -> None:
         """Apply an enclosure with a vector in y-direction.
 
@@ -1457,6 +1927,9 @@ class KCellEnclosure(BaseModel):
             c: Cell to apply the enclosure to.
             direction: X/Y or both directions, see [kfactory.enclosure.DIRECTION].
                 Uses a box if both directions are selected.
+            hierarchical: Keep the hierarchy, see
+                [apply_minkowski_custom][kfactory.enclosure.KCellEnclosure.apply_minkowski_custom].
+            cache: Reuse the results of identical reference geometry.
         """
         match direction:
             case Direction.BOTH:
@@ -1464,21 +1937,27 @@ class KCellEnclosure(BaseModel):
                 def box(d: int) -> kdb.Box:
                     return kdb.Box(-d, -d, d, d)
 
-                self.apply_minkowski_custom(c, shape=box)
+                self.apply_minkowski_custom(
+                    c, shape=box, hierarchical=hierarchical, cache=cache
+                )
 
             case Direction.Y:
 
                 def edge(d: int) -> kdb.Edge:
                     return kdb.Edge(0, -d, 0, d)
 
-                self.apply_minkowski_custom(c, shape=edge)
+                self.apply_minkowski_custom(
+                    c, shape=edge, hierarchical=hierarchical, cache=cache
+                )
 
             case Direction.X:
 
                 def edge(d: int) -> kdb.Edge:
                     return kdb.Edge(-d, 0, d, 0)
 
-                self.apply_minkowski_custom(c, shape=edge)
+                self.apply_minkowski_custom(
+                    c, shape=edge, hierarchical=hierarchical, cache=cache
+                )
 
             case _:
                 raise ValueError("Undefined direction")
@@ -1509,6 +1988,9 @@ class KCellEnclosure(BaseModel):
         self,
         c: KCell,
         shape: Callable[[int], kdb.Edge | kdb.Polygon | kdb.Box],
+        *,
+        hierarchical: bool = False,
+        cache: EnclosureCache | None = None,
     ) -> None:
         """Apply an enclosure with a custom shape.
 
@@ -1519,29 +2001,64 @@ class KCellEnclosure(BaseModel):
             c: Cell to apply the enclosure to.
             shape: A function that will return a shape which takes one argument
                 the size of the section in dbu.
-            shape: Reference to use as a base for the enclosure.
+            hierarchical: Keep the hierarchy of `c`. The enclosures of each child
+                cell are calculated once into a companion cell
+                (`{child.name}_ENC_{key}`) which is placed along the child. Only
+                instances close to other geometry and the shapes of `c` itself are
+                enclosed flat.
+            cache: Reuse the results of identical reference geometry, see
+                [EnclosureCache][kfactory.enclosure.EnclosureCache].
         """
-        regions = {}
-        for enc in self.enclosures.enclosures:
-            main_layer = c.kcl.layer(enc.main_layer)
-            if not c.bbox(main_layer).empty():
-                rsi = c.begin_shapes_rec(main_layer)
-                r = kdb.Region(rsi)
-                for layer, layersec in enc.layer_sections.items():
-                    if layer not in regions:
-                        reg = kdb.Region()
-                        regions[layer] = reg
-                    else:
-                        reg = regions[layer]
-                    for section in layersec.sections:
-                        reg += self.minkowski_region(
-                            r, section.d_max, shape
-                        ) - self.minkowski_region(r, section.d_min, shape)
+        kcl = c.kcl
+        encs = self.enclosures.enclosures
+        main_layers = list(
+            dict.fromkeys(cast("kdb.LayerInfo", enc.main_layer) for enc in encs)
+        )
+        ref_layers = [kcl.layer(layer) for layer in main_layers]
+        shapes = _section_shapes(
+            (ls for enc in encs for ls in enc.layer_sections.values()), shape
+        )
+        key = _enclosure_key((enc.unnamed_key for enc in encs), main_layers, shapes)
 
-                        reg.merge()
+        def enclose(refs: dict[int, kdb.Region]) -> dict[kdb.LayerInfo, kdb.Region]:
+            return self._minkowski_regions(refs, shape, kcl)
 
-        for layer, region in regions.items():
-            c.shapes(c.kcl.layer(layer)).insert(region)
+        regions: Callable[[dict[int, kdb.Region]], dict[kdb.LayerInfo, kdb.Region]] = (
+            partial(cache, enclose, key=key, dbu=kcl.dbu)
+            if cache is not None
+            else enclose
+        )
+
+        if hierarchical:
+            _apply_hierarchical(
+                c, ref_layers, list(shapes.values()), _hierarchical_key(key), regions
+            )
+            return
+        refs = {li: kdb.Region(c.begin_shapes_rec(li)) for li in ref_layers}
+        for layer, region in regions(refs).items():
+            c.shapes(kcl.layer(layer)).insert(region)
+
+    def _minkowski_regions(
+        self,
+        refs: dict[int, kdb.Region],
+        shape: Callable[[int], kdb.Edge | kdb.Polygon | kdb.Box],
+        kcl: KCLayout,
+    ) -> dict[kdb.LayerInfo, kdb.Region]:
+        """Enclosure regions of the reference regions of the main layers."""
+        regions: dict[kdb.LayerInfo, kdb.Region] = {}
+        for enc in self.enclosures.enclosures:
+            r = refs.get(kcl.layer(enc.main_layer))
+            if r is None or r.is_empty():
+                continue
+            for layer, layersec in enc.layer_sections.items():
+                reg = regions.setdefault(layer, kdb.Region())
+                for section in layersec.sections:
+                    reg += self.minkowski_region(
+                        r, section.d_max, shape
+                    ) - self.minkowski_region(r, section.d_min, shape)
+
+                    reg.merge()
+        return regions
 
     def apply_minkowski_tiled(
         self,
@@ -1550,12 +2067,14 @@ class KCellEnclosure(BaseModel):
         n_pts: int = 64,
         n_threads: int | None = None,
         carve_out_ports: bool = True,
+        sizing_mode: int | None = None,
     ) -> None:
         """Minkowski regions with tiling processor.
 
         Useful if the target is a big or complicated enclosure. Will split target ref
         into tiles and calculate them in parallel. Uses a circle as a shape for the
-        minkowski sum.
+        minkowski sum. All sections are calculated in one pass per tile, sections
+        with the same distance share the sized region.
 
         Args:
             c: Target KCell to apply the enclosures into.
@@ -1568,6 +2087,9 @@ class KCellEnclosure(BaseModel):
             n_threads: Number o threads to use. By default (`None`) it will use as many
                 threads as are set to the process (usually all cores of the machine).
             carve_out_ports: Carves out a box of port_width +
+            sizing_mode: Use `Region.sized` with this KLayout sizing mode instead of
+                minkowski sums with a circle. Much faster, but corners are cut
+                according to the mode instead of rounded. `n_pts` is ignored.
         """
         tp = kdb.TilingProcessor()
         tp.frame = c.dbbox()  # ty:ignore[invalid-assignment]
@@ -1586,7 +2108,7 @@ class KCellEnclosure(BaseModel):
             for layer, layersection in enc.layer_sections.items():
                 li = c.kcl.layer(layer)
                 size = layersection.sections[-1].d_max
-                maxsize = max(maxsize, size)
+                maxsize = max(maxsize, *_section_reaches(layersection.sections))
 
                 for port in ports_by_layer[main_layer]:
                     if port._base.trans:
@@ -1620,90 +2142,44 @@ class KCellEnclosure(BaseModel):
 
         logger.debug("Starting KCellEnclosure on {}", c.kcl._future_cell_name or c.name)
 
-        n_enc = len(self.enclosures.enclosures)
-
-        for i, enc in enumerate(self.enclosures.enclosures):
+        outputs: list[tuple[str, str, Sequence[Section]]] = []
+        for enc in self.enclosures.enclosures:
             assert enc.main_layer is not None
             if not c.bbox(c.kcl.layer(enc.main_layer)).empty():
                 main_layer = c.kcl.layer(enc.main_layer)
                 inp = f"main_layer_{main_layer}"
-                if enc.main_layer not in inputs:
+                if inp not in inputs:
                     tp.input(
                         inp,
                         c.kcl.layout,
                         c.cell_index(),
                         main_layer,
                     )
-                    inputs.add(main_layer)
+                    inputs.add(inp)
                     logger.debug("Created input {}", inp)
 
                 for layer, layer_section in enc.layer_sections.items():
                     li = c.kcl.layer(layer)
                     if (main_layer, layer_section) in layer_regiontilesoperators:
+                        # same sections on the same reference, reuse the result
                         layer_regiontilesoperators[
                             main_layer, layer_section
                         ].layers.append(li)
-                    else:
-                        out = f"target_{li}"
-                        operator = RegionTilesOperator(cell=c, layers=[li])
-                        layer_regiontilesoperators[main_layer, layer_section] = operator
-                        tp.output(out, operator)
-                        logger.debug("Created output {}", out)
-
-                    for section in reversed(layer_section.sections):
-                        queue_str = (
-                            "var max_shape = Polygon.ellipse("
-                            f"Box.new({section.d_max * 2},{section.d_max * 2}),"
-                            f" {n_pts});"
-                            f"var tile_reg = _tile & _frame.sized({maxsize});"
-                        )
-                        match section.d_max:
-                            case d if d > 0:
-                                max_region = (
-                                    "var max_reg = "
-                                    f"{inp}.minkowski_sum(max_shape).merged();"
-                                )
-                            case d if d < 0:
-                                max_region = (
-                                    f"var max_reg = tile_reg - (tile_reg - {inp});"
-                                )
-                            case 0:
-                                max_region = f"var max_reg = {inp} & tile_reg;"
-                        queue_str += max_region
-                        if section.d_min is not None:
-                            queue_str += (
-                                "var min_shape = Polygon.ellipse("
-                                f"Box.new({section.d_min * 2},{section.d_min * 2}),"
-                                " 64);"
-                            )
-                            match section.d_min:
-                                case d if d > 0:
-                                    min_region = (
-                                        f"var min_reg = {inp}.minkowski_sum(min_shape);"
-                                    )
-                                case d if d < 0:
-                                    min_region = (
-                                        "var min_reg = tile_reg - (tile_reg - "
-                                        f"{inp}).minkowski_sum(min_shape);"
-                                    )
-                                case 0:
-                                    min_region = f"var min_reg = {inp} & tile_reg;"
-                            queue_str += min_region
-                            queue_str += (
-                                f"_output({out},(max_reg - min_reg) & _tile, true);"
-                            )
-                        else:
-                            queue_str += f"_output({out}, max_reg & _tile, true);"
-
-                        logger.debug(
-                            "{}/{}: Queuing string for {} on layer {}: '{}'",
-                            i + 1,
-                            n_enc,
-                            c.kcl._future_cell_name or c.name,
-                            layer,
-                            queue_str,
-                        )
-                        tp.queue(queue_str)
+                        continue
+                    out = f"target_{li}"
+                    operator = RegionTilesOperator(cell=c, layers=[li])
+                    layer_regiontilesoperators[main_layer, layer_section] = operator
+                    tp.output(out, operator)
+                    logger.debug("Created output {}", out)
+                    outputs.append((inp, out, layer_section.sections))
+
+        queue_str = _minkowski_tiled_script(outputs, maxsize, n_pts, sizing_mode)
+        logger.debug(
+            "Queuing string for {}: '{}'",
+            c.kcl._future_cell_name or c.name,
+            queue_str,
+        )
+        tp.queue(queue_str)
 
         c.kcl.start_changes()
         logger.debug(
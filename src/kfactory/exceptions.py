@@ -61,7 +61,7 @@ class PortWidthMismatchError(ValueError):
 
     def __init__(
         self,
-        inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any],
+        inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any] | AnyKCell,
         other_inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any] | ProtoPort[Any],
         p1: ProtoPort[Any],
         p2: ProtoPort[Any],
@@ -91,7 +91,7 @@ class PortLayerMismatchError(ValueError):
     def __init__(
         self,
         kcl: KCLayout,
-        inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any],
+        inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any] | AnyKCell,
         other_inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any] | ProtoPort[Any],
         p1: ProtoPort[Any],
         p2: ProtoPort[Any],
@@ -130,7 +130,7 @@ class PortTypeMismatchError(ValueError):
 
     def __init__(
         self,
-        inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any],
+        inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any] | AnyKCell,
         other_inst: ProtoInstance[Any] | ProtoInstanceGroup[Any, Any] | ProtoPort[Any],
         p1: ProtoPort[Any],
         p2: ProtoPort[Any],
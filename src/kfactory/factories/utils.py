@@ -2,22 +2,27 @@
 
 from collections import defaultdict
 from collections.abc import Callable, Sequence
-from functools import partial
 from typing import TYPE_CHECKING, TypeGuard
 
+import numpy as np
+
 from .. import kdb
 from ..cross_section import CrossSection, CrossSectionSpecDict
 from ..enclosure import (
     LayerEnclosure,
+    _band_pts,
     _extrude_path_band_points,
-    extrude_path_dynamic_points,
-    extrude_path_points,
+    _path_array,
+    _width_profile,
+    extrude_path_offsets,
     path_pts_to_polygon,
 )
 from ..kcell import KCell, VKCell
 from ..typings import MetaData
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
+
     from ..cross_section import AnyCrossSection
     from ..layout import KCLayout
 
@@ -81,6 +86,52 @@ def cross_section_from_width(
     )
 
 
+def _extrude_backbone_bands(
+    c: VKCell,
+    pts: "npt.NDArray[np.float64]",
+    widths: "npt.NDArray[np.float64]",
+    layer: kdb.LayerInfo,
+    start_angle: float,
+    end_angle: float,
+    dbu: float,
+    enclosure: LayerEnclosure | None,
+) -> None:
+    """Extrude the main layer and all enclosure sections with one set of normals."""
+    sections = (
+        [
+            (layer_, section)
+            for layer_, layer_sections in enclosure.layer_sections.items()
+            for section in layer_sections.sections
+        ]
+        if enclosure
+        else []
+    )
+    extra = [0.0]
+    for _, section in sections:
+        extra.append(2 * section.d_max * dbu)
+        if section.d_min is not None:
+            extra.append(2 * section.d_min * dbu)
+    half_widths = (widths + np.array(extra)[:, np.newaxis]) / 2
+    edges = extrude_path_offsets(
+        pts, np.concatenate([half_widths, -half_widths]), start_angle, end_angle
+    )
+    top, bot = edges[: len(extra)], edges[len(extra) :]
+
+    c.shapes(c.kcl.layer(layer)).insert(kdb.DPolygon(_band_pts(top[0], bot[0])))
+    i = 1
+    for layer_, section in sections:
+        li = c.kcl.layer(layer_)
+        outer = i
+        i += 1
+        if section.d_min is not None:
+            inner = i
+            i += 1
+            c.shapes(li).insert(kdb.DPolygon(_band_pts(top[outer], top[inner])))
+            c.shapes(li).insert(kdb.DPolygon(_band_pts(bot[inner], bot[outer])))
+        else:
+            c.shapes(li).insert(kdb.DPolygon(_band_pts(top[outer], bot[outer])))
+
+
 def extrude_backbone(
     c: VKCell,
     backbone: Sequence[kdb.DPoint],
@@ -103,42 +154,17 @@ def extrude_backbone(
         end_angle: force a acertain end angle
         dbu: database unit to use as a reference
     """
-    center_path_l, center_path_r = extrude_path_points(
-        backbone, width=width, start_angle=start_angle, end_angle=end_angle
+    pts = _path_array(backbone)
+    _extrude_backbone_bands(
+        c,
+        pts,
+        np.full(len(pts), width, dtype=np.float64),
+        layer,
+        start_angle,
+        end_angle,
+        dbu,
+        enclosure,
     )
-    center_path_r.reverse()
-    c.shapes(c.kcl.layer(layer)).insert(kdb.DPolygon(center_path_l + center_path_r))
-
-    if enclosure:
-        for _layer, sections in enclosure.layer_sections.items():
-            _li = c.kcl.layer(_layer)
-            for section in sections.sections:
-                if section.d_min is not None:
-                    inner_l, inner_r = extrude_path_points(
-                        backbone,
-                        width=width + 2 * section.d_min * dbu,
-                        start_angle=start_angle,
-                        end_angle=end_angle,
-                    )
-                    outer_l, outer_r = extrude_path_points(
-                        backbone,
-                        width=width + 2 * section.d_max * dbu,
-                        start_angle=start_angle,
-                        end_angle=end_angle,
-                    )
-                    inner_l.reverse()
-                    outer_r.reverse()
-                    c.shapes(_li).insert(kdb.DPolygon(outer_l + inner_l))
-                    c.shapes(_li).insert(kdb.DPolygon(inner_r + outer_r))
-                else:
-                    outer_l, outer_r = extrude_path_points(
-                        backbone,
-                        width=width + 2 * section.d_max * dbu,
-                        start_angle=start_angle,
-                        end_angle=end_angle,
-                    )
-                    outer_r.reverse()
-                    c.shapes(_li).insert(kdb.DPolygon(outer_l + outer_r))
 
 
 def extrude_backbone_cross_section(
@@ -227,48 +253,20 @@ def extrude_backbone_dynamic(
         dbu: database unit to use as a reference
     """
 
-    def width_f(x: float, a: float) -> float:
-        return (width1 - width2) * (1 - x) + width2 + a
+    def width_f(x: "npt.NDArray[np.float64]") -> "npt.NDArray[np.float64]":
+        return (width1 - width2) * (1 - x) + width2
 
-    center_path_l, center_path_r = extrude_path_dynamic_points(
-        backbone,
-        widths=partial(width_f, a=0),
-        start_angle=start_angle,
-        end_angle=end_angle,
+    pts = _path_array(backbone)
+    _extrude_backbone_bands(
+        c,
+        pts,
+        _width_profile(pts, width_f),
+        layer,
+        start_angle,
+        end_angle,
+        dbu,
+        enclosure,
     )
-    center_path_r.reverse()
-    c.shapes(c.kcl.layer(layer)).insert(kdb.DPolygon(center_path_l + center_path_r))
-
-    if enclosure:
-        for _layer, sections in enclosure.layer_sections.items():
-            _li = c.kcl.layer(_layer)
-            for section in sections.sections:
-                if section.d_min is not None:
-                    inner_l, inner_r = extrude_path_dynamic_points(
-                        backbone,
-                        widths=partial(width_f, a=2 * section.d_min * dbu),
-                        start_angle=start_angle,
-                        end_angle=end_angle,
-                    )
-                    outer_l, outer_r = extrude_path_dynamic_points(
-                        backbone,
-                        widths=partial(width_f, a=2 * section.d_max * dbu),
-                        start_angle=start_angle,
-                        end_angle=end_angle,
-                    )
-                    inner_l.reverse()
-                    outer_r.reverse()
-                    c.shapes(_li).insert(kdb.DPolygon(outer_l + inner_l))
-                    c.shapes(_li).insert(kdb.DPolygon(inner_r + outer_r))
-                else:
-                    outer_l, outer_r = extrude_path_dynamic_points(
-                        backbone,
-                        widths=partial(width_f, a=2 * section.d_max * dbu),
-                        start_angle=start_angle,
-                        end_angle=end_angle,
-                    )
-                    outer_r.reverse()
-                    c.shapes(_li).insert(kdb.DPolygon(outer_l + outer_r))
 
 
 def _is_additional_info_func(
@@ -143,7 +143,11 @@ class ProtoTInstance[T: (int, float)](ProtoInstance[T]):
 
     @name.setter
     def name(self, value: str | None) -> None:
+        old_name = self.instance.property(PROPID.NAME)
         self.instance.set_property(PROPID.NAME, value)
+        tkcell = self.kcl.tkcells.get(self.instance.parent_cell.cell_index())
+        if tkcell is not None:
+            tkcell._rename_inst(self.instance, old_name, value)
 
     @property
     @abstractmethod
@@ -520,10 +524,13 @@ class ProtoTInstance[T: (int, float)](ProtoInstance[T]):
             levels: If level < #hierarchy-levels -> pull the sub instances to self,
                 else pull the polygons. None will always flatten all levels.
         """
+        tkcell = self.kcl.tkcells.get(self._instance.parent_cell.cell_index())
         if levels:
             self._instance.flatten(levels)
         else:
             self._instance.flatten()
+        if tkcell is not None:
+            tkcell._invalidate_inst_name_index()
 
 
 class Instance(ProtoTInstance[int], DBUGeometricObject):
@@ -817,27 +824,20 @@ class VInstance(ProtoInstance[float], UMGeometricObject):
                 )
             if trans_ != kdb.DCplxTrans():
                 cell_name += f"_{trans_.hash():x}"
-            if cell.kcl.layout_cell(cell_name) is None:
+            cell_ = cell.kcl._get_materialized_cell(self.cell, trans_)
+            if cell_ is None and cell.kcl.layout_cell(cell_name) is not None:
+                cell_ = cell.kcl[cell_name]
+            if cell_ is None:
                 cell_ = KCell(kcl=self.cell.kcl, name=cell_name)  # self.cell.dup()
                 for layer, shapes in self.cell.shapes().items():
-                    for shape in shapes.transform(trans_):
-                        if isinstance(shape, kdb.DPolygon | kdb.DSimplePolygon):
-                            cell_.shapes(layer).insert(shape.to_itype(cell.kcl.dbu))
-                        else:
-                            cell_.shapes(layer).insert(shape)
+                    r = shapes.to_region(trans_, cell.kcl.dbu)
+                    if not r.is_empty():
+                        cell_.shapes(layer).insert(r.merged())
                 for inst in self.cell.insts:
                     inst.insert_into(cell=cell_, trans=trans_)
                 cell_.name = cell_name
                 for port in self.cell.ports:
                     cell_.add_port(port=port.copy(trans_))
-                for c_shapes in (
-                    cell_.shapes(layer) for layer in cell_.kcl.layer_indexes()
-                ):
-                    if not c_shapes.is_empty():
-                        r = kdb.Region(c_shapes)
-                        r.merge()
-                        c_shapes.clear()
-                        c_shapes.insert(r)
                 settings = self.cell.settings.model_copy()
                 settings_units = self.cell.settings_units.model_copy()
                 cell_.settings = settings
@@ -848,8 +848,7 @@ class VInstance(ProtoInstance[float], UMGeometricObject):
                 cell_._base.virtual = True
                 if trans_ != kdb.DCplxTrans.R0:
                     cell_._base.vtrans = trans_
-            else:
-                cell_ = cell.kcl[cell_name]
+                cell.kcl._register_materialized_cell(self.cell, trans_, cell_)
             inst_ = cell.create_inst(
                 cell=cell_, na=self.na, nb=self.nb, a=self.a, b=self.b
             )
@@ -875,7 +874,10 @@ class VInstance(ProtoInstance[float], UMGeometricObject):
                 inst_.name = self._name
             inst_.transform(base_trans)
             return Instance(kcl=self.cell.kcl, instance=inst_.instance)
-        if cell.kcl.layout_cell(cell_name) is None:
+        tkcell = cell.kcl._get_materialized_cell(self.cell, trans_)
+        if tkcell is None and cell.kcl.layout_cell(cell_name) is not None:
+            tkcell = cell.kcl[cell_name]
+        if tkcell is None:
             tkcell = self.cell.dup()
             tkcell.name = cell_name
             tkcell.flatten(True)
@@ -893,8 +895,7 @@ class VInstance(ProtoInstance[float], UMGeometricObject):
             tkcell.function_name = self.cell.function_name
             tkcell.basename = self.cell.basename
             tkcell._base.vtrans = trans_
-        else:
-            tkcell = cell.kcl[cell_name]
+            cell.kcl._register_materialized_cell(self.cell, trans_, tkcell)
         inst_ = cell.create_inst(
             cell=tkcell, na=self.na, nb=self.nb, a=self.a, b=self.b
         )
@@ -936,13 +937,15 @@ class VInstance(ProtoInstance[float], UMGeometricObject):
 
         if isinstance(self.cell, VKCell):
             for layer, shapes in self.cell.shapes().items():
-                for shape in shapes.transform(trans_):
-                    if isinstance(cell, ProtoTKCell) and isinstance(
-                        shape, kdb.DPolygon | kdb.DSimplePolygon
-                    ):
-                        cell.shapes(layer).insert(shape.to_itype(cell.kcl.dbu))
-                    else:
-                        cell.shapes(layer).insert(shape)  # ty:ignore[no-matching-overload]
+                if isinstance(cell, ProtoTKCell):
+                    dbu = cell.kcl.dbu
+                    target = cell.shapes(layer)
+                    target.insert(shapes.to_region(trans_, dbu))
+                    target.insert(shapes.to_texts(trans_, dbu))
+                    target.insert(shapes.to_edges(trans_, dbu))
+                else:
+                    for shape in shapes.transform(trans_):
+                        cell.shapes(layer).insert(shape)
             for inst in self.cell.insts:
                 if levels is not None:
                     if levels > 0:
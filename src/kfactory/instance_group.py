@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import MutableSequence
 from functools import cached_property
 from typing import TYPE_CHECKING, Any, NoReturn, overload
 
@@ -17,23 +18,85 @@ from .port import BasePort, DPort, Port, ProtoPort
 from .ports import DCreatePort, DPorts, ICreatePort, Ports, ProtoPorts
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     from .layout import KCLayout
 
 __all__ = [
     "DInstanceGroup",
     "InstanceGroup",
+    "InstanceView",
     "ProtoInstanceGroup",
     "ProtoTInstanceGroup",
     "VInstanceGroup",
 ]
 
 
+class InstanceView[TI: ProtoTInstance[Any]](MutableSequence[TI]):
+    """List of KLayout instances which are wrapped only when accessed.
+
+    Used by bulk instance creation, where building an `Instance` object for each
+    placement up front would cost more than the insertion itself.
+
+    Args:
+        kcl: The KCLayout of the instances.
+        instances: The KLayout instances.
+        inst_type: The instance class to wrap them in, e.g. `Instance`.
+    """
+
+    instances: list[kdb.Instance]
+
+    def __init__(
+        self, kcl: KCLayout, instances: list[kdb.Instance], inst_type: type[TI]
+    ) -> None:
+        self.kcl = kcl
+        self.instances = instances
+        self._inst_type = inst_type
+
+    def _wrap(self, instance: kdb.Instance) -> TI:
+        return self._inst_type(kcl=self.kcl, instance=instance)
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    def __iter__(self) -> Iterator[TI]:
+        return (self._wrap(inst) for inst in self.instances)
+
+    @overload
+    def __getitem__(self, index: int) -> TI: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[TI]: ...
+    def __getitem__(self, index: int | slice) -> TI | list[TI]:
+        if isinstance(index, slice):
+            return [self._wrap(inst) for inst in self.instances[index]]
+        return self._wrap(self.instances[index])
+
+    @overload
+    def __setitem__(self, index: int, value: TI) -> None: ...
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[TI]) -> None: ...
+    def __setitem__(self, index: int | slice, value: TI | Iterable[TI]) -> None:
+        if isinstance(index, slice):
+            assert not isinstance(value, ProtoTInstance)
+            self.instances[index] = [inst.instance for inst in value]
+        else:
+            assert isinstance(value, ProtoTInstance)
+            self.instances[index] = value.instance
+
+    def __delitem__(self, index: int | slice) -> None:
+        del self.instances[index]
+
+    def insert(self, index: int, value: TI) -> None:
+        self.instances.insert(index, value.instance)
+
+    def __repr__(self) -> str:
+        return f"InstanceView({self.instances!r})"
+
+
 class ProtoInstanceGroup[T: (int, float), TI: ProtoTInstance[Any] | VInstance](
     GeometricObject[T], ABC
 ):
-    insts: list[TI]
+    insts: MutableSequence[TI]
     _base_ports: list[BasePort]
 
     def __init__(
@@ -41,8 +104,15 @@ class ProtoInstanceGroup[T: (int, float), TI: ProtoTInstance[Any] | VInstance](
         insts: Sequence[TI] | None = None,
         ports: Sequence[ProtoPort[Any]] | None = None,
     ) -> None:
-        """Initialize the InstanceGroup."""
-        self.insts = list(insts) if insts is not None else []
+        """Initialize the InstanceGroup.
+
+        An [InstanceView][kfactory.instance_group.InstanceView] is used as is,
+        any other sequence is copied to a list.
+        """
+        if isinstance(insts, InstanceView):
+            self.insts = insts
+        else:
+            self.insts = list(insts) if insts is not None else []
         self._base_ports = [p.base for p in ports] if ports is not None else []
 
     @abstractmethod
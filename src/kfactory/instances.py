@@ -5,7 +5,6 @@ from typing import TYPE_CHECKING, Any
 
 import klayout.db as kdb
 
-from .conf import PROPID
 from .instance import (
     DInstance,
     Instance,
@@ -79,20 +78,25 @@ class ProtoTInstances[T: (int, float)](ProtoInstances[T, ProtoTInstance[T]], ABC
         yield from self._tkcell.kdb_cell.each_inst()
 
     def _get_inst(self, item: kdb.Instance | str) -> kdb.Instance:
-        try:
-            if isinstance(item, kdb.Instance):
+        if isinstance(item, kdb.Instance):
+            try:
                 return next(filter(lambda inst: inst == item, self._insts))
-            return next(
-                filter(lambda inst: inst.property(PROPID.NAME) == item, self._insts)
-            )
-        except StopIteration as e:
-            raise ValueError(f"Instance {item} not found in {self._tkcell}") from e
+            except StopIteration as e:
+                raise ValueError(f"Instance {item} not found in {self._tkcell}") from e
+        inst = self._tkcell._get_named_inst(item)
+        if inst is None:
+            raise ValueError(f"Instance {item} not found in {self._tkcell}")
+        return inst
+
+    def _delete(self, inst: kdb.Instance) -> None:
+        self._tkcell._unindex_inst(inst)
+        inst.delete()
 
     def __delitem__(self, item: ProtoTInstance[Any] | int) -> None:
         if isinstance(item, int):
-            list(self._insts)[item].delete()
+            self._delete(list(self._insts)[item])
         else:
-            self._get_inst(item.instance).delete()
+            self._delete(self._get_inst(item.instance))
 
     def __contains__(self, key: str | int | ProtoTInstance[Any]) -> bool:
         try:
@@ -100,8 +104,7 @@ class ProtoTInstances[T: (int, float)](ProtoInstances[T, ProtoTInstance[T]], ABC
                 self._get_inst(key.instance)
                 return True
             if isinstance(key, str):
-                self._get_inst(key)
-                return True
+                return self._tkcell._get_named_inst(key) is not None
             return key < len(self)
         except ValueError:
             return False
@@ -112,12 +115,25 @@ class ProtoTInstances[T: (int, float)](ProtoInstances[T, ProtoTInstance[T]], ABC
     def clear(self) -> None:
         for inst in self._insts:
             inst.delete()
+        self._tkcell._invalidate_inst_name_index()
+
+    def reindex(self) -> None:
+        """Rebuild the index used to look up instances by name.
+
+        kfactory keeps the index up to date when instances are inserted, renamed
+        or deleted through kfactory. Call this after renaming instances directly
+        through KLayout, e.g. with `kdb.Instance.set_property`.
+        """
+        self._tkcell._invalidate_inst_name_index()
 
     def append(self, inst: ProtoTInstance[Any]) -> None:
         """Append a new instance."""
-        self._tkcell.kdb_cell.insert(inst.instance)
+        self._tkcell._index_inst(self._tkcell.kdb_cell.insert(inst.instance))
 
     def remove(self, inst: ProtoTInstance[Any]) -> None:
+        tkcell = self._tkcell.kcl.tkcells.get(inst.instance.parent_cell.cell_index())
+        if tkcell is not None:
+            tkcell._unindex_inst(inst.instance)
         inst.instance.delete()
 
     def to_itype(self) -> Instances:
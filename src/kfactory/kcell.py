@@ -40,6 +40,8 @@ from typing import (
     overload,
 )
 
+import numpy as np
+import numpy.typing as npt
 import ruamel.yaml
 from klayout import __version__ as _klayout_version
 from pydantic import (
@@ -53,12 +55,20 @@ from semver import Version
 from . import kdb, rdb
 from .checks import (
     _collect_inst_ports,
+    _run_per_cell,
     dangling_ports_check,
     instance_overlap_check,
     port_mismatch_check,
     shape_instance_overlap_check,
 )
-from .conf import DEFAULT_TRANS, CheckInstances, ShowFunction, config, logger
+from .conf import (
+    DEFAULT_TRANS,
+    PROPID,
+    CheckInstances,
+    ShowFunction,
+    config,
+    logger,
+)
 from .cross_section import (
     AsymmetricalCrossSection,
     AsymmetricCrossSection,
@@ -72,6 +82,7 @@ from .cross_section import (
 from .exceptions import DuplicateCellNameError, LockedError, MergeError
 from .geometry import DBUGeometricObject, GeometricObject, UMGeometricObject
 from .instance import DInstance, Instance, ProtoInstance, ProtoTInstance, VInstance
+from .instance_group import DInstanceGroup, InstanceGroup, InstanceView
 from .instances import (
     DInstances,
     Instances,
@@ -120,6 +131,7 @@ if TYPE_CHECKING:
     from kfnetlist import Net, Netlist
     from ruamel.yaml.representer import BaseRepresenter, MappingNode
 
+    from .checks import CheckCache, ReportDB
     from .layout import KCLayout
     from .schematic import TSchematic
 
@@ -555,6 +567,10 @@ class TKCell(BaseKCell):
     vtrans: kdb.DCplxTrans | None = None
     _schematic: TSchematic[Any] | None = PrivateAttr(default=None)
     _library_cell: KCell | None = PrivateAttr(default=None)
+    _insts_name_index: dict[str, kdb.Instance] | None = PrivateAttr(default=None)
+    _insts_name_index_size: int = PrivateAttr(default=0)
+    _insts_duplicate_names: set[str] = PrivateAttr(default_factory=set)
+    _check_fingerprint: str | None = PrivateAttr(default=None)
 
     def __getattr__(self, name: str) -> Any:
         """If KCell doesn't have an attribute, look in the KLayout Cell."""
@@ -579,11 +595,110 @@ class TKCell(BaseKCell):
     def locked(self, value: bool) -> None:
         if self.kdb_cell.is_locked() != value:
             self._ports_name_cache.clear()
+            self._check_fingerprint = None
         self.kdb_cell.locked = value
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name={self.kdb_cell.name})"
 
+    def _inst_name_index(self) -> dict[str, kdb.Instance]:
+        """Index of the named instances of the cell.
+
+        kfactory's insert, rename and delete paths keep the index up to date. It
+        is rebuilt lazily if it was invalidated or the number of instances
+        changed without going through kfactory (e.g. direct `kdb.Cell.insert`
+        calls).
+        """
+        size = self.kdb_cell.child_instances()
+        if self._insts_name_index is None or self._insts_name_index_size != size:
+            index: dict[str, kdb.Instance] = {}
+            duplicates: set[str] = set()
+            for inst in self.kdb_cell.each_inst():
+                name = inst.property(PROPID.NAME)
+                if name is not None:
+                    if name in index:
+                        duplicates.add(name)
+                    else:
+                        index[name] = inst
+            self._insts_name_index = index
+            self._insts_name_index_size = size
+            self._insts_duplicate_names = duplicates
+        return self._insts_name_index
+
+    def _invalidate_inst_name_index(self) -> None:
+        self._insts_name_index = None
+
+    def _get_named_inst(self, name: str) -> kdb.Instance | None:
+        """Get the first instance with the name `name` from the index.
+
+        A miss is trusted. An entry whose instance was deleted or renamed in the
+        meantime rebuilds the index once. Instances renamed directly through
+        KLayout (setting the `PROPID.NAME` property) are only found under their
+        new name after
+        [`Instances.reindex`][kfactory.instances.ProtoTInstances.reindex].
+        """
+        inst = self._inst_name_index().get(name)
+        if inst is not None and not (
+            inst.is_valid() and inst.property(PROPID.NAME) == name
+        ):
+            self._invalidate_inst_name_index()
+            inst = self._inst_name_index().get(name)
+        return inst
+
+    def _index_inst(self, inst: kdb.Instance) -> None:
+        """Register a newly inserted instance in the name index."""
+        if self._insts_name_index is None:
+            return
+        self._insts_name_index_size += 1
+        name = inst.property(PROPID.NAME)
+        if name is not None:
+            self._index_inst_name(inst, name)
+
+    def _index_insts(self, insts: Sequence[kdb.Instance]) -> None:
+        """Register many newly inserted instances in the name index."""
+        if self._insts_name_index is None:
+            return
+        self._insts_name_index_size += len(insts)
+        for inst in insts:
+            name = inst.property(PROPID.NAME)
+            if name is not None:
+                self._index_inst_name(inst, name)
+
+    def _index_inst_name(self, inst: kdb.Instance, name: str) -> None:
+        index = self._insts_name_index
+        if index is None:
+            return
+        if name in index and index[name] != inst:
+            self._insts_duplicate_names.add(name)
+        else:
+            index[name] = inst
+
+    def _unindex_inst(self, inst: kdb.Instance) -> None:
+        """Remove an instance which is about to be deleted from the name index."""
+        if self._insts_name_index is None:
+            return
+        self._insts_name_index_size -= 1
+        self._unindex_inst_name(inst, inst.property(PROPID.NAME))
+
+    def _unindex_inst_name(self, inst: kdb.Instance, name: str | None) -> None:
+        index = self._insts_name_index
+        if index is None or name is None:
+            return
+        if name in self._insts_duplicate_names:
+            # another instance might carry the same name, let the next
+            # lookup find it
+            self._invalidate_inst_name_index()
+        elif index.get(name) == inst:
+            del index[name]
+
+    def _rename_inst(
+        self, inst: kdb.Instance, old_name: str | None, new_name: str | None
+    ) -> None:
+        """Update the name index after an instance was renamed."""
+        self._unindex_inst_name(inst, old_name)
+        if new_name is not None:
+            self._index_inst_name(inst, new_name)
+
     @property
     def name(self) -> str:
         return self.kdb_cell.name
@@ -1112,6 +1227,18 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
         static_name_separator: str = "__",
     ) -> Instance | DInstance: ...
 
+    @abstractmethod
+    def create_insts(
+        self,
+        cell: ProtoTKCell[Any] | int,
+        transforms: Any,
+        *,
+        names: Sequence[str] | None = None,
+        detect_arrays: bool = True,
+        libcell_as_static: bool = False,
+        static_name_separator: str = "__",
+    ) -> InstanceGroup | DInstanceGroup: ...
+
     def _get_ci(
         self,
         cell: ProtoTKCell[Any],
@@ -1208,6 +1335,7 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
             inst = self._base.kdb_cell.insert(
                 kdb.CellInstArray(ci, trans, a, b, na, nb)
             )
+        self._base._index_inst(inst)
         return Instance(kcl=self.kcl, instance=inst)
 
     def dcreate_inst(
@@ -1261,8 +1389,181 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
             inst = self._base.kdb_cell.insert(
                 kdb.DCellInstArray(ci, trans, a, b, na, nb)
             )
+        self._base._index_inst(inst)
         return DInstance(kcl=self.kcl, instance=inst)
 
+    def icreate_insts(
+        self,
+        cell: ProtoTKCell[Any] | int,
+        transforms: npt.ArrayLike | Sequence[kdb.Trans | kdb.Vector | kdb.ICplxTrans],
+        *,
+        names: Sequence[str] | None = None,
+        detect_arrays: bool = True,
+        libcell_as_static: bool = False,
+        static_name_separator: str = "__",
+    ) -> InstanceGroup:
+        """Add many instances of another KCell at once.
+
+        Placements which form a full, regular and axis-aligned lattice are
+        inserted as a single `kdb.CellInstArray`.
+
+        Args:
+            cell: The cell to be added
+            transforms: Either an `(N, 2)` array of displacements in dbu or a
+                sequence of integer transformations.
+            names: Names of the instances. Must have the same length as
+                `transforms`. Named placements are never merged into arrays.
+            detect_arrays: Try to emit regular lattices as instance arrays.
+            libcell_as_static: If the cell is a Library cell
+                (different KCLayout object), convert it to a static cell.
+            static_name_separator: String to separate the KCLayout name from the cell
+                name when converting library cells to static cells.
+
+        Returns:
+            An instance group holding the created instances.
+        """
+        ci = (
+            cell
+            if isinstance(cell, int)
+            else self._get_ci(cell, libcell_as_static, static_name_separator)
+        )
+        base, disps, transs = _split_transforms(
+            transforms, kdb.ICplxTrans, (kdb.Vector, kdb.Trans, kdb.ICplxTrans)
+        )
+        if disps is not None:
+            disps_ = np.rint(disps).astype(np.int64)
+            if not np.array_equal(disps_, disps):
+                raise ValueError(
+                    "icreate_insts expects displacements in dbu (integers). "
+                    "Use dcreate_insts for displacements in um."
+                )
+            insts = self._insert_insts(
+                ci, base, disps_, names=names, detect_arrays=detect_arrays
+            )
+        else:
+            insts = self._insert_named(
+                (kdb.CellInstArray(ci, t) for t in transs), names, len(transs)
+            )
+        return InstanceGroup(insts=InstanceView(self.kcl, insts, Instance))
+
+    def dcreate_insts(
+        self,
+        cell: ProtoTKCell[Any] | int,
+        transforms: npt.ArrayLike | Sequence[kdb.DTrans | kdb.DVector | kdb.DCplxTrans],
+        *,
+        names: Sequence[str] | None = None,
+        detect_arrays: bool = True,
+        libcell_as_static: bool = False,
+        static_name_separator: str = "__",
+    ) -> DInstanceGroup:
+        """Add many instances of another KCell at once.
+
+        Placements which form a full, regular and axis-aligned lattice on the
+        dbu grid are inserted as a single `kdb.CellInstArray`.
+
+        Args:
+            cell: The cell to be added
+            transforms: Either an `(N, 2)` array of displacements in um or a
+                sequence of um transformations.
+            names: Names of the instances. Must have the same length as
+                `transforms`. Named placements are never merged into arrays.
+            detect_arrays: Try to emit regular lattices as instance arrays.
+            libcell_as_static: If the cell is a Library cell
+                (different KCLayout object), convert it to a static cell.
+            static_name_separator: String to separate the KCLayout name from the cell
+                name when converting library cells to static cells.
+
+        Returns:
+            An instance group holding the created instances.
+        """
+        ci = (
+            cell
+            if isinstance(cell, int)
+            else self._get_ci(cell, libcell_as_static, static_name_separator)
+        )
+        base, disps, transs = _split_transforms(
+            transforms, kdb.DCplxTrans, (kdb.DVector, kdb.DTrans, kdb.DCplxTrans)
+        )
+        dbu = self.kcl.dbu
+        if disps is not None:
+            disps_ = np.rint(disps / dbu).astype(np.int64)
+            if np.allclose(disps_ * dbu, disps, rtol=0, atol=dbu * 1e-3):
+                insts = self._insert_insts(
+                    ci,
+                    base.to_itrans(dbu),
+                    disps_,
+                    names=names,
+                    detect_arrays=detect_arrays,
+                )
+            else:
+                insts = self._insert_named(
+                    (
+                        kdb.DCellInstArray(ci, kdb.DCplxTrans(x, y) * base)
+                        for x, y in disps.tolist()
+                    ),
+                    names,
+                    len(disps),
+                )
+        else:
+            insts = self._insert_named(
+                (kdb.DCellInstArray(ci, t) for t in transs), names, len(transs)
+            )
+        return DInstanceGroup(insts=InstanceView(self.kcl, insts, DInstance))
+
+    def _insert_insts(
+        self,
+        ci: int,
+        base: kdb.ICplxTrans,
+        disps: npt.NDArray[np.int64],
+        *,
+        names: Sequence[str] | None,
+        detect_arrays: bool,
+    ) -> list[kdb.Instance]:
+        if detect_arrays and names is None:
+            lattice = _regular_lattice(disps)
+            if lattice is not None:
+                origin, a, b, na, nb = lattice
+                inst = self._base.kdb_cell.insert(
+                    kdb.CellInstArray(ci, kdb.ICplxTrans(origin) * base, a, b, na, nb)
+                )
+                self._base._index_inst(inst)
+                return [inst]
+        # The inserted instances are copies, so one array is reused and only
+        # its transformation is updated per placement.
+        array = kdb.CellInstArray(ci, base)
+        complex_ = array.is_complex()
+        angle, mirror = base.s_trans().angle, base.is_mirror()
+
+        def arrays() -> Iterator[kdb.CellInstArray]:
+            for x, y in disps.tolist():
+                if complex_:
+                    array.cplx_trans = kdb.ICplxTrans(
+                        base.mag, base.angle, mirror, x, y
+                    )
+                else:
+                    array.trans = kdb.Trans(angle, mirror, x, y)
+                yield array
+
+        return self._insert_named(arrays(), names, len(disps))
+
+    def _insert_named(
+        self,
+        arrays: Iterable[kdb.CellInstArray | kdb.DCellInstArray],
+        names: Sequence[str] | None,
+        n: int,
+    ) -> list[kdb.Instance]:
+        if names is not None and len(names) != n:
+            raise ValueError(
+                f"Got {len(names)} names for {n} instances, the numbers must match."
+            )
+        insert = self._base.kdb_cell.insert
+        insts = [insert(array) for array in arrays]
+        if names is not None:
+            for inst, name in zip(insts, names, strict=True):
+                inst.set_property(PROPID.NAME, name)
+        self._base._index_insts(insts)
+        return insts
+
     def _kdb_copy(self) -> kdb.Cell:
         return self._base.kdb_cell.dup()
 
@@ -1305,6 +1606,7 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
             vinst.insert_into_flat(self)
         self._base.vinsts = VInstances()
         self._base.kdb_cell.flatten(False)
+        self._base._invalidate_inst_name_index()
 
         if merge:
             for layer in self.kcl.layout.layer_indexes():
@@ -1340,6 +1642,7 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
                     kc.convert_to_static(recursive=recursive)
 
         self._base.kdb_cell = kdb_cell
+        self._base._invalidate_inst_name_index()
         for ci in old_kdb_cell.caller_cells():
             c = self.kcl.layout_cell(ci)
             assert c is not None
@@ -1683,11 +1986,14 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
         if self.locked:
             raise LockedError(self)
         if isinstance(inst, Instance):
-            return Instance(self.kcl, self._base.kdb_cell.insert(inst.instance))
-        if not property_id:
-            return Instance(self.kcl, self._base.kdb_cell.insert(inst))
-        assert isinstance(inst, kdb.CellInstArray | kdb.DCellInstArray)
-        return Instance(self.kcl, self._base.kdb_cell.insert(inst, property_id))
+            kdb_inst = self._base.kdb_cell.insert(inst.instance)
+        elif not property_id:
+            kdb_inst = self._base.kdb_cell.insert(inst)
+        else:
+            assert isinstance(inst, kdb.CellInstArray | kdb.DCellInstArray)
+            kdb_inst = self._base.kdb_cell.insert(inst, property_id)
+        self._base._index_inst(kdb_inst)
+        return Instance(self.kcl, kdb_inst)
 
     @overload
     def transform(
@@ -2402,15 +2708,17 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
 
         netlist.add(circ)
 
-    def connectivity_check(
+    def connectivity_check[R: ReportDB](
         self,
         port_types: list[str] | None = None,
         layers: list[int] | None = None,
-        db: rdb.ReportDatabase | None = None,
+        db: R | None = None,
         recursive: bool = True,
         add_cell_ports: bool = False,
         check_layer_connectivity: bool = True,
-    ) -> rdb.ReportDatabase:
+        cache: CheckCache | None = None,
+        max_workers: int = 1,
+    ) -> R:
         """Create a ReportDatabase aggregating all standalone connectivity checks.
 
         This is the all-in-one pass/fail entry point. It runs
@@ -2425,30 +2733,48 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
         Args:
             port_types: Filter for certain port types.
             layers: Only create the report for certain layers.
-            db: Use an existing ReportDatabase instead of creating a new one.
+            db: Use an existing ReportDatabase instead of creating a new one. Pass
+                a [`ReportSink`][kfactory.checks.ReportSink] to stream the items
+                to disk or only count them.
             recursive: Create the report not only for this cell, but all child
                 cells as well.
             add_cell_ports: Also add a category "CellPorts" which contains all
                 the cell's selected ports.
             check_layer_connectivity: Run the shape/instance overlap checks.
+            cache: Take the results of unchanged cells from this
+                [`CheckCache`][kfactory.checks.CheckCache] and add the results of
+                new or changed cells to it.
+            max_workers: Number of worker processes checking the child cells if
+                `recursive` is set. The workers are forked and inherit the
+                layout, each cell's report is written into `db` in bottom-up
+                order, so the result does not depend on it.
         """
         port_types = port_types or []
         layers = layers or []
-        db_: rdb.ReportDatabase = db or rdb.ReportDatabase(
-            f"Connectivity Check {self.name}"
-        )
+        db_ = db or cast("R", rdb.ReportDatabase(f"Connectivity Check {self.name}"))
         if recursive:
             cc = self.called_cells()
-            for c in self.kcl.each_cell_bottom_up():
-                if c in cc:
-                    self.kcl[c].connectivity_check(
-                        port_types=port_types,
-                        layers=layers,
-                        db=db_,
-                        recursive=False,
-                        add_cell_ports=add_cell_ports,
-                        check_layer_connectivity=check_layer_connectivity,
-                    )
+
+            def check(
+                c: ProtoTKCell[Any], db: ReportDB, cache: CheckCache | None
+            ) -> None:
+                c.connectivity_check(
+                    port_types=port_types,
+                    layers=layers,
+                    db=db,
+                    recursive=False,
+                    add_cell_ports=add_cell_ports,
+                    check_layer_connectivity=check_layer_connectivity,
+                    cache=cache,
+                )
+
+            _run_per_cell(
+                [self.kcl[c] for c in self.kcl.each_cell_bottom_up() if c in cc],
+                check,
+                db_,
+                max_workers=max_workers,
+                cache=cache,
+            )
 
         port_mismatch_check(
             self,
@@ -2457,6 +2783,7 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
             db=db_,
             recursive=False,
             add_cell_ports=add_cell_ports,
+            cache=cache,
         )
         dangling_ports_check(
             self,
@@ -2464,6 +2791,7 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
             layers=layers,
             db=db_,
             recursive=False,
+            cache=cache,
         )
         if check_layer_connectivity:
             # Preserve original behaviour: only scan layers that carry at least
@@ -2476,12 +2804,14 @@ class ProtoTKCell[T: (int, float)](ProtoKCell[T, TKCell], ABC):
                     layers=gated_layers,
                     db=db_,
                     recursive=False,
+                    cache=cache,
                 )
                 shape_instance_overlap_check(
                     self,
                     layers=gated_layers,
                     db=db_,
                     recursive=False,
+                    cache=cache,
                 )
         return db_
 
@@ -2540,6 +2870,87 @@ def _reconstruct(
     return kcls[kcl_name].factories[factory_name](**settings)
 
 
+def _split_transforms[TC: (kdb.ICplxTrans, kdb.DCplxTrans)](
+    transforms: Any,
+    cplx_type: type[TC],
+    trans_types: tuple[type, ...],
+) -> tuple[TC, npt.NDArray[Any] | None, list[TC]]:
+    """Split bulk placements into a common base transformation and displacements.
+
+    Returns:
+        `(base, displacements, [])` if all placements only differ by their
+        displacement, otherwise `(base, None, transformations)`.
+    """
+    if isinstance(transforms, np.ndarray) or not all(
+        isinstance(t, trans_types) for t in transforms
+    ):
+        disps = np.asarray(transforms)
+        if disps.size == 0:
+            return cplx_type(), np.zeros((0, 2)), []
+        if disps.ndim != 2 or disps.shape[1] != 2:
+            raise ValueError(
+                f"Displacements must be of shape (N, 2), got {disps.shape}."
+            )
+        return cplx_type(), disps, []
+    if not transforms:
+        return cplx_type(), np.zeros((0, 2)), []
+    # Fast paths for the common cases, which avoid a complex transformation per
+    # placement.
+    vector_type, simple_type, _ = trans_types
+    if all(isinstance(t, vector_type) for t in transforms):
+        return cplx_type(), np.array([(v.x, v.y) for v in transforms]), []
+    if all(isinstance(t, simple_type) for t in transforms):
+        rot = transforms[0].rot
+        if all(t.rot == rot for t in transforms):
+            first = transforms[0].dup()
+            first.disp = vector_type()
+            return (
+                cplx_type(first),
+                np.array([(t.disp.x, t.disp.y) for t in transforms]),
+                [],
+            )
+    transs: list[TC] = [cplx_type(t) for t in transforms]
+    first = transs[0]
+    base = cplx_type(first.mag, first.angle, first.is_mirror(), 0, 0)
+    for t in transs:
+        if (
+            t.angle != base.angle
+            or t.is_mirror() != base.is_mirror()
+            or t.mag != base.mag
+        ):
+            return base, None, transs
+    return base, np.array([(t.disp.x, t.disp.y) for t in transs]), []
+
+
+def _regular_lattice(
+    disps: npt.NDArray[np.int64],
+) -> tuple[kdb.Vector, kdb.Vector, kdb.Vector, int, int] | None:
+    """Check whether displacements form a full, regular, axis-aligned lattice.
+
+    Returns:
+        `(origin, a, b, na, nb)` of the lattice or `None`.
+    """
+    n = len(disps)
+    if n < 2:
+        return None
+    xs = np.unique(disps[:, 0])
+    ys = np.unique(disps[:, 1])
+    na, nb = len(xs), len(ys)
+    if na * nb != n or len(np.unique(disps, axis=0)) != n:
+        return None
+    dx = np.diff(xs)
+    dy = np.diff(ys)
+    if (na > 1 and np.any(dx != dx[0])) or (nb > 1 and np.any(dy != dy[0])):
+        return None
+    return (
+        kdb.Vector(int(xs[0]), int(ys[0])),
+        kdb.Vector(int(dx[0]) if na > 1 else 0, 0),
+        kdb.Vector(0, int(dy[0]) if nb > 1 else 0),
+        na,
+        nb,
+    )
+
+
 def _check_pin_ports_in_cell(
     cell: ProtoTKCell[Any], ports: Iterable[ProtoPort[Any]], *, pin_name: str
 ) -> None:
@@ -2714,6 +3125,26 @@ class DKCell(ProtoTKCell[float], UMGeometricObject, DCreatePort):
             ).instance,
         )
 
+    def create_insts(
+        self,
+        cell: AnyTKCell | int,
+        transforms: npt.ArrayLike | Sequence[kdb.DTrans | kdb.DVector | kdb.DCplxTrans],
+        *,
+        names: Sequence[str] | None = None,
+        detect_arrays: bool = True,
+        libcell_as_static: bool = False,
+        static_name_separator: str = "__",
+    ) -> DInstanceGroup:
+        """Convenience function for `DKCell.dcreate_insts`."""
+        return self.dcreate_insts(
+            cell,
+            transforms,
+            names=names,
+            detect_arrays=detect_arrays,
+            libcell_as_static=libcell_as_static,
+            static_name_separator=static_name_separator,
+        )
+
     def get_cross_section(
         self,
         cross_section: str
@@ -2918,6 +3349,26 @@ class KCell(ProtoTKCell[int], DBUGeometricObject, ICreatePort):
             ).instance,
         )
 
+    def create_insts(
+        self,
+        cell: AnyTKCell | int,
+        transforms: npt.ArrayLike | Sequence[kdb.Trans | kdb.Vector | kdb.ICplxTrans],
+        *,
+        names: Sequence[str] | None = None,
+        detect_arrays: bool = True,
+        libcell_as_static: bool = False,
+        static_name_separator: str = "__",
+    ) -> InstanceGroup:
+        """Convenience function for `KCell.icreate_insts`."""
+        return self.icreate_insts(
+            cell,
+            transforms,
+            names=names,
+            detect_arrays=detect_arrays,
+            libcell_as_static=libcell_as_static,
+            static_name_separator=static_name_separator,
+        )
+
     @classmethod
     def from_yaml(
         cls,
@@ -75,6 +75,7 @@ from .factory_metadata import (
     _FactoryMetadataProviderRecord,
 )
 from .kcell import (
+    AnyKCell,
     AnyTKCell,
     BaseKCell,
     DKCell,
@@ -321,6 +322,9 @@ class KCLayout(
     _metadata_registry: FactoryMetadataRegistry = PrivateAttr(
         default_factory=FactoryMetadataRegistry
     )
+    _materialized_cells: dict[tuple[int, kdb.DCplxTrans], tuple[BaseKCell, TKCell]] = (
+        PrivateAttr(default_factory=dict)
+    )
 
     decorators: Decorators
     default_cell_output_type: type[KCell | DKCell] = KCell
@@ -1931,6 +1935,7 @@ class KCLayout(
             c.locked = False
         self.layout.clear()
         self.tkcells = {}
+        self._materialized_cells.clear()
 
         if keep_layers:
             with contextlib.suppress(AttributeError):
@@ -1962,6 +1967,34 @@ class KCLayout(
         """Get a cell by name or index from the Layout object."""
         return self.layout.cell(name)
 
+    def _get_materialized_cell(
+        self, cell: AnyKCell, trans: kdb.DCplxTrans
+    ) -> KCell | None:
+        """Get the KCell created from a locked (virtual) cell and a residual trans.
+
+        Used by `VInstance.insert_into` to share materialized cells across all
+        parent cells.
+        """
+        if not cell.locked:
+            return None
+        entry = self._materialized_cells.get((id(cell.base), trans))
+        if entry is None:
+            return None
+        source, tkcell = entry
+        if source is not cell.base or tkcell.kdb_cell._destroyed():
+            del self._materialized_cells[id(cell.base), trans]
+            return None
+        return KCell(base=tkcell)
+
+    def _register_materialized_cell(
+        self, cell: AnyKCell, trans: kdb.DCplxTrans, kcell: ProtoTKCell[Any]
+    ) -> None:
+        if cell.locked:
+            self._materialized_cells[id(cell.base), trans.dup()] = (
+                cell.base,
+                kcell.base,
+            )
+
     @overload
     def cells(self, name: str) -> list[kdb.Cell]: ...
 
@@ -37,6 +37,7 @@ from .utilities import pprint_ports
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable
 
+    from .checks import ReportDB
     from .kcell import AnyTKCell, KCell
     from .layer import LayerEnum
     from .layout import KCLayout
@@ -48,7 +49,7 @@ def create_port_error(
     p2: ProtoPort[Any],
     c1: AnyTKCell,
     c2: AnyTKCell,
-    db: rdb.ReportDatabase,
+    db: ReportDB,
     db_cell: rdb.RdbCell,
     cat: rdb.RdbCategory,
     dbu: float,
@@ -62,7 +63,7 @@ def create_port_error(
         p2: Second port.
         c1: Cell of the first port.
         c2: Cell of the second port.
-        db: ReportDatabase to add the item to.
+        db: ReportDatabase (or report sink) to add the item to.
         db_cell: RdbCell to add the item to.
         cat: RdbCategory to add the item to.
         dbu: Database unit.
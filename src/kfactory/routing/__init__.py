@@ -1,6 +1,6 @@
 """Module for creating automatic optical and electrical routing."""
 
-from . import aa, electrical, generic, manhattan, optical
+from . import aa, electrical, generic, global_routing, manhattan, optical
 from .optical import LoopPosition, LoopSide, PathLengthConfig
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "aa",
     "electrical",
     "generic",
+    "global_routing",
     "manhattan",
     "optical",
 ]
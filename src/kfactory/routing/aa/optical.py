@@ -1,10 +1,13 @@
 """Optical routing allows the creation of photonic (or any route using bends)."""
 
+import contextlib
+import weakref
 from collections.abc import Sequence
 from typing import Any, Protocol
 
 import numpy as np
 from pydantic import BaseModel
+from scipy.interpolate import CubicSpline
 from scipy.optimize import minimize_scalar
 
 from ... import kdb
@@ -15,6 +18,9 @@ from ...port import DPort, Port, ProtoPort
 
 __all__ = ["OpticalAllAngleRoute", "route"]
 
+# bend angles sampled for the effective radius tables, every 4° from 2° to 178°
+_RADIUS_TABLE_ANGLES = np.linspace(2, 178, 45)
+
 
 class OpticalAllAngleRoute(BaseModel, arbitrary_types_allowed=True):
     """Optical route containing a connection between two ports."""
@@ -418,9 +424,8 @@ def _get_partial_route(
     _p1: kdb.DPoint,
 ) -> tuple[kdb.DPoint, kdb.DPoint, float]:
     bend_angle = (180 - angle + start_port.dcplx_trans.angle) % 180
-    bend = bend_factory(width=start_port.width, angle=abs(bend_angle))
-    radius = _get_effective_radius(
-        bend.ports[bend_ports[0]], bend.ports[bend_ports[1]], _p0, _p1
+    radius = _partial_route_radius(
+        bend_factory, start_port.width, bend_ports, abs(bend_angle), _p0, _p1
     )
     if radius is None:
         return np.inf
@@ -430,17 +435,18 @@ def _get_partial_route(
     xe = _e.cut_point(_e2)
     if xe is None:
         return rp, kdb.DPoint(), np.inf
-    bend2 = bend_factory(
-        width=start_port.width,
-        angle=abs((-angle + end_port.dcplx_trans.angle + 180) % 360 - 180),
-    )
-    er2 = _get_effective_radius(
-        bend2.ports[bend_ports[0]], bend2.ports[bend_ports[1]], _p0, _p1
+    er2 = _partial_route_radius(
+        bend_factory,
+        start_port.width,
+        bend_ports,
+        abs((-angle + end_port.dcplx_trans.angle + 180) % 360 - 180),
+        _p0,
+        _p1,
     )
     r2 = (xe - end_port.dcplx_trans.disp.to_p()).abs() - er2
     if r2 < 0 or (end_port.dcplx_trans.inverted() * xe).x < 0:
-        r2 = r2 / bend.kcl.dbu * 10
-        return rp, xe, abs(r2 / bend.kcl.dbu * 10)
+        dbu = start_port.kcl.dbu
+        return rp, xe, abs(r2 / dbu * 10 / dbu * 10)
     return rp, xe, abs(r2)
 
 
@@ -548,6 +554,111 @@ def _get_effective_radius(
     return (xp - port1.dcplx_trans.disp.to_p()).abs()
 
 
+_radius_tables: dict[
+    int,
+    tuple[
+        weakref.ref[VirtualBendFactory],
+        dict[tuple[float, tuple[str, str]], CubicSpline],
+    ],
+] = {}
+
+
+def _factory_radius_tables(
+    bend_factory: VirtualBendFactory,
+) -> dict[tuple[float, tuple[str, str]], CubicSpline]:
+    """Effective radius tables of a bend factory by width and bend ports.
+
+    The tables are dropped together with the factory, they don't keep it (or its
+    KCLayout) alive. Factories which can't be weakly referenced get a new, empty
+    dict on every call.
+    """
+    key = id(bend_factory)
+    entry = _radius_tables.get(key)
+    if entry is not None and entry[0]() is bend_factory:
+        return entry[1]
+
+    def _drop(ref: weakref.ref[VirtualBendFactory]) -> None:
+        current = _radius_tables.get(key)
+        if current is not None and current[0] is ref:
+            del _radius_tables[key]
+
+    tables: dict[tuple[float, tuple[str, str]], CubicSpline] = {}
+    with contextlib.suppress(TypeError):
+        _radius_tables[key] = (weakref.ref(bend_factory, _drop), tables)
+    return tables
+
+
+def _effective_radius_table(
+    bend_factory: VirtualBendFactory, width: float, bend_ports: tuple[str, str]
+) -> CubicSpline:
+    """Effective radius of the bends of a factory as a function of the bend angle.
+
+    The effective radius of a bend with angle `a` is written as `k(a) * tan(a / 2)`.
+    `k` is the radius for circular bends and smooth for euler bends, so it is sampled
+    from a few bends and interpolated (extrapolated below 2° and above 178°) with a
+    cubic spline. Tables are memoized per factory, width and ports for as long as
+    the factory exists.
+    """
+    tables = _factory_radius_tables(bend_factory)
+    table = tables.get((width, bend_ports))
+    if table is not None:
+        return table
+    _p0 = kdb.DPoint(0, 0)
+    _p1 = kdb.DPoint(1, 0)
+    k = []
+    for angle in _RADIUS_TABLE_ANGLES:
+        bend = bend_factory(width=width, angle=float(angle))
+        radius = _get_effective_radius(
+            bend.ports[bend_ports[0]], bend.ports[bend_ports[1]], _p0, _p1
+        )
+        k.append(radius / np.tan(np.deg2rad(angle) / 2))
+    table = tables[width, bend_ports] = CubicSpline(_RADIUS_TABLE_ANGLES, k)
+    return table
+
+
+def _effective_radius(
+    bend_factory: VirtualBendFactory,
+    width: float,
+    bend_ports: tuple[str, str],
+    angle: float,
+) -> float:
+    """Interpolated effective radius of a bend with `0 < angle < 180`.
+
+    Like [_get_effective_radius][kfactory.routing.aa.optical._get_effective_radius]
+    of the bend's ports, but without creating the bend.
+
+    Raises:
+        ValueError: If the angle is not strictly between 0 and 180.
+    """
+    if not 0 < angle < 180:
+        raise ValueError(
+            f"The effective radius can only be interpolated for bend angles "
+            f"between 0 and 180 (exclusive), got {angle}"
+        )
+    table = _effective_radius_table(bend_factory, width, bend_ports)
+    return float(table(angle)) * float(np.tan(np.deg2rad(angle) / 2))
+
+
+def _partial_route_radius(
+    bend_factory: VirtualBendFactory,
+    width: float,
+    bend_ports: tuple[str, str],
+    angle: float,
+    _p0: kdb.DPoint,
+    _p1: kdb.DPoint,
+) -> float:
+    """Effective radius of a bend with `0 <= angle <= 180`.
+
+    Interpolated where possible, straight and u-turn bends are created.
+    """
+    if 0 < angle < 180:
+        return _effective_radius(bend_factory, width, bend_ports, angle)
+    bend = bend_factory(width=width, angle=angle)
+    return _get_effective_radius(
+        bend.ports[bend_ports[0]], bend.ports[bend_ports[1]], _p0, _p1
+    )
+
+
 def _get_effective_radius_debug(
     port1: Port, port2: Port, _p1: kdb.DPoint, _p2: kdb.DPoint
 ) -> float:
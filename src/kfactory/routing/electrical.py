@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import TYPE_CHECKING, Any, Literal, Protocol, cast, overload
 
 import numpy as np
@@ -22,6 +23,7 @@ from .generic import ManhattanRoute
 from .generic import route_bundle as route_bundle_generic
 from .length_functions import get_length_from_backbone
 from .manhattan import (
+    _backbone_lengths,
     _is_manhattan,
     route_manhattan,
     route_smart,
@@ -38,7 +40,9 @@ if TYPE_CHECKING:
 
 __all__ = [
     "place_dual_rails",
+    "place_dual_rails_bundle",
     "place_single_wire",
+    "place_single_wire_bundle",
     "route_bundle",
     "route_bundle_dual_rails",
     "route_bundle_rf",
@@ -241,7 +245,7 @@ def route_bundle(
                     "bend90_radius": 0,
                     "waypoints": waypoints,
                 },
-                placer_function=place_single_wire,
+                bundle_placer_function=place_single_wire_bundle,
                 placer_kwargs={
                     "route_width": route_width,
                 },
@@ -364,7 +368,7 @@ def route_bundle(
                 "bend90_radius": 0,
                 "waypoints": waypoints,
             },
-            placer_function=place_single_wire,
+            bundle_placer_function=place_single_wire_bundle,
             placer_kwargs={
                 "route_width": route_width,
                 "layer_info": place_layer,
@@ -559,7 +563,7 @@ def route_bundle_dual_rails(
                 "bend90_radius": 0,
                 "waypoints": waypoints,
             },
-            placer_function=place_dual_rails,
+            bundle_placer_function=place_dual_rails_bundle,
             placer_kwargs={
                 "separation_rails": separation_rails,
                 "route_width": width_rails,
@@ -710,6 +714,7 @@ def place_single_wire(
     pt1 = pts[0]
     for pt2 in pts[1:]:
         length += (pt2 - pt1).length()
+        pt1 = pt2
 
     return ManhattanRoute(
         backbone=list(pts),
@@ -781,6 +786,179 @@ def place_dual_rails(
     )
 
 
+def _bundle_widths(
+    start_ports: Sequence[Port], route_width: int | Sequence[int] | None
+) -> list[int]:
+    if route_width is None:
+        return [p.width for p in start_ports]
+    if isinstance(route_width, int):
+        return [route_width] * len(start_ports)
+    if len(route_width) != len(start_ports):
+        raise ValueError(
+            f"route_width must be a single width or one width per route, got"
+            f" {len(route_width)} widths for {len(start_ports)} routes."
+        )
+    return list(route_width)
+
+
+def _insert_bundle_polygons(
+    c: KCell,
+    polygons: dict[kdb.LayerInfo, list[kdb.Polygon]],
+    merge: bool,
+) -> None:
+    for layer_info, layer_polygons in polygons.items():
+        region = kdb.Region(layer_polygons)
+        if merge:
+            region.merge()
+        c.shapes(c.layer(layer_info)).insert(region)
+
+
+def place_single_wire_bundle(
+    c: KCell,
+    start_ports: Sequence[Port],
+    end_ports: Sequence[Port],
+    backbones: Sequence[Sequence[kdb.Point]],
+    route_width: int | Sequence[int] | None = None,
+    layer_info: kdb.LayerInfo | None = None,
+    merge: bool = False,
+    **kwargs: Any,
+) -> list[ManhattanRoute]:
+    """Bundle placer function for single wires.
+
+    Same as calling [place_single_wire][kfactory.routing.electrical.place_single_wire]
+    for each route, but the wires are inserted with one `Shapes.insert` per layer and
+    the lengths are calculated for all routes at once.
+
+    Args:
+        c: KCell to place the routes in.
+        start_ports: Start port of each route.
+        end_ports: End port of each route.
+        backbones: Backbone of each route.
+        route_width: Overwrite automatic detection of wire width. Either one width
+            for all wires or one per wire.
+        layer_info: Place on a specific layer. Otherwise, use the `layer_info` of
+            the start ports.
+        merge: Merge the wires on each layer before inserting them. The polygons of
+            the returned routes are the unmerged wires.
+        kwargs: Compatibility for type checkers. Throws an error if not empty.
+    """
+    if kwargs:
+        raise ValueError(
+            f"Additional kwargs aren't supported in place_single_wire_bundle {kwargs=}"
+        )
+    widths = _bundle_widths(start_ports, route_width)
+    lengths = np.rint(_backbone_lengths(backbones)).astype(np.int64).tolist()
+
+    polygons: dict[kdb.LayerInfo, list[kdb.Polygon]] = defaultdict(list)
+    routes: list[ManhattanRoute] = []
+    for p1, p2, pts, width, length in zip(
+        start_ports, end_ports, backbones, widths, lengths, strict=True
+    ):
+        layer = layer_info or p1.layer_info
+        polygon = kdb.Path(pts, width).polygon()
+        polygons[layer].append(polygon)
+        routes.append(
+            ManhattanRoute(
+                backbone=list(pts),
+                start_port=p1,
+                end_port=p2,
+                taper_length=0,
+                bend90_radius=0,
+                polygons={layer: [polygon]},
+                instances=[],
+                length_straights=length,
+                length_function=get_length_from_backbone,
+            )
+        )
+    _insert_bundle_polygons(c, polygons, merge)
+    return routes
+
+
+def place_dual_rails_bundle(
+    c: KCell,
+    start_ports: Sequence[Port],
+    end_ports: Sequence[Port],
+    backbones: Sequence[Sequence[kdb.Point]],
+    route_width: int | Sequence[int] | None = None,
+    layer_info: kdb.LayerInfo | None = None,
+    separation_rails: int | None = None,
+    merge: bool = False,
+    **kwargs: Any,
+) -> list[ManhattanRoute]:
+    """Bundle placer function for dual rails.
+
+    Same as calling [place_dual_rails][kfactory.routing.electrical.place_dual_rails]
+    for each route. The gaps between the rails of all routes are cut out with one
+    boolean operation (routes are kept apart by a property) and the rails are
+    inserted with one `Shapes.insert` per layer.
+
+    Args:
+        c: KCell to place the routes in.
+        start_ports: Start port of each route.
+        end_ports: End port of each route.
+        backbones: Backbone of each route.
+        route_width: Overwrite automatic detection of wire width. Total width of
+            all rails. Either one width for all routes or one per route.
+        layer_info: Place on a specific layer. Otherwise, use the `layer_info` of
+            the start ports.
+        separation_rails: Separation between the two rails.
+        merge: Merge the rails on each layer before inserting them. The polygons of
+            the returned routes are the unmerged rails.
+        kwargs: Compatibility for type checkers. Throws an error if not empty.
+    """
+    if kwargs:
+        raise ValueError(
+            f"Additional kwargs aren't supported in place_dual_rails_bundle {kwargs=}"
+        )
+    if separation_rails is None:
+        raise ValueError("Must specify a separation between the two rails.")
+    widths = _bundle_widths(start_ports, route_width)
+    for width in widths:
+        if separation_rails >= width:
+            raise ValueError(f"{separation_rails=} must be smaller than the {width}")
+
+    rails = kdb.Region(
+        [
+            kdb.PolygonWithProperties(kdb.Path(pts, width).polygon(), {0: i})
+            for i, (pts, width) in enumerate(zip(backbones, widths, strict=True))
+        ]
+    ).not_(
+        kdb.Region(
+            [
+                kdb.PolygonWithProperties(
+                    kdb.Path(pts, separation_rails).polygon(), {0: i}
+                )
+                for i, pts in enumerate(backbones)
+            ]
+        ),
+        kdb.Region.SamePropertiesConstraint,
+    )
+    route_rails: list[list[kdb.Polygon]] = [[] for _ in backbones]
+    for rail in rails.each():
+        route_rails[rail.property(0)].append(rail.downcast())
+
+    polygons: dict[kdb.LayerInfo, list[kdb.Polygon]] = defaultdict(list)
+    routes: list[ManhattanRoute] = []
+    for p1, p2, pts, shapes in zip(
+        start_ports, end_ports, backbones, route_rails, strict=True
+    ):
+        layer = layer_info or p1.layer_info
+        polygons[layer].extend(shapes)
+        routes.append(
+            ManhattanRoute(
+                backbone=list(pts),
+                start_port=p1,
+                end_port=p2,
+                taper_length=0,
+                bend90_radius=0,
+                polygons={layer: shapes},
+                instances=[],
+            )
+        )
+    _insert_bundle_polygons(c, polygons, merge)
+    return routes
+
+
 class BendFactory(Protocol):
     def __call__(
         self, *, radius: int, cross_section: CrossSection
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from itertools import pairwise
 from typing import TYPE_CHECKING, Any, Literal, Protocol, TypeGuard, cast
 
 import klayout.db as kdb
@@ -12,6 +13,7 @@ from pydantic import BaseModel, Field
 from ..conf import logger
 from ..instance import Instance  # noqa: TC001
 from ..port import BasePort, Port, ProtoPort
+from ..spatial import BoxIndex, collect_instance_region, interacting_edge_pairs
 from ..typings import dbu  # noqa: TC001
 from .length_functions import LengthFunction, get_length_from_area
 from .manhattan import (
@@ -20,15 +22,18 @@ from .manhattan import (
     route_smart,
 )
 from .steps import Step, Straight
+from .utils import route_stage
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from ..kcell import KCell
     from ..schematic import Constraint
+    from .manhattan import RouteTemplateCache
     from .utils import RouteDebug
 
 __all__ = [
+    "BundlePlacerFunction",
     "ManhattanRoute",
     "PlacerFunction",
     "check_collisions",
@@ -41,6 +46,12 @@ class PlacerError(ValueError):
     pass
 
 
+def _placer_name(placer: object) -> str:
+    """Name of a placer function, `functools.partial` objects are unwrapped."""
+    func = getattr(placer, "func", placer)
+    return str(getattr(func, "__name__", type(func).__name__))
+
+
 class PlacerFunction(Protocol):
     """A placer function. Used to place Instances given a path."""
 
@@ -57,6 +68,22 @@ class PlacerFunction(Protocol):
         ...
 
 
+class BundlePlacerFunction(Protocol):
+    """A placer function placing all routes of a bundle in one call."""
+
+    def __call__(
+        self,
+        c: KCell,
+        start_ports: Sequence[Port],
+        end_ports: Sequence[Port],
+        backbones: Sequence[Sequence[kdb.Point]],
+        route_width: int | Sequence[int] | None = None,
+        **kwargs: Any,
+    ) -> list[ManhattanRoute]:
+        """Implementation of the function."""
+        ...
+
+
 class ManhattanRoute(BaseModel, arbitrary_types_allowed=True):
     """Optical route containing a connection between two ports.
 
@@ -125,18 +152,24 @@ def check_collisions(
     if on_collision is None:
         return
     collision_edges: dict[str, kdb.Edges] = {}
-    inter_route_collisions = kdb.Edges()
-    all_router_edges = kdb.Edges()
+    all_router_edges: list[kdb.Edge] = []
+    router_ids: list[int] = []
     for i, (ps, pe, router) in enumerate(
         zip(start_ports, end_ports, routers, strict=False)
     ):
         edges_, router_edges = router.collisions(log_errors=None)
         if not edges_.is_empty():
             collision_edges[f"{ps.name} - {pe.name} (index: {i})"] = edges_
-        inter_route_collision = all_router_edges.interacting(router_edges)
-        if not inter_route_collision.is_empty():
-            inter_route_collisions.join_with(inter_route_collision)
-        all_router_edges.join_with(router_edges)
+        for edge in router_edges.each():
+            all_router_edges.append(edge)
+            router_ids.append(i)
+    inter_route_collisions = kdb.Edges(
+        [
+            all_router_edges[j]
+            for j, k in interacting_edge_pairs(all_router_edges)
+            if router_ids[j] != router_ids[k]
+        ]
+    )
 
     if collision_edges or not inter_route_collisions.is_empty():
         if collision_check_layers is None:
@@ -168,50 +201,18 @@ def check_collisions(
             return layer_cats[layer_info]
 
         any_layer_collision = False
+        cell_regions: dict[tuple[int, int], kdb.Region] = {}
 
-        for layer_info in collision_check_layers:
-            shapes_regions = shapes[layer_info]
-            layer_ = c.kcl.layout.layer(layer_info)
-            error_region_instances = kdb.Region()
-            error_region_shapes = kdb.Region()
-            inst_regions: dict[int, kdb.Region] = {}
-            inst_region = kdb.Region()
-            shape_region = kdb.Region()
-            for r in shapes_regions:
-                if not (shape_region & r).is_empty():
-                    error_region_shapes.insert(shape_region & r)
-                shape_region.insert(r)
-            for i, inst in enumerate(insts):
-                inst_region_ = kdb.Region(inst.bbox(layer_))
-                if not (inst_region & inst_region_).is_empty():
-                    # if inst_shapes is None:
-                    inst_shapes = kdb.Region()
-                    shape_it = c.begin_shapes_rec_overlapping(layer_, inst.bbox(layer_))
-                    shape_it.select_cells([inst.cell.cell_index()])
-                    shape_it.min_depth = 1
-                    for _it in shape_it.each():
-                        if _it.path()[0].inst() == inst.instance:
-                            inst_shapes.insert(
-                                _it.shape().polygon.transformed(_it.trans())
-                            )
-                    for j, _reg in inst_regions.items():
-                        if _reg & inst_region_:
-                            reg = kdb.Region()
-                            shape_it = c.begin_shapes_rec_touching(
-                                layer_, (_reg & inst_region_).bbox()
-                            )
-                            shape_it.select_cells([insts[j].cell.cell_index()])
-                            shape_it.min_depth = 1
-                            for _it in shape_it.each():
-                                if _it.path()[0].inst() == insts[j].instance:
-                                    reg.insert(
-                                        _it.shape().polygon.transformed(_it.trans())
-                                    )
-
-                            error_region_instances.insert(reg & inst_shapes)
-                inst_region += inst_region_
-                inst_regions[i] = inst_region_
+        layer_errors = [
+            _layer_collisions(
+                c, layer_info, insts, shapes.get(layer_info, []), cell_regions
+            )
+            for layer_info in collision_check_layers
+        ]
 
+        for layer_info, (error_region_shapes, error_region_instances) in zip(
+            collision_check_layers, layer_errors, strict=True
+        ):
             if not error_region_shapes.is_empty():
                 any_layer_collision = True
                 if on_collision == "error":
@@ -250,6 +251,42 @@ def check_collisions(
                     )
 
 
+def _layer_collisions(
+    c: KCell,
+    layer_info: kdb.LayerInfo,
+    insts: Sequence[Instance],
+    shapes_regions: Sequence[kdb.Region],
+    cell_regions: dict[tuple[int, int], kdb.Region],
+) -> tuple[kdb.Region, kdb.Region]:
+    """Overlaps of route shapes and of route instances on one layer.
+
+    Candidate pairs are found with a [BoxIndex][kfactory.spatial.BoxIndex] of
+    the bounding boxes, the actual geometry is only intersected for those pairs.
+
+    Returns:
+        The overlaps of the route shapes and the overlaps of the instances.
+    """
+    layer_ = c.kcl.layout.layer(layer_info)
+    error_region_shapes = kdb.Region()
+    shape_bboxes = [r.bbox() for r in shapes_regions]
+    for i, j in BoxIndex(shape_bboxes).overlapping_pairs().tolist():
+        error_region_shapes.insert(shapes_regions[i] & shapes_regions[j])
+
+    error_region_instances = kdb.Region()
+    inst_shapes: dict[int, kdb.Region] = {}
+
+    def inst_region(i: int) -> kdb.Region:
+        if i not in inst_shapes:
+            inst_shapes[i] = collect_instance_region(c, layer_, insts[i], cell_regions)
+        return inst_shapes[i]
+
+    inst_bboxes = [inst.bbox(layer_) for inst in insts]
+    for i, j in BoxIndex(inst_bboxes).overlapping_pairs().tolist():
+        if (inst_bboxes[i] & inst_bboxes[j]).area():
+            error_region_instances.insert(inst_region(i) & inst_region(j))
+    return error_region_shapes, error_region_instances
+
+
 PORTS_FOR_RADIUS = 2
 
 
@@ -298,8 +335,9 @@ def route_bundle(
     collision_check_layers: Sequence[kdb.LayerInfo] | None = None,
     routing_function: ManhattanBundleRoutingFunction = route_smart,
     routing_kwargs: dict[str, Any] | None = None,
-    placer_function: PlacerFunction,
+    placer_function: PlacerFunction | None = None,
     placer_kwargs: dict[str, Any] | None = None,
+    bundle_placer_function: BundlePlacerFunction | None = None,
     constraints: Sequence[Constraint] | None = None,
     starts: dbu | list[dbu] | list[Step] | list[list[Step]] | None = None,
     ends: dbu | list[dbu] | list[Step] | list[list[Step]] | None = None,
@@ -307,6 +345,7 @@ def route_bundle(
     end_angles: int | list[int] | None = None,
     route_debug: RouteDebug | None = None,
     route_name: str | None = None,
+    route_cache: RouteTemplateCache | None = None,
 ) -> list[ManhattanRoute]:
     r"""Route a bundle from starting ports to end_ports.
 
@@ -383,7 +422,20 @@ def route_bundle(
                 c: KCell, p1: Port, p2: Port, pts: list[Point], **placer_kwargs
             )
             ```
-        placer_kwargs: Additional kwargs passed to the placer_function.
+        placer_kwargs: Additional kwargs passed to the placer_function (or the
+            bundle_placer_function).
+        bundle_placer_function: Place all routes with one call instead of calling
+            `placer_function` for each route. Must return the routes in the order
+            of the backbones.
+            ```
+            bundle_placer_function(
+                c: KCell,
+                start_ports: list[Port],
+                end_ports: list[Port],
+                backbones: list[list[Point]],
+                **placer_kwargs,
+            )
+            ```
         constraints: Routing constraints to enforce after routing but before placement.
             Each constraint's `enforce` method is called with the routers and routing
             kwargs (e.g. separation, bend90_radius).
@@ -393,6 +445,15 @@ def route_bundle(
             (single value) or each one (list of values which is as long as start_ports).
         end_angles: Overwrite the port orientation of all start_ports together
             (single value) or each one (list of values which is as long as end_ports).
+        route_debug: Collects debug markers as well as the timings and counters of
+            the routing stages (routing, constraints, placement, collision_check),
+            of the placer (`placement.<placer name>`) and of the placer's cell
+            factories. S-bend fallbacks are counted as `sbend_routes` and the
+            time placing them is the `sbend_factory` stage.
+        route_cache: Route through this cache to reuse the backbones of previously
+            routed bundles with the same relative port configuration and routing
+            kwargs. Placement, constraints and collision checks still run. Not used
+            if `route_debug` is given.
 
     Returns:
         List of ManattanRoutes containing the instances of the route.
@@ -412,6 +473,17 @@ def route_bundle(
         routing_kwargs = {"bbox_routing": "minimal"}
     if route_debug is not None:
         routing_kwargs["route_debug"] = route_debug
+        # time the cell factories of the placer and count their cache hits
+        placer_kwargs = {
+            name: route_debug.counted_factory(name, value, c.kcl)
+            if name.endswith("_factory") and value is not None
+            else value
+            for name, value in placer_kwargs.items()
+        }
+    if placer_function is None and bundle_placer_function is None:
+        raise ValueError(
+            "route_bundle needs either a placer_function or a bundle_placer_function."
+        )
     if not start_ports:
         return []
     if not (len(start_ports) == len(end_ports)):
@@ -483,17 +555,41 @@ def route_bundle(
     else:
         widths = [p.any_cross_section.width for p in start_ports]
 
-    routers = routing_function(
-        start_ports=start_ports,
-        end_ports=end_ports,
-        widths=widths,
-        starts=starts,
-        ends=ends,
-        **routing_kwargs,
-    )
+    with route_stage(route_debug, "routing"):
+        if route_cache is not None:
+            routers = route_cache(
+                routing_function,
+                start_ports=start_ports,
+                end_ports=end_ports,
+                widths=widths,
+                starts=starts,
+                ends=ends,
+                **routing_kwargs,
+            )
+        else:
+            routers = routing_function(
+                start_ports=start_ports,
+                end_ports=end_ports,
+                widths=widths,
+                starts=starts,
+                ends=ends,
+                **routing_kwargs,
+            )
 
     if not routers:
         return []
+    if route_debug is not None:
+        route_debug.count("routes", len(routers))
+        route_debug.count(
+            "sbend_routes",
+            sum(
+                any(
+                    p1.x != p2.x and p1.y != p2.y
+                    for p1, p2 in pairwise(router.start.pts)
+                )
+                for router in routers
+            ),
+        )
 
     start_mapping = {sp.get_trans(): sp for sp in start_ports}
     end_mapping = {ep.get_trans(): ep for ep in end_ports}
@@ -507,28 +603,56 @@ def route_bundle(
         start_ports.append(sp)
         end_ports.append(ep)
 
-    if constraints:
-        for constraint in constraints:
-            constraint.enforce(
-                c=c,
-                routers=routers,
-                route_name=route_name,
-            )
+    with route_stage(route_debug, "constraints"):
+        if constraints:
+            for constraint in constraints:
+                constraint.enforce(
+                    c=c,
+                    routers=routers,
+                    route_name=route_name,
+                )
     placer_errors: list[Exception] = []
     error_routes: list[tuple[BasePort, BasePort, list[kdb.Point], int]] = []
-    for router, ps, pe in zip(routers, start_ports, end_ports, strict=False):
-        try:
-            route = placer_function(
-                c,
-                Port(base=ps),
-                Port(base=pe),
-                router.start.pts,
-                **placer_kwargs,
-            )
-            routes.append(route)
-        except Exception as e:
-            placer_errors.append(e)
-            error_routes.append((ps, pe, router.start.pts, router.width))
+    placer_stage = (
+        f"placement.{_placer_name(bundle_placer_function or placer_function)}"
+    )
+    with route_stage(route_debug, "placement"):
+        if bundle_placer_function is not None:
+            try:
+                with route_stage(route_debug, placer_stage):
+                    routes = bundle_placer_function(
+                        c,
+                        [Port(base=ps) for ps in start_ports],
+                        [Port(base=pe) for pe in end_ports],
+                        [router.start.pts for router in routers],
+                        **placer_kwargs,
+                    )
+            except Exception as e:
+                # the whole bundle failed, report the error for every route
+                for router, ps, pe in zip(
+                    routers, start_ports, end_ports, strict=False
+                ):
+                    placer_errors.append(e)
+                    error_routes.append((ps, pe, router.start.pts, router.width))
+        else:
+            placer_function = cast("PlacerFunction", placer_function)
+            for router, ps, pe in zip(routers, start_ports, end_ports, strict=False):
+                try:
+                    with route_stage(route_debug, placer_stage):
+                        route = placer_function(
+                            c,
+                            Port(base=ps),
+                            Port(base=pe),
+                            router.start.pts,
+                            **placer_kwargs,
+                        )
+                    routes.append(route)
+                except Exception as e:
+                    placer_errors.append(e)
+                    error_routes.append((ps, pe, router.start.pts, router.width))
+    if route_debug is not None:
+        route_debug.count("bend90", sum(route.n_bend90 for route in routes))
+        route_debug.count("taper", sum(route.n_taper for route in routes))
     if placer_errors and on_placer_error == "show_error":
         db = rdb.ReportDatabase("Route Placing Errors")
         c.name = c.kcl._future_cell_name or c.name
@@ -547,7 +671,7 @@ def route_bundle(
             it.add_value(c.kcl.to_um(path.polygon()))
         c.show(lyrdb=db)
     if placer_errors and on_placer_error is not None:
-        for error in placer_errors:
+        for error in dict.fromkeys(placer_errors):
             logger.error(error)
         if c.name.startswith("Unnamed_"):
             c.name = c.kcl._future_cell_name or c.name
@@ -556,15 +680,16 @@ def route_bundle(
             f"{[p.name for p in start_ports]} to {[p.name for p in end_ports]}"
         )
 
-    check_collisions(
-        c=c,
-        start_ports=start_ports,
-        end_ports=end_ports,
-        on_collision=on_collision,
-        collision_check_layers=collision_check_layers,
-        routers=routers,
-        routes=routes,
-    )
+    with route_stage(route_debug, "collision_check"):
+        check_collisions(
+            c=c,
+            start_ports=start_ports,
+            end_ports=end_ports,
+            on_collision=on_collision,
+            collision_check_layers=collision_check_layers,
+            routers=routers,
+            routes=routes,
+        )
     if constraints:
         for constraint in constraints:
             constraint._routes[route_name] = routes
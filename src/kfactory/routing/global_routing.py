@@ -0,0 +1,642 @@
+"""Global routing of many bundles through a coarse grid of routing cells.
+
+The floorplan is divided into square routing cells (gcells). Each gcell has a
+capacity for horizontal and for vertical traffic, which is the part of its height
+(or width) not blocked by obstacles. Bundles are routed through the gcells with
+A*, the cost of a gcell grows with its history of congestion and with the amount
+it would be overfilled (negotiated congestion). A gcell used horizontally by one
+bundle and vertically by another one (e.g. where one of them turns) is a crossing
+and costs like an overfilled gcell. Bundles passing overfilled or crossed gcells
+are ripped up and rerouted until there are none left or the iteration limit is
+reached.
+
+Afterwards every straight run of a bundle gets a free track inside its channel
+and the corners of these tracks become the waypoints for the detailed router.
+Bundles never share a track. Crossings which can't be avoided (e.g. because the
+ports of two bundles alternate along the floorplan) are logged as a warning. The
+detailed router checks every bundle on its own and doesn't report them.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol
+
+import klayout.db as kdb
+import numpy as np
+
+from ..conf import logger
+from .utils import route_stage
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy.typing as npt
+
+    from ..kcell import KCell
+    from ..port import Port
+    from .generic import ManhattanRoute
+    from .utils import RouteDebug
+
+__all__ = [
+    "GlobalRoute",
+    "GlobalRouter",
+    "WaypointBundleRoutingFunction",
+    "route_bundles_global",
+]
+
+_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+"""Step in gcells of each direction, indexed like the angle of a `kdb.Trans`."""
+
+
+class WaypointBundleRoutingFunction(Protocol):
+    """A bundle router accepting waypoints, e.g. `optical.route_bundle`."""
+
+    def __call__(
+        self,
+        c: KCell,
+        start_ports: Sequence[Port],
+        end_ports: Sequence[Port],
+        *,
+        separation: int,
+        waypoints: list[kdb.Point] | None,
+        **kwargs: Any,
+    ) -> list[ManhattanRoute]:
+        """Route a bundle along the waypoints."""
+        ...
+
+
+@dataclass
+class GlobalRoute:
+    """Coarse route of one bundle through the gcells.
+
+    Attributes:
+        demand: Width in dbu the bundle needs in a channel. The widths of all
+            routes and the separation between and around them.
+        start: The gcell in front of the start ports.
+        end: The gcell in front of the end ports.
+        start_center: Center of the start ports.
+        end_center: Center of the end ports.
+        start_direction: Direction (angle of a `kdb.Trans`) in which the bundle
+            leaves the start ports. None if the start ports face different
+            directions.
+        end_direction: Direction in which the bundle arrives at the end ports.
+        gcells: gcells (column, row) from `start` to `end`.
+        directions: Direction in which the bundle enters each gcell. The first
+            one is the direction in which it leaves `start`.
+        waypoints: Backbone of the bundle for the detailed router. None if the
+            start and end ports are in the same or in neighboring gcells.
+    """
+
+    demand: int
+    start: tuple[int, int]
+    end: tuple[int, int]
+    start_center: kdb.Point
+    end_center: kdb.Point
+    start_direction: int | None
+    end_direction: int | None
+    gcells: list[tuple[int, int]] = field(default_factory=list)
+    directions: list[int] = field(default_factory=list)
+    waypoints: list[kdb.Point] | None = None
+
+    def orientations(self) -> list[set[int]]:
+        """Orientations (0: horizontal, 1: vertical) used in each gcell."""
+        n = len(self.gcells)
+        used = [
+            {d % 2, self.directions[i + 1] % 2} if i + 1 < n else {d % 2}
+            for i, d in enumerate(self.directions)
+        ]
+        if n and self.end_direction is not None:
+            used[-1].add(self.end_direction % 2)
+        return used
+
+
+class GlobalRouter:
+    """Congestion aware router for many bundles on a grid of gcells.
+
+    Attributes:
+        floorplan: Area available for routing.
+        gcell_size: Edge length of a gcell in dbu.
+        separation: Separation between routes and to obstacles in dbu.
+        bend_cost: Cost of a bend of a bundle in dbu of path length.
+        history_cost: Added to the cost factor of a gcell for every iteration in
+            which it was overfilled.
+        present_cost: Cost factor per overfilled demand of a gcell in the first
+            iteration.
+        present_cost_growth: `present_cost` is multiplied by this after every
+            iteration.
+        capacity: Free width per orientation and gcell, shape `(2, nx, ny)`.
+        usage: Demand of the routed bundles per orientation and gcell.
+        users: Number of routed bundles per orientation and gcell.
+        turns: Number of routed bundles turning in each gcell.
+        history: Congestion history per orientation and gcell.
+        iterations: Number of iterations of the last `route` call.
+    """
+
+    def __init__(
+        self,
+        floorplan: kdb.Box,
+        gcell_size: int,
+        obstacles: Sequence[kdb.Box] | kdb.Region | None = None,
+        separation: int = 0,
+        bend_cost: int | None = None,
+        history_cost: float = 1,
+        present_cost: float = 0.5,
+        present_cost_growth: float = 2,
+    ) -> None:
+        """Build the gcell grid and compute the capacities.
+
+        Args:
+            floorplan: Area available for routing.
+            gcell_size: Edge length of a gcell in dbu.
+            obstacles: Boxes or a region (each polygon is used by its bbox) the
+                bundles must avoid.
+            separation: Separation between routes and to obstacles in dbu.
+            bend_cost: Cost of a bend of a bundle in dbu of path length. Defaults
+                to `2 * gcell_size`.
+            history_cost: Cost factor added to a gcell in each iteration it is
+                overfilled.
+            present_cost: Cost factor per overfilled demand in the first
+                iteration.
+            present_cost_growth: Growth of `present_cost` per iteration.
+        """
+        if gcell_size <= 0:
+            raise ValueError(f"gcell_size must be positive, got {gcell_size=}")
+        self.floorplan = floorplan.dup()
+        self.gcell_size = gcell_size
+        self.separation = separation
+        self.bend_cost = 2 * gcell_size if bend_cost is None else bend_cost
+        self.history_cost = history_cost
+        self.present_cost = present_cost
+        self.present_cost_growth = present_cost_growth
+        self.nx = max(-(-floorplan.width() // gcell_size), 1)
+        self.ny = max(-(-floorplan.height() // gcell_size), 1)
+        self.usage = np.zeros((2, self.nx, self.ny), dtype=np.int64)
+        self.users = np.zeros((2, self.nx, self.ny), dtype=np.int64)
+        self.turns = np.zeros((self.nx, self.ny), dtype=np.int64)
+        self.history = np.zeros((2, self.nx, self.ny))
+        self.iterations = 0
+
+        if isinstance(obstacles, kdb.Region):
+            boxes = [p.bbox() for p in obstacles.each()]
+        else:
+            boxes = list(obstacles or [])
+        # blocked intervals per orientation and gcell, horizontal traffic is
+        # blocked by the y-extent of an obstacle, vertical traffic by the x-extent.
+        # The demand of a bundle has half a separation on each side, so half a
+        # separation around the obstacles is enough.
+        self._blocked: list[list[list[tuple[int, int]]]] = [
+            [[] for _ in range(self.nx * self.ny)] for _ in range(2)
+        ]
+        for obstacle in boxes:
+            box = obstacle.enlarged((separation + 1) // 2)
+            for ix, iy in self._gcells_in(box):
+                b = box & self.gcell_box(ix, iy)
+                if b.empty():
+                    continue
+                self._blocked[0][ix * self.ny + iy].append((b.bottom, b.top))
+                self._blocked[1][ix * self.ny + iy].append((b.left, b.right))
+        self.capacity = np.zeros((2, self.nx, self.ny), dtype=np.int64)
+        for ix, iy in itertools.product(range(self.nx), range(self.ny)):
+            i = ix * self.ny + iy
+            box = self.gcell_box(ix, iy)
+            for o, (lo, hi) in enumerate(
+                ((box.bottom, box.top), (box.left, box.right))
+            ):
+                self._blocked[o][i] = _merge_intervals(self._blocked[o][i])
+                self.capacity[o, ix, iy] = (hi - lo) - sum(
+                    b - a for a, b in self._blocked[o][i]
+                )
+
+    def gcell_box(self, ix: int, iy: int) -> kdb.Box:
+        """Area of a gcell."""
+        left = self.floorplan.left + ix * self.gcell_size
+        bottom = self.floorplan.bottom + iy * self.gcell_size
+        return kdb.Box(
+            left,
+            bottom,
+            min(left + self.gcell_size, self.floorplan.right),
+            min(bottom + self.gcell_size, self.floorplan.top),
+        )
+
+    def gcell(self, point: kdb.Point) -> tuple[int, int]:
+        """The gcell containing the point (clamped to the grid)."""
+        return (
+            min(
+                max((point.x - self.floorplan.left) // self.gcell_size, 0),
+                self.nx - 1,
+            ),
+            min(
+                max((point.y - self.floorplan.bottom) // self.gcell_size, 0),
+                self.ny - 1,
+            ),
+        )
+
+    def _gcells_in(self, box: kdb.Box) -> itertools.product[tuple[int, int]]:
+        x0, y0 = self.gcell(box.p1)
+        x1, y1 = self.gcell(box.p2)
+        return itertools.product(range(x0, x1 + 1), range(y0, y1 + 1))
+
+    def overflow(self) -> npt.NDArray[np.int64]:
+        """Demand exceeding the capacity per orientation and gcell."""
+        return np.maximum(self.usage - self.capacity, 0)
+
+    def crossings(self) -> npt.NDArray[np.bool_]:
+        """gcells used horizontally by one bundle and vertically by another one.
+
+        A single bundle turning in a gcell doesn't cross itself.
+        """
+        h, v = self.users
+        return (h > 0) & (v > 0) & ~((h == 1) & (v == 1) & (self.turns == 1))
+
+    def _congested(self) -> npt.NDArray[np.bool_]:
+        """Overfilled or crossed gcells per orientation."""
+        return (self.overflow() > 0) | self.crossings()
+
+    def route(
+        self,
+        bundles: Sequence[tuple[Sequence[Port], Sequence[Port]]],
+        max_iterations: int = 10,
+    ) -> list[GlobalRoute]:
+        """Route the bundles through the gcells and generate their waypoints.
+
+        The first iteration routes the bundles in the given order. Every further
+        iteration rips up and reroutes all bundles passing an overfilled gcell or
+        a gcell where they cross another bundle.
+
+        Args:
+            bundles: Start and end ports of each bundle.
+            max_iterations: Maximum number of rip-up and reroute iterations.
+                If gcells are still overfilled or crossed afterwards, a warning is
+                logged.
+
+        Returns:
+            One global route per bundle.
+
+        Raises:
+            ValueError: If a bundle cannot reach its end gcell.
+        """
+        routes = [self._global_route(sp, ep) for sp, ep in bundles]
+        present_cost = self.present_cost
+        for iteration in range(max_iterations):
+            self.iterations = iteration + 1
+            for route in routes:
+                if iteration == 0 or self._overfilled(route):
+                    self._rip_up(route)
+                    self._search(route, present_cost)
+                    self._commit(route)
+            congested = self._congested()
+            if not congested.any():
+                break
+            self.history += self.history_cost * congested
+            present_cost *= self.present_cost_growth
+        else:
+            logger.warning(
+                "Global routing did not resolve the congestion after {} iterations,"
+                " {} gcells are overfilled or crossed by two bundles.",
+                max_iterations,
+                int(np.count_nonzero(self._congested().any(axis=0))),
+            )
+        for route in routes:
+            self._assign_tracks(route)
+        return routes
+
+    def _global_route(
+        self, start_ports: Sequence[Port], end_ports: Sequence[Port]
+    ) -> GlobalRoute:
+        if not start_ports or len(start_ports) != len(end_ports):
+            raise ValueError(
+                "A bundle needs the same number of start and end ports, got "
+                f"{len(start_ports)} and {len(end_ports)}."
+            )
+        start, start_center, start_direction = self._endpoint(start_ports)
+        end, end_center, end_angle = self._endpoint(end_ports)
+        (sx, sy), (ex, ey) = self.gcell(start_center), self.gcell(end_center)
+        if abs(sx - ex) <= 1 and abs(sy - ey) <= 1:
+            # short bundles are left to the detailed router
+            start = end = (sx, sy)
+        return GlobalRoute(
+            demand=sum(p.width for p in start_ports)
+            + len(start_ports) * self.separation,
+            start=start,
+            end=end,
+            start_center=start_center,
+            end_center=end_center,
+            start_direction=start_direction,
+            end_direction=None if end_angle is None else (end_angle + 2) % 4,
+        )
+
+    def _endpoint(
+        self, ports: Sequence[Port]
+    ) -> tuple[tuple[int, int], kdb.Point, int | None]:
+        """gcell in front of the ports, their center and common direction."""
+        angles = {p.trans.angle for p in ports}
+        center = kdb.Point(
+            sum(p.trans.disp.x for p in ports) // len(ports),
+            sum(p.trans.disp.y for p in ports) // len(ports),
+        )
+        if len(angles) != 1:
+            return self.gcell(center), center, None
+        angle = angles.pop()
+        dx, dy = _DIRECTIONS[angle]
+        return (
+            self.gcell(center + kdb.Vector(dx, dy) * self.gcell_size),
+            center,
+            angle,
+        )
+
+    def _overfilled(self, route: GlobalRoute) -> bool:
+        crossings = self.crossings()
+        return any(
+            self.usage[o, ix, iy] > self.capacity[o, ix, iy] or crossings[ix, iy]
+            for (ix, iy), orientations in zip(
+                route.gcells, route.orientations(), strict=True
+            )
+            for o in orientations
+        )
+
+    def _commit(self, route: GlobalRoute, sign: int = 1) -> None:
+        for (ix, iy), orientations in zip(
+            route.gcells, route.orientations(), strict=True
+        ):
+            for o in orientations:
+                self.usage[o, ix, iy] += sign * route.demand
+                self.users[o, ix, iy] += sign
+            if len(orientations) == 2:
+                self.turns[ix, iy] += sign
+
+    def _rip_up(self, route: GlobalRoute) -> None:
+        self._commit(route, -1)
+        route.gcells = []
+        route.directions = []
+
+    def _search(self, route: GlobalRoute, present_cost: float) -> None:
+        """A* through the gcells, the cost is path length times congestion.
+
+        Using an orientation of a gcell which another bundle uses in the other
+        orientation costs like overfilling it by the bundle's demand.
+        """
+        g = self.gcell_size
+        demand = max(route.demand, 1)
+        costs = (
+            g
+            * (1 + self.history)
+            * (
+                1
+                + present_cost
+                * (
+                    np.maximum(self.usage + demand - self.capacity, 0) / demand
+                    + (self.users[::-1] > 0)
+                )
+            )
+        )
+        # fully blocked gcells can't be passed, except at the start and end
+        costs[self.capacity == 0] = np.inf
+        for ix, iy in (route.start, route.end):
+            costs[:, ix, iy] = np.minimum(costs[:, ix, iy], g)
+        ex, ey = route.end
+
+        def h(x: int, y: int) -> int:
+            return g * (abs(x - ex) + abs(y - ey))
+
+        sx, sy = route.start
+        tie = itertools.count()
+        directions = (
+            range(4) if route.start_direction is None else (route.start_direction,)
+        )
+        queue: list[tuple[float, int, float, int, int, int]] = [
+            (h(sx, sy), next(tie), 0, sx, sy, d) for d in directions
+        ]
+        best: dict[tuple[int, int, int], float] = {(sx, sy, d): 0 for d in directions}
+        parents: dict[tuple[int, int, int], tuple[int, int, int] | None] = {
+            (sx, sy, d): None for d in directions
+        }
+        done: set[tuple[int, int, int]] = set()
+        while queue:
+            _, _, cost, x, y, d = heapq.heappop(queue)
+            if (x, y, d) in done:
+                continue
+            # the bundle has to arrive in the direction of the end ports
+            if (x, y) == route.end and (
+                route.end_direction in (None, d) or route.end == route.start
+            ):
+                state = (x, y, d)
+                break
+            done.add((x, y, d))
+            for nd, (dx, dy) in enumerate(_DIRECTIONS):
+                if nd == (d + 2) % 4:
+                    continue
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < self.nx and 0 <= ny < self.ny):
+                    continue
+                o = nd % 2
+                ncost = cost + costs[o, nx, ny]
+                if nd != d:
+                    ncost += self.bend_cost + costs[o, x, y]
+                if not np.isfinite(ncost):
+                    continue
+                key = (nx, ny, nd)
+                if ncost < best.get(key, np.inf):
+                    best[key] = ncost
+                    parents[key] = (x, y, d)
+                    heapq.heappush(
+                        queue, (ncost + h(nx, ny), next(tie), ncost, nx, ny, nd)
+                    )
+        else:
+            raise ValueError(
+                f"No global route found from gcell {route.start} to gcell "
+                f"{route.end}, the gcells in between are blocked."
+            )
+        path: list[tuple[int, int, int]] = []
+        current: tuple[int, int, int] | None = state
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+        path.reverse()
+        route.gcells = [(x, y) for x, y, _ in path]
+        route.directions = [d for _, _, d in path]
+
+    def _assign_tracks(self, route: GlobalRoute) -> None:
+        """Pick a free track for each straight run and build the waypoints."""
+        if len(route.gcells) < 2:
+            route.waypoints = None
+            return
+        # runs of moves in the same direction, as (direction, first, last) gcell
+        runs: list[tuple[int, int, int]] = []
+        for i in range(1, len(route.gcells)):
+            d = route.directions[i]
+            if runs and runs[-1][0] == d:
+                runs[-1] = (d, runs[-1][1], i)
+            else:
+                runs.append((d, i - 1, i))
+        # the first and last run stay in line with the ports if possible, this
+        # spares the detailed router a jog of the whole bundle
+        preferred: list[int | None] = [None] * len(runs)
+        if runs[-1][0] == route.end_direction:
+            c = route.end_center
+            preferred[-1] = c.y if route.end_direction % 2 == 0 else c.x
+        if runs[0][0] == route.start_direction:
+            c = route.start_center
+            preferred[0] = c.y if route.start_direction % 2 == 0 else c.x
+        tracks = [
+            self._track(d % 2, route.gcells[first : last + 1], route.demand, p)
+            for (d, first, last), p in zip(runs, preferred, strict=True)
+        ]
+
+        def center(i: int, o: int) -> int:
+            box = self.gcell_box(*route.gcells[i])
+            return box.center().x if o == 0 else box.center().y
+
+        def point(along: int, track: int, o: int) -> kdb.Point:
+            return kdb.Point(along, track) if o == 0 else kdb.Point(track, along)
+
+        d0 = runs[0][0] % 2
+        waypoints = [point(center(0, d0), tracks[0], d0)]
+        for (d, _, _), track, next_track in zip(runs, tracks, tracks[1:], strict=False):
+            waypoints.append(point(next_track, track, d % 2))
+        dn = runs[-1][0] % 2
+        waypoints.append(point(center(len(route.gcells) - 1, dn), tracks[-1], dn))
+        route.waypoints = waypoints
+
+    def _track(
+        self,
+        orientation: int,
+        gcells: Sequence[tuple[int, int]],
+        demand: int,
+        preferred: int | None = None,
+    ) -> int:
+        """Free coordinate across a channel closest to `preferred` and block it.
+
+        `preferred` defaults to the center of the channel.
+        """
+        box = self.gcell_box(*gcells[0])
+        lo, hi = (box.bottom, box.top) if orientation == 0 else (box.left, box.right)
+        blocked = _merge_intervals(
+            [
+                interval
+                for ix, iy in gcells
+                for interval in self._blocked[orientation][ix * self.ny + iy]
+            ]
+        )
+        mid = (lo + hi) // 2 if preferred is None else preferred
+        half = demand // 2
+        best: int | None = None
+        free_lo = lo
+        for a, b in [*blocked, (hi, hi)]:
+            free_hi = min(a, hi)
+            if free_hi - free_lo >= demand:
+                track = min(max(mid, free_lo + half), free_hi - (demand - half))
+                if best is None or abs(track - mid) < abs(best - mid):
+                    best = track
+            free_lo = max(free_lo, b)
+        if best is None:
+            logger.warning(
+                "No free track of width {} in the channel through gcells {}, the"
+                " bundle will collide with obstacles or other bundles.",
+                demand,
+                list(gcells),
+            )
+            best = mid
+        for ix, iy in gcells:
+            intervals = self._blocked[orientation][ix * self.ny + iy]
+            intervals.append((best - half, best + demand - half))
+            self._blocked[orientation][ix * self.ny + iy] = _merge_intervals(intervals)
+        return best
+
+
+def _merge_intervals(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for a, b in sorted(intervals):
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+def route_bundles_global(
+    c: KCell,
+    bundles: Sequence[tuple[Sequence[Port], Sequence[Port]]],
+    route_bundle_function: WaypointBundleRoutingFunction,
+    *,
+    separation: int,
+    gcell_size: int,
+    floorplan: kdb.Box | None = None,
+    obstacles: Sequence[kdb.Box] | kdb.Region | None = None,
+    max_iterations: int = 10,
+    route_debug: RouteDebug | None = None,
+    **route_kwargs: Any,
+) -> list[list[ManhattanRoute]]:
+    """Route many bundles with a global router and then each in detail.
+
+    A [GlobalRouter][kfactory.routing.global_routing.GlobalRouter] assigns the
+    bundles to channels and generates their waypoints. Then every bundle is routed
+    with `route_bundle_function` along its waypoints.
+
+    Usage:
+        ```python
+        routes = kf.routing.global_routing.route_bundles_global(
+            c,
+            [(start_ports_a, end_ports_a), (start_ports_b, end_ports_b)],
+            partial(
+                kf.routing.optical.route_bundle,
+                straight_factory=straight_factory,
+                bend90_cell=bend90,
+            ),
+            separation=2_000,
+            gcell_size=100_000,
+        )
+        ```
+
+    Args:
+        c: Cell to place the routes in.
+        bundles: Start and end ports of each bundle.
+        route_bundle_function: Detailed bundle router, called with `c`, the ports,
+            `separation`, `waypoints` and `route_kwargs`.
+        separation: Separation between routes and to obstacles in dbu.
+        gcell_size: Edge length of the gcells in dbu. Should be a multiple of the
+            width of the largest bundle plus room for its bends.
+        floorplan: Area available for routing. Defaults to the bbox of `c` and of
+            all ports, enlarged by `gcell_size`.
+        obstacles: Boxes or a region the bundles must avoid. Defaults to the bboxes
+            of the instances of `c`.
+        max_iterations: Maximum number of rip-up and reroute iterations.
+        route_debug: Passed to the detailed router. The global routing is timed
+            as stage `global_routing`.
+        route_kwargs: Additional kwargs for `route_bundle_function`.
+
+    Returns:
+        The routes of each bundle.
+    """
+    if floorplan is None:
+        floorplan = c.bbox()
+        for start_ports, end_ports in bundles:
+            for p in itertools.chain(start_ports, end_ports):
+                floorplan += p.trans.disp.to_p()
+        floorplan = floorplan.enlarged(gcell_size)
+    if obstacles is None:
+        obstacles = [inst.bbox() for inst in c.insts]
+    with route_stage(route_debug, "global_routing"):
+        router = GlobalRouter(
+            floorplan,
+            gcell_size,
+            obstacles=obstacles,
+            separation=separation,
+        )
+        global_routes = router.route(bundles, max_iterations=max_iterations)
+    if route_debug is not None:
+        route_debug.count("global_routing_iterations", router.iterations)
+        route_kwargs["route_debug"] = route_debug
+    return [
+        route_bundle_function(
+            c,
+            start_ports,
+            end_ports,
+            separation=separation,
+            waypoints=route.waypoints,
+            **route_kwargs,
+        )
+        for (start_ports, end_ports), route in zip(bundles, global_routes, strict=True)
+    ]
@@ -47,9 +47,10 @@ def get_length_from_area(layer: kdb.LayerInfo | None = None) -> LengthFunction:
     """
 
     def get_length_(route: ManhattanRoute) -> float:
-        if not route.instances:
-            return 0
         layer_ = layer or route.start_port.layer_info
+        polygons = route.polygons.get(layer_)
+        if not route.instances and not polygons:
+            return 0
 
         length: float = 0
         width = route.start_port.width
@@ -58,6 +59,9 @@ def get_length_from_area(layer: kdb.LayerInfo | None = None) -> LengthFunction:
             length += _get_area_from_layer(
                 inst.cell.kcl.name, inst.cell.cell_index(), layer_, width
             )
+        if polygons:
+            # straights placed as polygons (`straight_mode="polygon"`)
+            length += kdb.Region(polygons).merge().area() / width
 
         return length
 
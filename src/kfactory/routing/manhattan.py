@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import multiprocessing
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import InitVar, dataclass, field
-from functools import cached_property
+from functools import cached_property, partial
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -28,10 +32,14 @@ from ..conf import (
     logger,
 )
 from ..port import BasePort, Port
+from ..spatial import BoxIndex, interacting_edge_pairs
 from .steps import Step, Steps, Straight
+from .utils import route_stage
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Callable, Iterable, Sequence
+
+    import numpy.typing as npt
 
     from ..layout import KCLayout
     from .utils import RouteDebug
@@ -39,7 +47,9 @@ if TYPE_CHECKING:
 __all__ = [
     "ManhattanRoutePathFunction",
     "ManhattanRoutePathFunction180",
+    "RouteTemplateCache",
     "clean_points",
+    "route_around_obstacles",
     "route_manhattan",
     "route_manhattan_180",
     "route_smart",
@@ -510,7 +520,8 @@ class ManhattanRouter:
     ) -> tuple[kdb.Edges, kdb.Edges]:
         """Finds collisions.
 
-        A collision is if the router crosses itself in it's route (`self.start.pts`).
+        A collision is if the router crosses itself in it's route (`self.start.pts`),
+        i.e. a segment touches any other segment than its neighbors.
 
         Args:
             log_errors: sends the an error or a warning to the kfactory logger if not
@@ -519,25 +530,19 @@ class ManhattanRouter:
         Returns:
             tuple containing the collisions and all edges of the router
         """
-        p_start = self.start.pts[1]
-        edges = kdb.Edges()
-        last_edge = kdb.Edge(self.start.pts[0], p_start)
-        has_collisions = False
-        collisions = kdb.Edges()
-
-        for p in self.start.pts[2:]:
-            new_edge = kdb.Edge(p_start, p)
-            edges_ = kdb.Edges([new_edge])
-            potential_collisions = edges.interacting(other=edges_)
-
-            if not potential_collisions.is_empty():
-                has_collisions = True
-                collisions.join_with(potential_collisions).join_with(edges_)
-            edges.insert(last_edge)
-            last_edge = new_edge
-            p_start = p
-
-        edges.insert(last_edge)
+        segments = [kdb.Edge(p1, p2) for p1, p2 in itertools.pairwise(self.start.pts)]
+        edges = kdb.Edges(segments)
+        # consecutive segments always touch at their common point
+        colliding = sorted(
+            {
+                k
+                for i, j in interacting_edge_pairs(segments)
+                if j - i > 1
+                for k in (i, j)
+            }
+        )
+        has_collisions = bool(colliding)
+        collisions = kdb.Edges([segments[i] for i in colliding])
 
         if has_collisions and log_errors is not None:
             match log_errors:
@@ -644,6 +649,48 @@ def route_manhattan(
     return pts
 
 
+def _backbone_lengths(
+    backbones: Sequence[Sequence[kdb.Point]], *, truncate_segments: bool = False
+) -> npt.NDArray[np.float64]:
+    """Lengths of point lists, computed for all of them at once.
+
+    Args:
+        backbones: The point lists.
+        truncate_segments: Truncate the length of each segment to an integer
+            before summing, like `int((p2 - p1).length())`.
+    """
+    counts = np.fromiter(
+        (len(pts) for pts in backbones), dtype=np.int64, count=len(backbones)
+    )
+    n = int(counts.sum())
+    xy = np.fromiter(
+        (c for pts in backbones for p in pts for c in (p.x, p.y)),
+        dtype=np.int64,
+        count=2 * n,
+    ).reshape(n, 2)
+    d = np.diff(xy, axis=0)
+    segments = np.hypot(d[:, 0], d[:, 1])
+    if truncate_segments:
+        segments = np.trunc(segments)
+    # segment i connects point i and i + 1, drop the ones between two backbones
+    ends = np.cumsum(counts)
+    segments[ends[(counts > 0) & (ends < n)] - 1] = 0
+    owners = np.repeat(np.arange(len(backbones)), counts)[1:]
+    return np.bincount(owners, weights=segments, minlength=len(backbones))
+
+
+def _path_lengths(routers: Sequence[ManhattanRouter]) -> npt.NDArray[np.int64]:
+    """Path lengths of finished routers, computed for all routers at once.
+
+    Same as `[router.path_length for router in routers]`.
+    """
+    if not all(router.finished for router in routers):
+        raise ValueError("Router is not finished yet, path_length will be inaccurate.")
+    return _backbone_lengths(
+        [router.start.pts for router in routers], truncate_segments=True
+    ).astype(np.int64)
+
+
 class PathMatchDict(TypedDict):
     angle: Literal[0, 1, 2, 3]
     pts: tuple[kdb.Point, kdb.Point]
@@ -681,7 +728,8 @@ def path_length_match_manhattan_route(
     position = -1
     path_loops = 1
 
-    path_length = path_length or max(r.path_length for r in routers)
+    lengths = _path_lengths(routers).tolist()
+    path_length = path_length or max(lengths, default=0)
     match_dict: dict[
         Literal[0, 1, 2, 3], list[tuple[ManhattanRouter, PathMatchDict]]
     ] = {
@@ -691,7 +739,7 @@ def path_length_match_manhattan_route(
         3: [],
     }
 
-    for router in routers:
+    for router, length in zip(routers, lengths, strict=True):
         modify_pts: tuple[kdb.Point, kdb.Point] = tuple(router.start.pts[-2:])  # ty:ignore[invalid-assignment]
         v = modify_pts[1] - modify_pts[0]
         match (v.x, v.y):
@@ -707,9 +755,7 @@ def path_length_match_manhattan_route(
         match_dict[angle].append(
             (
                 router,
-                PathMatchDict(
-                    angle=angle, pts=modify_pts, dl=path_length - router.path_length
-                ),
+                PathMatchDict(angle=angle, pts=modify_pts, dl=path_length - length),
             )
         )
 
@@ -810,7 +856,7 @@ def _place_dl_path_length(
 
         p = kdb.Point(bend90_radius, 0)
 
-        dl = path_length - router.start.path_length
+        dl = settings["dl"]
 
         pts_: list[kdb.Point] = []
 
@@ -846,9 +892,14 @@ def route_smart(
     bbox_routing: Literal["minimal", "full"] = "minimal",
     allow_sbend: bool = False,
     route_debug: RouteDebug | None = None,
+    max_workers: int = 1,
     **kwargs: Any,
 ) -> list[ManhattanRouter]:
-    """Route around start or end bboxes (obstacles on the way not implemented yet).
+    """Route around start or end bboxes.
+
+    Obstacles between the start and end are not considered, use
+    [route_around_obstacles][kfactory.routing.manhattan.route_around_obstacles]
+    for that.
 
     Args:
         start_ports: Ports where the routing should start.
@@ -870,6 +921,11 @@ def route_smart(
             around, but start or end bends might encroach on the bounding boxes when
             leaving them.
         allow_sbend: Allows the router to route the final pieces with sbends.
+        route_debug: Collects debug information about the routes if set.
+        max_workers: Number of worker processes to route the independent bundles
+            with. The workers are forked and only send back the points of the
+            routes, so the result is the same as for serial routing. Without
+            `fork` (e.g. on Windows) the bundles are always routed serially.
         kwargs: Additional kwargs. Compatibility for type checking. If any kwargs are
             passed an error is raised.
     Raises:
@@ -952,23 +1008,29 @@ def route_smart(
                 f"'sort_ports=True' with variable widths is not supported: {widths=}"
             )
         if waypoints is not None:
-            return _route_waypoints(
-                waypoints=waypoints,
-                widths=[w0 for _ in range(len(start_ts))],
-                separation=separation,
-                bend90_radius=bend90_radius,
-                start_ts=start_ts,
-                end_ts=end_ts,
-                starts=starts,
-                ends=ends,
-                bboxes=bboxes,
-                sort_ports=True,
-                bbox_routing=bbox_routing,
-                allow_sbends=allow_sbend,
-                route_debug=route_debug,
-                start_port_names=start_port_names,
-                end_port_names=end_port_names,
-            )
+            with route_stage(route_debug, "waypoints"):
+                return _route_waypoints(
+                    waypoints=waypoints,
+                    widths=[w0 for _ in range(len(start_ts))],
+                    separation=separation,
+                    bend90_radius=bend90_radius,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                    starts=starts,
+                    ends=ends,
+                    bboxes=bboxes,
+                    sort_ports=True,
+                    bbox_routing=bbox_routing,
+                    allow_sbends=allow_sbend,
+                    route_debug=route_debug,
+                    start_port_names=start_port_names,
+                    end_port_names=end_port_names,
+                )
+        sort_transformations = (
+            _sort_transformations
+            if route_debug is None
+            else route_debug.timed("port_sorting", _sort_transformations)
+        )
         default_start_bundle: list[kdb.Trans] = []
         start_bundles: dict[kdb.Box, list[kdb.Trans]] = defaultdict(list)
         mh_routers: list[ManhattanRouter] = []
@@ -1069,7 +1131,7 @@ def route_smart(
                     case 0:
                         if v.x < 0:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     end_bundle,
                                     target_side=0,
                                     box=end_box,
@@ -1078,7 +1140,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=0,
                                     box=start_box,
@@ -1088,7 +1150,7 @@ def route_smart(
                             )
                         else:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=end_bundle,
                                     target_side=0,
                                     box=end_box,
@@ -1097,7 +1159,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=2,
                                     box=start_box,
@@ -1108,7 +1170,7 @@ def route_smart(
                     case 1:
                         if v.y < 0:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     end_bundle,
                                     target_side=1,
                                     box=end_box,
@@ -1117,7 +1179,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=1,
                                     box=start_box,
@@ -1127,7 +1189,7 @@ def route_smart(
                             )
                         else:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=end_bundle,
                                     target_side=1,
                                     box=end_box,
@@ -1136,7 +1198,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=3,
                                     box=start_box,
@@ -1147,7 +1209,7 @@ def route_smart(
                     case 2:
                         if v.x > 0:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     end_bundle,
                                     target_side=2,
                                     box=end_box,
@@ -1156,7 +1218,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=2,
                                     box=start_box,
@@ -1166,7 +1228,7 @@ def route_smart(
                             )
                         else:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=end_bundle,
                                     target_side=2,
                                     box=end_box,
@@ -1175,7 +1237,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=0,
                                     box=start_box,
@@ -1186,7 +1248,7 @@ def route_smart(
                     case 3:
                         if v.y > 0:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     end_bundle,
                                     target_side=3,
                                     box=end_box,
@@ -1195,7 +1257,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=3,
                                     box=start_box,
@@ -1205,7 +1267,7 @@ def route_smart(
                             )
                         else:
                             end_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=end_bundle,
                                     target_side=3,
                                     box=end_box,
@@ -1214,7 +1276,7 @@ def route_smart(
                                 )
                             )
                             start_ts.extend(
-                                _sort_transformations(
+                                sort_transformations(
                                     transformations=start_bundle,
                                     target_side=1,
                                     box=start_box,
@@ -1246,23 +1308,24 @@ def route_smart(
 
     else:
         if waypoints is not None:
-            return _route_waypoints(
-                waypoints=waypoints,
-                widths=widths,
-                separation=separation,
-                start_ts=start_ts,
-                end_ts=end_ts,
-                starts=starts,
-                ends=ends,
-                bboxes=bboxes,
-                bbox_routing=bbox_routing,
-                bend90_radius=bend90_radius,
-                sort_ports=False,
-                allow_sbends=allow_sbend,
-                route_debug=route_debug,
-                start_port_names=start_port_names,
-                end_port_names=end_port_names,
-            )
+            with route_stage(route_debug, "waypoints"):
+                return _route_waypoints(
+                    waypoints=waypoints,
+                    widths=widths,
+                    separation=separation,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                    starts=starts,
+                    ends=ends,
+                    bboxes=bboxes,
+                    bbox_routing=bbox_routing,
+                    bend90_radius=bend90_radius,
+                    sort_ports=False,
+                    allow_sbends=allow_sbend,
+                    route_debug=route_debug,
+                    start_port_names=start_port_names,
+                    end_port_names=end_port_names,
+                )
 
         all_routers = []
         for ts, te, w, ss, es in zip(
@@ -1381,282 +1444,28 @@ def route_smart(
         for i, _ in reversed(merge_bboxes):
             del bundled_bboxes[i]
             del bundled_routers[i]
-        for router_bundle in bundled_routers:
-            sorted_routers = _sort_routers(router_bundle)
-
-            # simple (maybe error-prone) way to determine the ideal routing angle
-            # this would need to be expanded in order to allow for automatic single
-            # waypoint router (without transformation or similar)
-            angle = router_bundle[0].end.t.angle
-
-            r = router_bundle[0]
-            end_angle = r.end.t.angle
-            re = router_bundle[-1]
-            start_bbox = kdb.Box(r.start.pts[0], re.start.t * _p)
-            end_bbox = kdb.Box(r.end.pts[0], re.end.t * _p)
-            start_bbox += re.start.t * kdb.Point(-1, 0)
-            end_bbox += re.end.t * kdb.Point(-1, 0)
-
-            _route_p(
-                sorted_routers=sorted_routers,
-                start_bbox=start_bbox,
-                separation=separation,
-            )
-
-            for r in router_bundle:
-                start_bbox += kdb.Box(r.start.pts[0], r.start.t.disp.to_p()) + kdb.Box(
-                    0, -r.width // 2, 0, r.width // 2
-                ).transformed(r.start.t)
-                end_bbox += kdb.Box(r.end.pts[0], r.end.t.disp.to_p()) + kdb.Box(
-                    0, -r.width // 2, 0, r.width // 2
-                ).transformed(r.end.t)
-                if r.end.t.angle != end_angle:
-                    raise ValueError(
-                        "All ports at the target (end) must have the same angle. "
-                        f"{r.start.t=}/{r.end.t=}"
-                    )
-            if bbox_routing == "minimal":
-                route_to_bbox(
-                    (router.start for router in sorted_routers),
-                    start_bbox,
-                    bbox_routing="full",
-                    separation=separation,
-                )
-                route_to_bbox(
-                    (router.end for router in sorted_routers),
-                    end_bbox,
-                    bbox_routing="full",
-                    separation=separation,
-                )
-
-            if box_region:
-                start_bbox = (
-                    box_region.interacting(kdb.Region(start_bbox)).bbox() + start_bbox
-                )
-                end_bbox = (
-                    box_region.interacting(kdb.Region(end_bbox)).bbox() + end_bbox
-                )
-            route_to_bbox(
-                (router.start for router in sorted_routers),
-                start_bbox,
-                bbox_routing=bbox_routing,
-                separation=separation,
-            )
-            route_to_bbox(
-                (router.end for router in sorted_routers),
-                end_bbox,
-                bbox_routing=bbox_routing,
-                separation=separation,
-            )
-            bb_start2end = kdb.Trans(-angle, False, 0, 0) * start_bbox
-            bb_end2start = kdb.Trans(-angle, False, 0, 0) * end_bbox
-
-            if bb_start2end.left - bb_end2start.right > bend90_radius + sum(widths):
-                target_angle = (angle - 2) % 4
-            else:
-                target_angle = angle
-                avg = kdb.Vector()
-                end_routers = [r.end for r in sorted_routers]
-                for rs in end_routers:
-                    avg += rs.tv
-                route_to_bbox(
-                    end_routers,
-                    end_bbox,
-                    separation=separation,
-                    bbox_routing=bbox_routing,
-                )
-                _route_to_side(
-                    end_routers,
-                    clockwise=avg.y > 0,
-                    bbox=end_bbox,
-                    separation=separation,
-                    bbox_routing=bbox_routing,
-                )
-                _route_to_side(
-                    end_routers,
-                    clockwise=avg.y > 0,
-                    bbox=end_bbox,
-                    separation=separation,
-                    bbox_routing=bbox_routing,
-                )
-            router_groups: list[tuple[int, list[ManhattanRouter]]] = []
-            group_angle: int | None = None
-            current_group: list[ManhattanRouter] = []
-            for router in sorted_routers:
-                ang = router.start.t.angle
-                if ang != group_angle:
-                    if group_angle is not None:
-                        router_groups.append(
-                            ((group_angle - target_angle) % 4, current_group)
-                        )
-                    group_angle = ang
-                    current_group = []
-                current_group.append(router)
-            if group_angle is not None:
-                router_groups.append(((group_angle - target_angle) % 4, current_group))
-
-            total_bbox = start_bbox
-
-            if len(router_groups) > 1:
-                i = 0
-                rg_angles = [rg[0] for rg in router_groups]
-                traverses0 = False
-                a = rg_angles[0]
-
-                for _a in rg_angles[1:]:
-                    if _a == 0:
-                        continue
-                    if _a <= a:
-                        traverses0 = True
-                    a = _a
-                angle = rg_angles[0]
-
-                # Find out whether we are passing the angle where no side routing is
-                # necessary and if we do, we need to start routing clockwise until we
-                # pass 0. Otherwise test on which side of the bounding box we land
-
-                # Routing clock-wise (the order of the routers, the actual routings are
-                # anti-clockwise and vice-versa)
-
-                if traverses0 or rg_angles[-1] in {0, 3}:
-                    routers_clockwise: list[ManhattanRouter] = router_groups[0][
-                        1
-                    ].copy()
-                    for i in range(1, len(router_groups)):
-                        new_angle, new_routers = router_groups[i]
-                        a = angle
-                        if routers_clockwise:
-                            if traverses0:
-                                while a not in {new_angle, 0}:
-                                    a = (a + 1) % 4
-                                    total_bbox += _route_to_side(
-                                        routers=[
-                                            router.start for router in routers_clockwise
-                                        ],
-                                        clockwise=True,
-                                        bbox=start_bbox,
-                                        separation=separation,
-                                        allow_sbends=a == 0 and allow_sbend,
-                                    )
-                            else:
-                                while a != new_angle:
-                                    a = (a + 1) % 4
-                                    total_bbox += _route_to_side(
-                                        routers=[
-                                            router.start for router in routers_clockwise
-                                        ],
-                                        clockwise=True,
-                                        bbox=start_bbox,
-                                        separation=separation,
-                                        allow_sbends=a == 0 and allow_sbend,
-                                    )
-                        if new_angle <= angle:
-                            if new_angle != 0:
-                                i -= 1  # noqa: PLW2901
-                            break
-                        routers_clockwise.extend(new_routers)
-                        angle = new_angle
-                    else:
-                        a = angle
-                        while a != 0:
-                            a = (a + 1) % 4
-                            total_bbox += _route_to_side(
-                                routers=[router.start for router in routers_clockwise],
-                                clockwise=True,
-                                bbox=start_bbox,
-                                separation=separation,
-                            )
-
-                # Route the rest of the groups anti-clockwise
-                if i < len(router_groups) - 1:
-                    angle = rg_angles[-1]
-                    routers_anticlockwise: list[ManhattanRouter] = router_groups[-1][
-                        1
-                    ].copy()
-                    n = i
-                    for i in reversed(range(n, len(router_groups) - 1)):
-                        new_angle, new_routers = router_groups[i]
-                        a = angle
-                        if routers_anticlockwise:
-                            while a not in {new_angle, 0}:
-                                a = (a - 1) % 4
-                                total_bbox += _route_to_side(
-                                    routers=[
-                                        router.start for router in routers_anticlockwise
-                                    ],
-                                    clockwise=False,
-                                    bbox=start_bbox,
-                                    separation=separation,
-                                    allow_sbends=a == 0 and allow_sbend,
-                                )
-                        if new_angle == 0:
-                            routers_anticlockwise.extend(new_routers)
-                            break
-                        if new_angle >= angle:
-                            break
-                        routers_anticlockwise.extend(new_routers)
-                        angle = new_angle
-                    else:
-                        a = angle
-                        while a != 0:
-                            a = (a - 1) % 4
-                            total_bbox += _route_to_side(
-                                routers=[
-                                    router.start for router in routers_anticlockwise
-                                ],
-                                clockwise=False,
-                                bbox=start_bbox,
-                                separation=separation,
-                                allow_sbends=a == 0 and allow_sbend,
-                            )
-                route_to_bbox(
-                    [router.start for router in sorted_routers],
-                    total_bbox,
-                    bbox_routing=bbox_routing,
-                    separation=separation,
-                )
-                route_loosely(
-                    sorted_routers,
-                    separation=separation,
-                    start_bbox=total_bbox,
-                    end_bbox=end_bbox,
-                    bbox_routing=bbox_routing,
-                    allow_sbend=allow_sbend,
+        route_bundle = partial(
+            _route_bundle,
+            bend90_radius=bend90_radius,
+            separation=separation,
+            bbox_routing=bbox_routing,
+            allow_sbend=allow_sbend,
+            total_width=sum(widths),
+        )
+        if route_debug is not None:
+            route_debug.count("bundles", len(bundled_routers))
+        with route_stage(route_debug, "bundle_routing"):
+            if (
+                max_workers > 1
+                and len(bundled_routers) > 1
+                and "fork" in multiprocessing.get_all_start_methods()
+            ):
+                _route_bundles_forked(
+                    bundled_routers, box_region, route_bundle, max_workers
                 )
             else:
-                routers = router_groups[0][1]
-                r = routers[0]
-                match (target_angle - r.start.t.angle) % 4:
-                    case 2:
-                        total_bbox = _route_to_side(
-                            [r.start for r in routers],
-                            clockwise=routers[0].start.tv.y > 0,
-                            bbox=total_bbox,
-                            separation=separation,
-                        )
-                        total_bbox = _route_to_side(
-                            [r.start for r in routers],
-                            clockwise=routers[0].start.tv.y > 0,
-                            bbox=total_bbox,
-                            separation=separation,
-                            allow_sbends=allow_sbend,
-                        )
-                    case _:
-                        ...
-                route_to_bbox(
-                    [router.start for router in router_bundle],
-                    total_bbox,
-                    bbox_routing=bbox_routing,
-                    separation=separation,
-                )
-                route_loosely(
-                    routers,
-                    separation=separation,
-                    start_bbox=total_bbox,
-                    end_bbox=end_bbox,
-                    bbox_routing=bbox_routing,
-                    allow_sbend=allow_sbend,
-                )
+                for router_bundle in bundled_routers:
+                    route_bundle(router_bundle, box_region)
 
         # Check whether any two bundles' routed paths overlap.  If so,
         # extend the affected routers' router_bbox via _router_extra_bbox
@@ -1746,6 +1555,700 @@ def route_smart(
     return all_routers
 
 
+class RouteTemplateCache:
+    """Reuse the routes of repeated bundle configurations.
+
+    Arrays of identical cells often route the same bundle many times, only
+    translated, rotated or mirrored. The cache wraps a
+    [ManhattanBundleRoutingFunction][kfactory.routing.manhattan.ManhattanBundleRoutingFunction]
+    call and stores the resulting backbones in the frame of the first start port.
+    If the same configuration is routed again, i.e. the ports have the same
+    transformations relative to the first start port and the widths, steps and
+    routing kwargs are the same (boxes, points and transformations in the kwargs
+    are compared relative to the first start port as well), the stored backbones
+    are transformed to the new first start port instead of routing again.
+
+    Routing with a `route_debug` bypasses the cache (neither hit nor miss), so
+    that the recorded stages describe an actual routing.
+
+    Args:
+        maxsize: Maximum number of stored templates. The oldest template is dropped
+            when a new one exceeds the limit. `None` means unlimited.
+
+    Attributes:
+        hits: Number of routings replayed from a template.
+        misses: Number of routings which had to be routed.
+    """
+
+    def __init__(self, maxsize: int | None = None) -> None:
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates: dict[
+            tuple[Any, ...],
+            list[tuple[kdb.Trans, kdb.Trans, list[kdb.Point], int, int, int, bool]],
+        ] = {}
+
+    def __len__(self) -> int:
+        """Number of stored templates."""
+        return len(self._templates)
+
+    def clear(self) -> None:
+        """Remove all templates and reset the counters."""
+        self._templates.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(
+        self,
+        routing_function: ManhattanBundleRoutingFunction,
+        *,
+        start_ports: Sequence[BasePort | kdb.Trans],
+        end_ports: Sequence[BasePort | kdb.Trans],
+        starts: Sequence[Sequence[Step]],
+        ends: Sequence[Sequence[Step]],
+        widths: Sequence[int] | None = None,
+        route_debug: RouteDebug | None = None,
+        **kwargs: Any,
+    ) -> list[ManhattanRouter]:
+        """Route with `routing_function` or replay the template of a previous call."""
+        if route_debug is not None or not start_ports:
+            return routing_function(
+                start_ports=start_ports,
+                end_ports=end_ports,
+                starts=starts,
+                ends=ends,
+                widths=widths,
+                route_debug=route_debug,
+                **kwargs,
+            )
+        start_ts = [
+            p.get_trans() if isinstance(p, BasePort) else p for p in start_ports
+        ]
+        end_ts = [p.get_trans() if isinstance(p, BasePort) else p for p in end_ports]
+        to_template = start_ts[0].inverted()
+        key = (
+            routing_function,
+            tuple(to_template * t for t in start_ts),
+            tuple(to_template * t for t in end_ts),
+            tuple(widths) if widths is not None else None,
+            repr(starts),
+            repr(ends),
+            tuple(
+                (name, _template_key(value, to_template))
+                for name, value in sorted(kwargs.items())
+            ),
+        )
+        from_template = to_template.inverted()
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            routers: list[ManhattanRouter] = []
+            for st, et, pts, width, radius, separation, allow_sbends in template:
+                router = ManhattanRouter(
+                    bend90_radius=radius,
+                    separation=separation,
+                    start_transformation=from_template * st,
+                    end_transformation=from_template * et,
+                    width=width,
+                    start_points=[from_template * p for p in pts],
+                    allow_sbends=allow_sbends,
+                    finished=True,
+                )
+                router.end.pts = []
+                routers.append(router)
+            return routers
+
+        self.misses += 1
+        routers = routing_function(
+            start_ports=start_ports,
+            end_ports=end_ports,
+            starts=starts,
+            ends=ends,
+            widths=widths,
+            **kwargs,
+        )
+        self._templates[key] = [
+            (
+                to_template * router.start_transformation,
+                to_template * router.end_transformation,
+                [to_template * p for p in router.start.pts],
+                router.width,
+                router.bend90_radius,
+                router.separation,
+                router.allow_sbends,
+            )
+            for router in routers
+        ]
+        while self.maxsize is not None and len(self._templates) > self.maxsize:
+            del self._templates[next(iter(self._templates))]
+        return routers
+
+
+def _template_key(value: Any, to_template: kdb.Trans) -> Any:
+    """Hashable version of a routing kwarg, geometry relative to the template."""
+    if isinstance(value, kdb.Box | kdb.Point | kdb.Trans):
+        return to_template * value
+    if isinstance(value, list | tuple):
+        return tuple(_template_key(v, to_template) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def route_around_obstacles(
+    *,
+    start_ports: Sequence[BasePort | kdb.Trans],
+    end_ports: Sequence[BasePort | kdb.Trans],
+    widths: Sequence[int] | None = None,
+    bend90_radius: int | None = None,
+    separation: int | None = None,
+    starts: Sequence[Sequence[Step]] = [],
+    ends: Sequence[Sequence[Step]] = [],
+    obstacles: Sequence[kdb.Box] | kdb.Region | None = None,
+    bend_penalty: int | None = None,
+    route_debug: RouteDebug | None = None,
+    **kwargs: Any,
+) -> list[ManhattanRouter]:
+    """Route each pair of ports around obstacles.
+
+    For every route a sparse track graph is built from the obstacles (inflated by
+    half the route width plus `separation`) and searched with A*. The cost of a
+    route is its length plus `bend_penalty` per bend. Corners of the route keep
+    at least `2 * bend90_radius` from each other and `bend90_radius` from the
+    start and end (after `starts`/`ends`).
+
+    The routes are found one after the other, shortest first. Already found
+    routes are obstacles for the following ones, the ports of the following ones
+    are kept free. If a route cannot be found, it is moved to the front and all
+    routes are searched again. If a port lies inside an obstacle (e.g. the bbox
+    of its own instance), the route first goes straight until it leaves the
+    obstacle.
+
+    Args:
+        start_ports: Ports where the routing should start.
+        end_ports: Ports denoting the end of the routes.
+        widths: Defines the width of the core material of each route.
+        bend90_radius: The radius for 90° bends in dbu.
+        separation: Separation to keep to obstacles and other routes in dbu.
+        starts: Steps at the beginning of each route.
+        ends: Steps at the end of each route.
+        obstacles: Boxes or a region (each polygon is used by its bbox) the routes
+            must avoid, e.g. the bboxes of the instances of a cell.
+        bend_penalty: Cost of a bend in dbu of path length. Defaults to
+            `2 * bend90_radius`.
+        route_debug: Not used, compatibility with other routing functions.
+        kwargs: Additional kwargs. Compatibility for type checking. If any kwargs are
+            passed an error is raised.
+
+    Raises:
+        ValueError: If a route cannot be found.
+
+    Returns:
+        List of finished ManhattanRouters in the order of the ports.
+    """
+    if len(kwargs) > 0:
+        raise ValueError(
+            "Additional args and kwargs are not allowed for "
+            f"route_around_obstacles.{kwargs=}"
+        )
+    if bend90_radius is None or separation is None:
+        raise ValueError(
+            "route_around_obstacles needs to have 'bend90_radius' and 'separation' "
+            "defined as kwargs."
+        )
+    length = len(start_ports)
+    if len(end_ports) != length:
+        raise ValueError(
+            f"Length of starting ports {len(start_ports)=} does not match length of "
+            f"end ports {len(end_ports)}"
+        )
+    if length == 0:
+        return []
+    starts = starts or [[] for _ in range(length)]
+    ends = ends or [[] for _ in range(length)]
+    if widths is None:
+        widths = [
+            p.any_cross_section.width if isinstance(p, BasePort) else 0
+            for p in start_ports
+        ]
+    if bend_penalty is None:
+        bend_penalty = 2 * bend90_radius
+    if isinstance(obstacles, kdb.Region):
+        obstacle_boxes = [p.bbox() for p in obstacles.merged().each()]
+    else:
+        obstacle_boxes = list(obstacles or [])
+
+    start_ts = [p.get_trans() if isinstance(p, BasePort) else p for p in start_ports]
+    end_ts = [p.get_trans() if isinstance(p, BasePort) else p for p in end_ports]
+    order = sorted(
+        range(length), key=lambda i: (end_ts[i].disp - start_ts[i].disp).sq_length()
+    )
+    # a route which cannot be found is moved to the front and all routes are
+    # searched again, at most once per route
+    for _ in range(length):
+        routers = [
+            ManhattanRouter(
+                bend90_radius=bend90_radius,
+                separation=separation,
+                start_transformation=st,
+                end_transformation=et,
+                start_steps=s,
+                end_steps=e,
+                width=w,
+            )
+            for st, et, s, e, w in zip(
+                start_ts, end_ts, starts, ends, widths, strict=True
+            )
+        ]
+        failed = _route_routers_around_obstacles(
+            [routers[i] for i in order],
+            obstacle_boxes,
+            separation=separation,
+            bend_penalty=bend_penalty,
+        )
+        if failed is None:
+            return routers
+        i = order.pop(failed)
+        if not failed:
+            break
+        order.insert(0, i)
+    raise ValueError(
+        f"Could not find a route from {start_ts[i]} to {end_ts[i]} around the "
+        "obstacles."
+    )
+
+
+def _route_routers_around_obstacles(
+    routers: Sequence[ManhattanRouter],
+    obstacles: Sequence[kdb.Box],
+    separation: int,
+    bend_penalty: int,
+) -> int | None:
+    """Find the routes one after the other.
+
+    Returns:
+        Index of the first router without a route or `None` if all are finished.
+    """
+    # (segment box, width) of the finished routes
+    routed: list[tuple[kdb.Box, int]] = []
+    # the start and end of the routes up to their first possible bend are kept
+    # free, so earlier routes cannot cut off later ones at their ports
+    reserved = [
+        [
+            (kdb.Box(p1, p2), router.width)
+            for side in (router.start, router.end)
+            for p1, p2 in itertools.pairwise(
+                [
+                    *side.pts,
+                    side.t.disp.to_p(),
+                    side.t * kdb.Point(router.bend90_radius, 0),
+                ]
+            )
+        ]
+        for router in routers
+    ]
+    for n, router in enumerate(routers):
+        clearance = router.width // 2 + separation
+        boxes = [b.enlarged(clearance) for b in obstacles]
+        boxes.extend(
+            b.enlarged(w // 2 + clearance)
+            for b, w in itertools.chain(routed, *reserved[n + 1 :])
+        )
+        route = _route_on_tracks(
+            boxes=boxes,
+            start=router.start.t,
+            end=router.end.t,
+            bend90_radius=router.bend90_radius,
+            bend_penalty=bend_penalty,
+        )
+        if route is None:
+            return n
+        pts: list[kdb.Point] = []
+        for p in router.start.pts + route + list(reversed(router.end.pts)):
+            if not pts or p != pts[-1]:
+                pts.append(p)
+        pts = clean_points(pts)
+        router.start.pts = pts
+        router.end.pts = []
+        router.start.t = router.end.t * kdb.Trans.R180
+        router.finished = True
+        routed.extend(
+            (kdb.Box(p1, p2), router.width) for p1, p2 in itertools.pairwise(pts)
+        )
+    return None
+
+
+_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+# grid x index, grid y index and direction right after a bend (or the start)
+type _State = tuple[int, int, int]
+
+
+class _TrackGraph:
+    """Sparse grid of routing tracks between inflated obstacles.
+
+    The tracks are the lines through the edges of the obstacles and through some
+    extra coordinates (ports, bend offsets, an outer ring). An edge between two
+    neighboring grid nodes is blocked if it runs through the inside of an
+    obstacle. Touching an obstacle is fine, as the obstacles are already inflated
+    by the clearance of the route.
+
+    Obstacles are looked up with a [BoxIndex][kfactory.spatial.BoxIndex], blocked
+    edges are determined lazily per track.
+    """
+
+    def __init__(self, boxes: Sequence[kdb.Box]) -> None:
+        self.index = BoxIndex(boxes)
+        self.boxes = np.array(
+            [(b.left, b.bottom, b.right, b.top) for b in boxes], dtype=np.int64
+        ).reshape(-1, 4)
+        self.xs = self.ys = np.empty(0, dtype=np.int64)
+        self._blocked: dict[tuple[bool, int], npt.NDArray[np.int64]] = {}
+        # obstacles within reach of bends on a track
+        self._bend_boxes: dict[tuple[bool, int], npt.NDArray[np.int64]] = {}
+
+    def set_tracks(self, xs: Iterable[int], ys: Iterable[int]) -> None:
+        """Set the coordinates of the vertical (`xs`) and horizontal tracks."""
+        self.xs = np.unique(np.fromiter(xs, dtype=np.int64))
+        self.ys = np.unique(np.fromiter(ys, dtype=np.int64))
+        self._blocked = {}
+        self._bend_boxes = {}
+
+    def _query(self, box: kdb.Box) -> npt.NDArray[np.int64]:
+        return self.boxes[self.index.query(box)]
+
+    def blocked(self, horizontal: bool, line: int) -> npt.NDArray[np.int64]:
+        """Sorted indexes of the blocked edges along a track.
+
+        Edge `i` connects the grid nodes `i` and `i + 1` of the track.
+        """
+        key = (horizontal, line)
+        blocked = self._blocked.get(key)
+        if blocked is None:
+            if horizontal:
+                coords, c = self.xs, int(self.ys[line])
+                track = kdb.Box(int(coords[0]), c, int(coords[-1]), c)
+                lo, hi, side = 0, 2, 1
+            else:
+                coords, c = self.ys, int(self.xs[line])
+                track = kdb.Box(c, int(coords[0]), c, int(coords[-1]))
+                lo, hi, side = 1, 3, 0
+            boxes = self._query(track)
+            boxes = boxes[(boxes[:, side] < c) & (c < boxes[:, side + 2])]
+            mids = (coords[:-1] + coords[1:]) / 2
+            diff = np.zeros(len(coords), dtype=np.int64)
+            np.add.at(diff, np.searchsorted(mids, boxes[:, lo], side="right"), 1)
+            np.add.at(diff, np.searchsorted(mids, boxes[:, hi], side="left"), -1)
+            blocked = np.flatnonzero(np.cumsum(diff)[:-1])
+            self._blocked[key] = blocked
+        return blocked
+
+    def reach(self, ix: int, iy: int, d: int) -> npt.NDArray[np.int64]:
+        """Indexes of the grid nodes reachable in a straight line from a node.
+
+        The indexes are along the track in direction `d` and sorted by distance.
+        """
+        horizontal = d % 2 == 0
+        i, line, n = (ix, iy, len(self.xs)) if horizontal else (iy, ix, len(self.ys))
+        blocked = self.blocked(horizontal, line)
+        pos = int(np.searchsorted(blocked, i))
+        if d < 2:
+            return np.arange(i + 1, int(blocked[pos]) + 1 if pos < len(blocked) else n)
+        return np.arange(i - 1, int(blocked[pos - 1]) if pos else -1, -1)
+
+    def bends_blocked(
+        self,
+        xs: npt.NDArray[np.int64],
+        ys: npt.NDArray[np.int64],
+        d_in: int,
+        d_out: int,
+        r: int,
+    ) -> npt.NDArray[np.bool_]:
+        """Whether circular bends with corners `(xs, ys)` run through obstacles.
+
+        A bend is a quarter circle inside the square spanned by the points `r`
+        before and after its corner. All corners must lie on one track along
+        `d_in`.
+        """
+        ix, iy = _DIRECTIONS[d_in]
+        ox, oy = _DIRECTIONS[d_out]
+        x_lo, x_hi = sorted((-r * ix, r * ox))
+        y_lo, y_hi = sorted((-r * iy, r * oy))
+        horizontal = d_in % 2 == 0
+        line = int(ys[0]) if horizontal else int(xs[0])
+        boxes = self._bend_boxes.get((horizontal, line))
+        if boxes is None:
+            if horizontal:
+                band = kdb.Box(
+                    int(self.xs[0]) - r, line - r, int(self.xs[-1]) + r, line + r
+                )
+            else:
+                band = kdb.Box(
+                    line - r, int(self.ys[0]) - r, line + r, int(self.ys[-1]) + r
+                )
+            boxes = self._query(band)
+            self._bend_boxes[horizontal, line] = boxes
+        # only pair each obstacle with the corners whose squares overlap it
+        # along the track
+        if horizontal:
+            along, lo, hi, b_lo, b_hi = xs, x_lo, x_hi, boxes[:, 0], boxes[:, 2]
+        else:
+            along, lo, hi, b_lo, b_hi = ys, y_lo, y_hi, boxes[:, 1], boxes[:, 3]
+        order = np.argsort(along, kind="stable")
+        first = np.searchsorted(along[order], b_lo - hi, side="right")
+        counts = np.maximum(
+            np.searchsorted(along[order], b_hi - lo, side="left") - first, 0
+        )
+        box_ids = np.repeat(np.arange(len(boxes)), counts)
+        corner_ids = order[
+            np.repeat(first - np.cumsum(counts) + counts, counts)
+            + np.arange(counts.sum())
+        ]
+        boxes = boxes[box_ids]
+        x, y = xs[corner_ids], ys[corner_ids]
+        cx, cy = x + r * (ox - ix), y + r * (oy - iy)
+        left = np.maximum(boxes[:, 0], x + x_lo)
+        bottom = np.maximum(boxes[:, 1], y + y_lo)
+        right = np.minimum(boxes[:, 2], x + x_hi)
+        top = np.minimum(boxes[:, 3], y + y_hi)
+        d_min = np.hypot(
+            np.maximum(np.maximum(left - cx, cx - right), 0),
+            np.maximum(np.maximum(bottom - cy, cy - top), 0),
+        )
+        d_max = np.hypot(
+            np.maximum(np.abs(left - cx), np.abs(right - cx)),
+            np.maximum(np.abs(bottom - cy), np.abs(top - cy)),
+        )
+        hit = (left < right) & (bottom < top) & (d_min < r) & (r < d_max)
+        blocked = np.zeros(len(xs), dtype=bool)
+        blocked[corner_ids[hit]] = True
+        return blocked
+
+    def escape(self, t: kdb.Trans) -> int:
+        """Distance to go straight from `t` to leave all obstacles containing it."""
+        p = t.disp.to_p()
+        dx, dy = _DIRECTIONS[t.angle]
+        escaped = 0
+        while True:
+            boxes = self._query(kdb.Box(p, p))
+            boxes = boxes[
+                (boxes[:, 0] < p.x)
+                & (p.x < boxes[:, 2])
+                & (boxes[:, 1] < p.y)
+                & (p.y < boxes[:, 3])
+            ]
+            if not len(boxes):
+                return escaped
+            match t.angle:
+                case 0:
+                    d = int(boxes[:, 2].max()) - p.x
+                case 1:
+                    d = int(boxes[:, 3].max()) - p.y
+                case 2:
+                    d = p.x - int(boxes[:, 0].min())
+                case _:
+                    d = p.y - int(boxes[:, 1].min())
+            escaped += d
+            p += kdb.Vector(dx * d, dy * d)
+
+
+def _min_bends(
+    vx: npt.NDArray[np.int64], vy: npt.NDArray[np.int64], d: int, goal_dir: int
+) -> npt.NDArray[np.int64]:
+    """Lower bound of bends from direction `d` to a goal at `(vx, vy)`.
+
+    The goal must be reached in direction `goal_dir`.
+    """
+    # goal position seen from the current direction, x forward and y left
+    match d:
+        case 0:
+            x, y = vx, vy
+        case 1:
+            x, y = vy, -vx
+        case 2:
+            x, y = -vx, -vy
+        case _:
+            x, y = -vy, vx
+    match (goal_dir - d) % 4:
+        case 0:
+            return np.where((y == 0) & (x >= 0), 0, np.where(x > 0, 2, 4))
+        case 1:
+            return np.where((x >= 0) & (y >= 0), 1, 3)
+        case 2:
+            return np.full_like(vx, 2)
+        case _:
+            return np.where((x >= 0) & (y <= 0), 1, 3)
+
+
+def _route_on_tracks(
+    boxes: Sequence[kdb.Box],
+    start: kdb.Trans,
+    end: kdb.Trans,
+    bend90_radius: int,
+    bend_penalty: int,
+) -> list[kdb.Point] | None:
+    """A* search for the corners of a route from `start` to `end`.
+
+    `start` and `end` are the router sides' transformations, i.e. both point
+    towards the route. A search state is a grid node and the direction the route
+    continues in after a bend there. Expanding a state goes straight along the
+    track and tries to bend at every reachable node at least `2 * bend90_radius`
+    away, so straight segments never have to be searched node by node.
+
+    Returns:
+        The points of the route from the escaped start to the escaped end or
+        `None` if there is no route.
+    """
+    r = bend90_radius
+    graph = _TrackGraph(boxes)
+    start_escape = graph.escape(start)
+    end_escape = graph.escape(end)
+    sdx, sdy = _DIRECTIONS[start.angle]
+    edx, edy = _DIRECTIONS[end.angle]
+    sp = start.disp.to_p() + kdb.Vector(sdx * start_escape, sdy * start_escape)
+    ep = end.disp.to_p() + kdb.Vector(edx * end_escape, edy * end_escape)
+    start_need = max(r - start_escape, 0)
+    end_need = max(r - end_escape, 0)
+
+    xs: list[int] = []
+    ys: list[int] = []
+    # tracks along the obstacles and where a bend around an obstacle can end
+    for b in boxes:
+        xs.extend((b.left - r, b.left, b.right, b.right + r))
+        ys.extend((b.bottom - r, b.bottom, b.top, b.top + r))
+    for p in (sp, ep):
+        xs.extend(p.x + k * r for k in range(-3, 4))
+        ys.extend(p.y + k * r for k in range(-3, 4))
+    xs.append(sp.x + sdx * start_need)
+    ys.append(sp.y + sdy * start_need)
+    xs.append(ep.x + edx * end_need)
+    ys.append(ep.y + edy * end_need)
+    ring = kdb.Box(sp, ep)
+    for b in boxes:
+        ring += b
+    ring = ring.enlarged(2 * r)
+    xs.extend((ring.left, ring.right))
+    ys.extend((ring.bottom, ring.top))
+    graph.set_tracks(xs, ys)
+    gx, gy = graph.xs, graph.ys
+
+    first: _State = (
+        int(np.searchsorted(gx, sp.x)),
+        int(np.searchsorted(gy, sp.y)),
+        start.angle,
+    )
+    goal = (int(np.searchsorted(gx, ep.x)), int(np.searchsorted(gy, ep.y)))
+    # the route arrives at the end point against the end's direction
+    goal_dir = (end.angle + 2) % 4
+    goal_state: _State = (*goal, -1)
+
+    # Cheapest known cost per state. The grid can be too large for an array of all
+    # states, so there is one array per direction and track: states are reached
+    # by bending off a track, i.e. a state going vertically lies on the
+    # horizontal track it was reached from and vice versa.
+    no_cost = np.iinfo(np.int64).max
+    best: dict[tuple[int, int], npt.NDArray[np.int64]] = {}
+
+    def costs(d: int, ix: int, iy: int) -> tuple[npt.NDArray[np.int64], int]:
+        """Costs of the track of a state and the state's index in them."""
+        key, pos = ((d, iy), ix) if d % 2 else ((d, ix), iy)
+        track_costs = best.get(key)
+        if track_costs is None:
+            track_costs = np.full(len(gx) if d % 2 else len(gy), no_cost)
+            best[key] = track_costs
+        return track_costs, pos
+
+    track_costs, k = costs(first[2], first[0], first[1])
+    track_costs[k] = 0
+    goal_cost = no_cost
+    parents: dict[_State, _State] = {}
+    counter = itertools.count()
+    h0 = abs(ep.x - sp.x) + abs(ep.y - sp.y)
+    h0 += int(
+        _min_bends(
+            np.array([ep.x - sp.x]), np.array([ep.y - sp.y]), start.angle, goal_dir
+        )[0]
+    )
+    # among states with the same estimate, continue with the most advanced one
+    heap: list[tuple[int, int, int, _State]] = [(h0, 0, next(counter), first)]
+    while heap:
+        _, neg_g, _, state = heapq.heappop(heap)
+        g = -neg_g
+        if state == goal_state:
+            pts: list[kdb.Point] = [ep]
+            while state in parents:
+                state = parents[state]
+                pts.append(kdb.Point(int(gx[state[0]]), int(gy[state[1]])))
+            pts.reverse()
+            return pts
+        ix, iy, d = state
+        track_costs, k = costs(d, ix, iy)
+        if g > track_costs[k]:
+            continue
+        need = start_need if state == first else 2 * r
+        nodes = graph.reach(ix, iy, d)
+        if d % 2 == 0:
+            node_xs, node_ys = gx[nodes], np.full_like(nodes, gy[iy])
+            dists = np.abs(node_xs - gx[ix])
+            on_goal_track = iy == goal[1]
+            goal_pos, pos = goal[0], ix
+        else:
+            node_xs, node_ys = np.full_like(nodes, gx[ix]), gy[nodes]
+            dists = np.abs(node_ys - gy[iy])
+            on_goal_track = ix == goal[0]
+            goal_pos, pos = goal[1], iy
+        if d == goal_dir and on_goal_track:
+            steps = (goal_pos - pos) * (1 if d < 2 else -1)
+            if steps == 0 or 0 < steps <= len(nodes):
+                dist = int(dists[steps - 1]) if steps else 0
+                # no bend is needed if the route goes straight from the start
+                min_dist = 0 if state == first else end_need
+                if dist >= min_dist and g + dist < goal_cost:
+                    goal_cost = g + dist
+                    parents[goal_state] = state
+                    heapq.heappush(
+                        heap, (goal_cost, -goal_cost, next(counter), goal_state)
+                    )
+        bendable = dists >= need
+        nodes, node_xs, node_ys = nodes[bendable], node_xs[bendable], node_ys[bendable]
+        g_next = g + dists[bendable] + bend_penalty
+        if d % 2 == 0:
+            grid_xs, grid_ys = nodes, np.full_like(nodes, iy)
+        else:
+            grid_xs, grid_ys = np.full_like(nodes, ix), nodes
+        for turn in (1, 3):
+            d_next = (d + turn) % 4
+            track_costs, _ = costs(d_next, ix, iy)
+            better = g_next < track_costs[nodes]
+            if not better.any():
+                continue
+            better[better] = ~graph.bends_blocked(
+                node_xs[better], node_ys[better], d, d_next, r
+            )
+            track_costs[nodes[better]] = g_next[better]
+            vx, vy = ep.x - node_xs[better], ep.y - node_ys[better]
+            f = (
+                g_next[better]
+                + np.abs(vx)
+                + np.abs(vy)
+                + bend_penalty * _min_bends(vx, vy, d_next, goal_dir)
+            )
+            for f_, g_, x_, y_ in zip(
+                f.tolist(),
+                g_next[better].tolist(),
+                grid_xs[better].tolist(),
+                grid_ys[better].tolist(),
+                strict=True,
+            ):
+                next_state = (x_, y_, d_next)
+                parents[next_state] = state
+                heapq.heappush(heap, (f_, -g_, next(counter), next_state))
+    return None
+
+
 def is_manhattan(vector: kdb.Vector) -> bool:
     return vector.x == 0 or vector.y == 0
 
@@ -2450,6 +2953,341 @@ def route_ports_to_bundle(
     return port_dict, dir_trans * bundle_position
 
 
+type _SideState = tuple[tuple[int, bool, int, int], list[tuple[int, int]]]
+type _RouterState = tuple[_SideState, _SideState, bool]
+
+
+def _side_state(side: ManhattanRouterSide) -> _SideState:
+    t = side.t
+    return (t.angle, t.is_mirror(), t.disp.x, t.disp.y), [(p.x, p.y) for p in side.pts]
+
+
+def _restore_side(side: ManhattanRouterSide, state: _SideState) -> None:
+    t, pts = state
+    side.t = kdb.Trans(*t)
+    side.pts = [kdb.Point(x, y) for x, y in pts]
+
+
+type _BundleRouter = Callable[[list[ManhattanRouter], kdb.Region], None]
+
+_bundle_job: tuple[list[list[ManhattanRouter]], kdb.Region, _BundleRouter] | None = None
+
+
+def _init_bundle_worker(
+    job: tuple[list[list[ManhattanRouter]], kdb.Region, _BundleRouter],
+) -> None:
+    global _bundle_job  # noqa: PLW0603
+    _bundle_job = job
+
+
+def _route_bundle_in_worker(index: int) -> list[_RouterState]:
+    """Route one bundle in a forked worker and return the state of its routers."""
+    assert _bundle_job is not None
+    bundles, box_region, route_bundle = _bundle_job
+    bundle = bundles[index]
+    route_bundle(bundle, box_region)
+    return [(_side_state(r.start), _side_state(r.end), r.finished) for r in bundle]
+
+
+def _route_bundles_forked(
+    bundles: list[list[ManhattanRouter]],
+    box_region: kdb.Region,
+    route_bundle: _BundleRouter,
+    max_workers: int,
+) -> None:
+    """Route independent bundles in forked worker processes.
+
+    The workers inherit the routers and send back only the transformations and
+    points of the routed bundle as plain tuples, which are then applied to the
+    routers of this process.
+    """
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(bundles)),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_bundle_worker,
+        initargs=((bundles, box_region, route_bundle),),
+    ) as pool:
+        for bundle, states in zip(
+            bundles,
+            pool.map(_route_bundle_in_worker, range(len(bundles))),
+            strict=True,
+        ):
+            for router, (start, end, finished) in zip(bundle, states, strict=True):
+                _restore_side(router.start, start)
+                _restore_side(router.end, end)
+                router.finished = finished
+
+
+def _route_bundle(
+    router_bundle: list[ManhattanRouter],
+    box_region: kdb.Region,
+    *,
+    bend90_radius: int,
+    separation: int,
+    bbox_routing: Literal["minimal", "full"],
+    allow_sbend: bool,
+    total_width: int,
+) -> None:
+    """Route one bundle of [route_smart][kfactory.routing.manhattan.route_smart]."""
+    sorted_routers = _sort_routers(router_bundle)
+
+    # simple (maybe error-prone) way to determine the ideal routing angle
+    # this would need to be expanded in order to allow for automatic single
+    # waypoint router (without transformation or similar)
+    angle = router_bundle[0].end.t.angle
+
+    r = router_bundle[0]
+    end_angle = r.end.t.angle
+    re = router_bundle[-1]
+    start_bbox = kdb.Box(r.start.pts[0], re.start.t * _p)
+    end_bbox = kdb.Box(r.end.pts[0], re.end.t * _p)
+    start_bbox += re.start.t * kdb.Point(-1, 0)
+    end_bbox += re.end.t * kdb.Point(-1, 0)
+
+    _route_p(
+        sorted_routers=sorted_routers,
+        start_bbox=start_bbox,
+        separation=separation,
+    )
+
+    for r in router_bundle:
+        start_bbox += kdb.Box(r.start.pts[0], r.start.t.disp.to_p()) + kdb.Box(
+            0, -r.width // 2, 0, r.width // 2
+        ).transformed(r.start.t)
+        end_bbox += kdb.Box(r.end.pts[0], r.end.t.disp.to_p()) + kdb.Box(
+            0, -r.width // 2, 0, r.width // 2
+        ).transformed(r.end.t)
+        if r.end.t.angle != end_angle:
+            raise ValueError(
+                "All ports at the target (end) must have the same angle. "
+                f"{r.start.t=}/{r.end.t=}"
+            )
+    if bbox_routing == "minimal":
+        route_to_bbox(
+            (router.start for router in sorted_routers),
+            start_bbox,
+            bbox_routing="full",
+            separation=separation,
+        )
+        route_to_bbox(
+            (router.end for router in sorted_routers),
+            end_bbox,
+            bbox_routing="full",
+            separation=separation,
+        )
+
+    if box_region:
+        start_bbox = box_region.interacting(kdb.Region(start_bbox)).bbox() + start_bbox
+        end_bbox = box_region.interacting(kdb.Region(end_bbox)).bbox() + end_bbox
+    route_to_bbox(
+        (router.start for router in sorted_routers),
+        start_bbox,
+        bbox_routing=bbox_routing,
+        separation=separation,
+    )
+    route_to_bbox(
+        (router.end for router in sorted_routers),
+        end_bbox,
+        bbox_routing=bbox_routing,
+        separation=separation,
+    )
+    bb_start2end = kdb.Trans(-angle, False, 0, 0) * start_bbox
+    bb_end2start = kdb.Trans(-angle, False, 0, 0) * end_bbox
+
+    if bb_start2end.left - bb_end2start.right > bend90_radius + total_width:
+        target_angle = (angle - 2) % 4
+    else:
+        target_angle = angle
+        avg = kdb.Vector()
+        end_routers = [r.end for r in sorted_routers]
+        for rs in end_routers:
+            avg += rs.tv
+        route_to_bbox(
+            end_routers,
+            end_bbox,
+            separation=separation,
+            bbox_routing=bbox_routing,
+        )
+        _route_to_side(
+            end_routers,
+            clockwise=avg.y > 0,
+            bbox=end_bbox,
+            separation=separation,
+            bbox_routing=bbox_routing,
+        )
+        _route_to_side(
+            end_routers,
+            clockwise=avg.y > 0,
+            bbox=end_bbox,
+            separation=separation,
+            bbox_routing=bbox_routing,
+        )
+    router_groups: list[tuple[int, list[ManhattanRouter]]] = []
+    group_angle: int | None = None
+    current_group: list[ManhattanRouter] = []
+    for router in sorted_routers:
+        ang = router.start.t.angle
+        if ang != group_angle:
+            if group_angle is not None:
+                router_groups.append(((group_angle - target_angle) % 4, current_group))
+            group_angle = ang
+            current_group = []
+        current_group.append(router)
+    if group_angle is not None:
+        router_groups.append(((group_angle - target_angle) % 4, current_group))
+
+    total_bbox = start_bbox
+
+    if len(router_groups) > 1:
+        i = 0
+        rg_angles = [rg[0] for rg in router_groups]
+        traverses0 = False
+        a = rg_angles[0]
+
+        for _a in rg_angles[1:]:
+            if _a == 0:
+                continue
+            if _a <= a:
+                traverses0 = True
+            a = _a
+        angle = rg_angles[0]
+
+        # Find out whether we are passing the angle where no side routing is
+        # necessary and if we do, we need to start routing clockwise until we
+        # pass 0. Otherwise test on which side of the bounding box we land
+
+        # Routing clock-wise (the order of the routers, the actual routings are
+        # anti-clockwise and vice-versa)
+
+        if traverses0 or rg_angles[-1] in {0, 3}:
+            routers_clockwise: list[ManhattanRouter] = router_groups[0][1].copy()
+            for i in range(1, len(router_groups)):
+                new_angle, new_routers = router_groups[i]
+                a = angle
+                if routers_clockwise:
+                    if traverses0:
+                        while a not in {new_angle, 0}:
+                            a = (a + 1) % 4
+                            total_bbox += _route_to_side(
+                                routers=[router.start for router in routers_clockwise],
+                                clockwise=True,
+                                bbox=start_bbox,
+                                separation=separation,
+                                allow_sbends=a == 0 and allow_sbend,
+                            )
+                    else:
+                        while a != new_angle:
+                            a = (a + 1) % 4
+                            total_bbox += _route_to_side(
+                                routers=[router.start for router in routers_clockwise],
+                                clockwise=True,
+                                bbox=start_bbox,
+                                separation=separation,
+                                allow_sbends=a == 0 and allow_sbend,
+                            )
+                if new_angle <= angle:
+                    if new_angle != 0:
+                        i -= 1  # noqa: PLW2901
+                    break
+                routers_clockwise.extend(new_routers)
+                angle = new_angle
+            else:
+                a = angle
+                while a != 0:
+                    a = (a + 1) % 4
+                    total_bbox += _route_to_side(
+                        routers=[router.start for router in routers_clockwise],
+                        clockwise=True,
+                        bbox=start_bbox,
+                        separation=separation,
+                    )
+
+        # Route the rest of the groups anti-clockwise
+        if i < len(router_groups) - 1:
+            angle = rg_angles[-1]
+            routers_anticlockwise: list[ManhattanRouter] = router_groups[-1][1].copy()
+            n = i
+            for i in reversed(range(n, len(router_groups) - 1)):
+                new_angle, new_routers = router_groups[i]
+                a = angle
+                if routers_anticlockwise:
+                    while a not in {new_angle, 0}:
+                        a = (a - 1) % 4
+                        total_bbox += _route_to_side(
+                            routers=[router.start for router in routers_anticlockwise],
+                            clockwise=False,
+                            bbox=start_bbox,
+                            separation=separation,
+                            allow_sbends=a == 0 and allow_sbend,
+                        )
+                if new_angle == 0:
+                    routers_anticlockwise.extend(new_routers)
+                    break
+                if new_angle >= angle:
+                    break
+                routers_anticlockwise.extend(new_routers)
+                angle = new_angle
+            else:
+                a = angle
+                while a != 0:
+                    a = (a - 1) % 4
+                    total_bbox += _route_to_side(
+                        routers=[router.start for router in routers_anticlockwise],
+                        clockwise=False,
+                        bbox=start_bbox,
+                        separation=separation,
+                        allow_sbends=a == 0 and allow_sbend,
+                    )
+        route_to_bbox(
+            [router.start for router in sorted_routers],
+            total_bbox,
+            bbox_routing=bbox_routing,
+            separation=separation,
+        )
+        route_loosely(
+            sorted_routers,
+            separation=separation,
+            start_bbox=total_bbox,
+            end_bbox=end_bbox,
+            bbox_routing=bbox_routing,
+            allow_sbend=allow_sbend,
+        )
+    else:
+        routers = router_groups[0][1]
+        r = routers[0]
+        match (target_angle - r.start.t.angle) % 4:
+            case 2:
+                total_bbox = _route_to_side(
+                    [r.start for r in routers],
+                    clockwise=routers[0].start.tv.y > 0,
+                    bbox=total_bbox,
+                    separation=separation,
+                )
+                total_bbox = _route_to_side(
+                    [r.start for r in routers],
+                    clockwise=routers[0].start.tv.y > 0,
+                    bbox=total_bbox,
+                    separation=separation,
+                    allow_sbends=allow_sbend,
+                )
+            case _:
+                ...
+        route_to_bbox(
+            [router.start for router in router_bundle],
+            total_bbox,
+            bbox_routing=bbox_routing,
+            separation=separation,
+        )
+        route_loosely(
+            routers,
+            separation=separation,
+            start_bbox=total_bbox,
+            end_bbox=end_bbox,
+            bbox_routing=bbox_routing,
+            allow_sbend=allow_sbend,
+        )
+
+
 def _route_waypoints(
     waypoints: kdb.Trans | Sequence[kdb.Point],
     widths: Sequence[int],
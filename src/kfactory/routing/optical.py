@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from dataclasses import dataclass
 from enum import IntEnum
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast, overload
 
@@ -11,12 +12,20 @@ from ..conf import (
     ANGLE_270,
     MIN_POINTS_FOR_PLACEMENT,
     NUM_PORTS_FOR_ROUTING,
+    PROPID,
     config,
     logger,
 )
+from ..exceptions import (
+    CrossSectionSymmetryMismatchError,
+    PortLayerMismatchError,
+    PortTypeMismatchError,
+    PortWidthMismatchError,
+)
 from ..instance import Instance, ProtoTInstance
 from ..instance_group import InstanceGroup, ProtoTInstanceGroup
 from ..kcell import DKCell, KCell, ProtoTKCell
+from ..port import Port
 from .generic import ManhattanRoute, PlacerFunction, get_radius
 from .generic import (
     route_bundle as route_bundle_generic,
@@ -24,6 +33,7 @@ from .generic import (
 from .manhattan import (
     ManhattanRouter,
     _is_manhattan,
+    _path_lengths,
     route_manhattan,
     route_smart,
 )
@@ -38,9 +48,10 @@ if TYPE_CHECKING:
         StraightFactoryDBU,
         StraightFactoryUM,
     )
-    from ..port import DPort, Port
+    from ..port import DPort
     from ..schematic import Constraint
     from ..typings import dbu, um
+    from .manhattan import RouteTemplateCache
     from .utils import RouteDebug
 
 __all__ = [
@@ -81,10 +92,26 @@ def path_length_match(
     loop_position: LoopPosition = LoopPosition.start,
     path_length: int | None = None,
 ) -> None:
+    """Insert delay loops so that all routers have the same path length.
+
+    The lengths of all routers are computed in one go, the loops are then placed
+    analytically from the missing length of each router.
+
+    Args:
+        routers: The finished routers to modify.
+        element: Index of the segment of the routers to put the loops in.
+        loops: Number of loops per router.
+        loop_side: Side of the segment the loops are on.
+        loop_position: Where on the segment to put the loops.
+        path_length: Target path length in dbu. Defaults to the longest router.
+    """
+    if not routers:
+        return
+    lengths = _path_lengths(routers)
     if path_length is None:
-        path_length = max(router.path_length for router in routers)
-    elif path_length < max(router.path_length for router in routers):
-        path_length_ = max(router.path_length for router in routers)
+        path_length = int(lengths.max())
+    elif path_length < lengths.max():
+        path_length_ = int(lengths.max())
         logger.warning(
             f"Requesting path length matching to {path_length!r}[dbu], but the minimal"
             f" possible path length is {path_length_!r}. Increasing to minimum."
@@ -105,12 +132,24 @@ def path_length_match(
             loops += 1
     br = max(routers[0].bend90_radius, routers[0].width + routers[0].separation)
 
-    for router in routers:
-        length = router.path_length
+    # missing length of every router and the length of each loop arm
+    extra = path_length - lengths
+    loop_lengths = extra // (loops * 2)
+    odd = lengths % 2
+    if odd.any():
+        logger.warning(
+            "path length matching can only be done with a precision of 2 dbu. "
+            "Rounding path length matching to nearest 2 dbu length."
+        )
+    # the rest which doesn't divide evenly into the loops (after rounding odd
+    # lengths up) goes to the first loop
+    l_diffs = (extra - odd - loop_lengths * 2 * loops) // 2
 
+    for router, loop_length, l_diff in zip(
+        routers, loop_lengths.tolist(), l_diffs.tolist(), strict=True
+    ):
         match loop_side:
             case LoopSide.left:
-                loop_length = (path_length - length) // (loops * 2)
                 pts = [
                     kdb.Point(0, 0),
                     kdb.Point(0, loop_length + 2 * br),
@@ -122,7 +161,6 @@ def path_length_match(
                     t = kdb.Trans(i * 4 * br, 0)
                     pts += [t * pt for pt in pts[:4]]
             case LoopSide.right:
-                loop_length = (path_length - length) // (loops * 2)
                 pts = [
                     kdb.Point(0, 0),
                     kdb.Point(0, -(loop_length + 2 * br)),
@@ -135,7 +173,6 @@ def path_length_match(
                     pts += [t * pt for pt in pts[:4]]
 
             case LoopSide.center:
-                loop_length = (path_length - length) // (loops * 2)
                 lh1 = loop_length // 2
                 lh2 = loop_length - lh1
 
@@ -204,14 +241,7 @@ def path_length_match(
                     f"{LoopPosition.__members__}. This can either be "
                     "an enum value or the int representation."
                 )
-        if length % 2:
-            logger.warning(
-                "path length matching can only be done with a precision of 2 dbu. "
-                "Rounding path length matching to nearest 2 dbu length."
-            )
-            length += 1
-        if loop_length * 2 * loops != path_length - length:
-            l_diff = (path_length - length - loop_length * 2 * loops) // 2
+        if l_diff:
             if loop_side == LoopSide.right:
                 pts[1].y -= l_diff
                 pts[2].y -= l_diff
@@ -259,6 +289,8 @@ def route_bundle(
     constraints: Sequence[Constraint] | None = None,
     route_debug: RouteDebug | None = None,
     route_name: str | None = None,
+    route_cache: RouteTemplateCache | None = None,
+    straight_mode: Literal["instance", "polygon"] = "instance",
 ) -> list[ManhattanRoute]: ...
 
 
@@ -294,6 +326,8 @@ def route_bundle(
     constraints: Sequence[Constraint] | None = None,
     route_debug: RouteDebug | None = None,
     route_name: str | None = None,
+    route_cache: RouteTemplateCache | None = None,
+    straight_mode: Literal["instance", "polygon"] = "instance",
 ) -> list[ManhattanRoute]: ...
 
 
@@ -338,6 +372,8 @@ def route_bundle(
     constraints: Sequence[Constraint] | None = None,
     route_debug: RouteDebug | None = None,
     route_name: str | None = None,
+    route_cache: RouteTemplateCache | None = None,
+    straight_mode: Literal["instance", "polygon"] = "instance",
 ) -> list[ManhattanRoute]:
     r"""Route a bundle from starting ports to end_ports.
 
@@ -430,6 +466,15 @@ def route_bundle(
             (after the steps).
         purpose: Set the property "purpose" (at id kf.kcell.PROPID.PURPOSE) to the
             value. Not set if None.
+        route_cache: Reuse the backbones of bundles with the same relative port
+            configuration and routing parameters. Not used if `route_debug` is
+            given. See
+            [RouteTemplateCache][kfactory.routing.manhattan.RouteTemplateCache].
+        straight_mode: "instance" places an instance of a straight cell for every
+            straight. "polygon" draws the shapes of the straights directly into `c`,
+            only bends and tapers are instances. This needs far fewer cells for
+            large bundles. The straights must consist of boxes spanning their
+            length, with the ports at both ends (like `straight_dbu_factory`).
 
     Returns:
         list[ManhattanRoute]: The route object with the placed components.
@@ -457,6 +502,7 @@ def route_bundle(
             "allow_type_mismatch": allow_type_mismatch,
             "purpose": purpose,
             "route_width": route_width,
+            "straight_mode": straight_mode,
         }
     else:
         # Not a type error
@@ -474,6 +520,7 @@ def route_bundle(
             "purpose": purpose,
             "route_width": route_width,
             "sbend_factory": sbend_factory,
+            "straight_mode": straight_mode,
         }
     if isinstance(c, KCell):
         try:
@@ -504,6 +551,7 @@ def route_bundle(
                 constraints=constraints,
                 route_debug=route_debug,
                 route_name=route_name,
+                route_cache=route_cache,
             )
         except ValueError as e:
             if str(e).startswith("Found non-manhattan waypoints."):
@@ -623,6 +671,7 @@ def route_bundle(
             "allow_type_mismatch": allow_type_mismatch,
             "purpose": purpose,
             "route_width": route_width,
+            "straight_mode": straight_mode,
         }
     else:
         sbend_factory = cast("SBendFactoryUM", sbend_factory)
@@ -652,6 +701,7 @@ def route_bundle(
             "purpose": purpose,
             "route_width": route_width,
             "sbend_factory": _sbend_factory,
+            "straight_mode": straight_mode,
         }
     try:
         return route_bundle_generic(
@@ -681,6 +731,7 @@ def route_bundle(
             end_angles=end_angles,
             route_debug=route_debug,
             route_name=route_name,
+            route_cache=route_cache,
         )
     except ValueError as e:
         if str(e).startswith("Found non-manhattan waypoints."):
@@ -730,6 +781,66 @@ def route_bundle(
         raise
 
 
+@dataclass
+class _StraightTemplate:
+    """Shapes and ports of a straight, to draw straights of any length."""
+
+    cell: ProtoTKCell[Any]
+    length: dbu
+    boxes: list[tuple[int, kdb.Box]]
+    port1: Port
+    port2: Port
+
+
+def _straight_template(
+    straight_factory: StraightFactoryDBU, w: int, port_type: str
+) -> _StraightTemplate:
+    """Get the template of the straights of width `w` from one straight cell."""
+    straight = straight_factory(width=w, length=w)
+    length = w
+    p1, p2 = (Port(base=p.base) for p in straight.ports if p.port_type == port_type)
+    if p1.trans != kdb.Trans.R180 or p2.trans != kdb.Trans(length, 0):
+        raise ValueError(
+            "straight_mode='polygon' needs straights with the first port at (0, 0) "
+            f"facing west and the second at (length, 0) facing east. {straight.name}"
+            f" has the ports at {p1.trans} and {p2.trans}."
+        )
+    boxes: list[tuple[int, kdb.Box]] = []
+    for layer in straight.kcl.layer_indexes():
+        for poly in kdb.Region(straight.kdb_cell.begin_shapes_rec(layer)).each():
+            box = poly.bbox()
+            if not poly.is_box() or box.left != 0 or box.right != length:
+                raise ValueError(
+                    "straight_mode='polygon' needs straights consisting of boxes "
+                    f"spanning their whole length. {straight.name} has {poly} on "
+                    f"layer {straight.kcl.layout.get_info(layer)}."
+                )
+            boxes.append((layer, box))
+    return _StraightTemplate(
+        cell=straight, length=length, boxes=boxes, port1=p1, port2=p2
+    )
+
+
+def _check_straight_port(
+    template: _StraightTemplate,
+    port: Port,
+    *,
+    allow_width_mismatch: bool,
+    allow_layer_mismatch: bool,
+    allow_type_mismatch: bool,
+) -> None:
+    """Check a drawn straight like connecting a straight instance to `port`."""
+    p = template.port1
+    if p.base.is_symmetric() != port.base.is_symmetric():
+        raise CrossSectionSymmetryMismatchError(p, port)
+    if p.width != port.width and not allow_width_mismatch:
+        raise PortWidthMismatchError(template.cell, port, p, port)
+    if p.layer != port.layer and not allow_layer_mismatch:
+        raise PortLayerMismatchError(template.cell.kcl, template.cell, port, p, port)
+    if p.port_type != port.port_type and not allow_type_mismatch:
+        raise PortTypeMismatchError(template.cell, port, p, port)
+
+
 def _place_straight(
     c: KCell,
     straight_factory: StraightFactoryDBU,
@@ -744,8 +855,36 @@ def _place_straight(
     allow_width_mismatch: bool,
     allow_layer_mismatch: bool,
     allow_type_mismatch: bool,
+    straight_templates: dict[int, _StraightTemplate] | None = None,
 ) -> tuple[Port, Port]:
     length = int((p1.trans.disp.to_p() - p2.trans.disp.to_p()).length())
+    if straight_templates is not None:
+        # draw the straight instead of placing an instance
+        template = straight_templates.get(w)
+        if template is None:
+            template = straight_templates[w] = _straight_template(
+                straight_factory, w, port_type
+            )
+        _check_straight_port(
+            template,
+            p1,
+            allow_width_mismatch=route_width is not None or allow_width_mismatch,
+            allow_layer_mismatch=allow_layer_mismatch,
+            allow_type_mismatch=allow_type_mismatch,
+        )
+        t = p1.trans * kdb.Trans.R180 * template.port1.trans.inverted()
+        for layer, box in template.boxes:
+            shape = t * kdb.Box(box.left, box.bottom, length, box.top)
+            inserted = c.shapes(layer).insert(shape)
+            if purpose:
+                inserted.set_property(PROPID.PURPOSE, purpose)
+            route.polygons.setdefault(c.kcl.layout.get_info(layer), []).append(
+                kdb.Polygon(shape)
+            )
+        route.length_straights += length
+        return template.port1.copy(t), template.port2.copy(
+            t * kdb.Trans(length - template.length, 0)
+        )
     wg = c << straight_factory(width=w, length=length)
     wg.purpose = purpose
     wg_p1, _ = (v for v in wg.ports if v.port_type == port_type)
@@ -840,6 +979,7 @@ def _place_tapered_straight(
     allow_width_mismatch: bool,
     allow_layer_mismatch: bool,
     allow_type_mismatch: bool,
+    straight_templates: dict[int, _StraightTemplate] | None = None,
 ) -> tuple[Port, Port]:
     taperp1, taperp2 = taper_ports
     length = int((p1.trans.disp.to_p() - p2.trans.disp.to_p()).length())
@@ -871,6 +1011,7 @@ def _place_tapered_straight(
         _place_straight(
             c=c,
             straight_factory=straight_factory,
+            straight_templates=straight_templates,
             purpose=purpose,
             w=taperp2.width,
             p1=p1_,
@@ -960,6 +1101,7 @@ def place_manhattan(
     allow_layer_mismatch: bool | None = None,
     allow_type_mismatch: bool | None = None,
     purpose: str | None = "routing",
+    straight_mode: Literal["instance", "polygon"] = "instance",
     **kwargs: Any,
 ) -> ManhattanRoute:
     # configure and set up route and placers
@@ -979,6 +1121,9 @@ def place_manhattan(
             "place_manhattan needs to have a straight_factory set. Please pass a "
             "straight_factory which takes kwargs 'width: int' and 'length: int'."
         )
+    straight_templates: dict[int, _StraightTemplate] | None = (
+        {} if straight_mode == "polygon" else None
+    )
     if bend90_cell is None:
         raise ValueError(
             "place_manhattan needs to be passed a fixed bend90 cell with two optical"
@@ -1098,6 +1243,7 @@ def place_manhattan(
             p1_, p2_ = _place_straight(
                 c=c,
                 straight_factory=straight_factory,
+                straight_templates=straight_templates,
                 purpose=purpose,
                 w=w,
                 route=route,
@@ -1113,6 +1259,7 @@ def place_manhattan(
             p1_, p2_ = _place_tapered_straight(
                 c=c,
                 straight_factory=straight_factory,
+                straight_templates=straight_templates,
                 purpose=purpose,
                 taper_ports=(taperp1, taperp2),
                 route=route,
@@ -1182,6 +1329,7 @@ def place_manhattan(
                 p1_, _ = _place_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     purpose=purpose,
                     w=w,
                     route=route,
@@ -1197,6 +1345,7 @@ def place_manhattan(
                 p1_, _ = _place_tapered_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     taper_cell=taper_cell,
                     purpose=purpose,
                     route=route,
@@ -1225,6 +1374,7 @@ def place_manhattan(
             _, p2_ = _place_straight(
                 c=c,
                 straight_factory=straight_factory,
+                straight_templates=straight_templates,
                 purpose=purpose,
                 w=w,
                 route=route,
@@ -1240,6 +1390,7 @@ def place_manhattan(
             _, p2_ = _place_tapered_straight(
                 c=c,
                 straight_factory=straight_factory,
+                straight_templates=straight_templates,
                 taper_cell=taper_cell,
                 purpose=purpose,
                 route=route,
@@ -1278,6 +1429,7 @@ def place_manhattan_with_sbends(
     purpose: str | None = "routing",
     *,
     sbend_factory: SBendFactoryDBU | None = None,
+    straight_mode: Literal["instance", "polygon"] = "instance",
     **kwargs: Any,
 ) -> ManhattanRoute:
     # configure and set up route and placers
@@ -1297,6 +1449,9 @@ def place_manhattan_with_sbends(
             "place_manhattan_with_sbends needs to have a straight_factory set. Please "
             "pass a straight_factory which takes kwargs 'width: int' and 'length: int'."
         )
+    straight_templates: dict[int, _StraightTemplate] | None = (
+        {} if straight_mode == "polygon" else None
+    )
     if bend90_cell is None:
         raise ValueError(
             "place_manhattan_with_sbends needs to be passed a fixed bend90 cell with "
@@ -1422,6 +1577,7 @@ def place_manhattan_with_sbends(
                 _place_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     purpose=purpose,
                     w=w,
                     route=route,
@@ -1437,6 +1593,7 @@ def place_manhattan_with_sbends(
                 _place_tapered_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     purpose=purpose,
                     taper_ports=(taperp1, taperp2),
                     route=route,
@@ -1500,6 +1657,7 @@ def place_manhattan_with_sbends(
                     _, p2_ = _place_straight(
                         c=c,
                         straight_factory=straight_factory,
+                        straight_templates=straight_templates,
                         purpose=purpose,
                         w=w,
                         route=route,
@@ -1515,6 +1673,7 @@ def place_manhattan_with_sbends(
                     _, p2_ = _place_tapered_straight(
                         c=c,
                         straight_factory=straight_factory,
+                        straight_templates=straight_templates,
                         taper_cell=taper_cell,
                         purpose=purpose,
                         route=route,
@@ -1574,6 +1733,7 @@ def place_manhattan_with_sbends(
                 p1_, p2_ = _place_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     purpose=purpose,
                     w=w,
                     route=route,
@@ -1589,6 +1749,7 @@ def place_manhattan_with_sbends(
                 p1_, p2_ = _place_tapered_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     taper_cell=taper_cell,
                     purpose=purpose,
                     route=route,
@@ -1635,6 +1796,7 @@ def place_manhattan_with_sbends(
                 _, p2_ = _place_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     purpose=purpose,
                     w=w,
                     route=route,
@@ -1650,6 +1812,7 @@ def place_manhattan_with_sbends(
                 _, p2_ = _place_tapered_straight(
                     c=c,
                     straight_factory=straight_factory,
+                    straight_templates=straight_templates,
                     taper_cell=taper_cell,
                     purpose=purpose,
                     route=route,
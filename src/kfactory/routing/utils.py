@@ -1,11 +1,21 @@
 import contextlib
-from typing import Any
+import json
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
 
 from pydantic import BaseModel, Field
 
 from .. import kdb
 from ..typings import DShapeLike, MarkerConfig
 
+if TYPE_CHECKING:
+    from ..layout import KCLayout
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
 default_fanin_color = 0x19B058
 default_waypoints_color = 0xB07419
 default_fanout_color = 0x1921B0
@@ -51,12 +61,76 @@ class RouteDebug(BaseModel, arbitrary_types_allowed=True):
             vertex_size=1,
         )
     )
+    timings: dict[str, float] = Field(default_factory=dict)
+    """Accumulated wall time in seconds of each routing stage."""
+    counters: dict[str, int] = Field(default_factory=dict)
+    """Counts of routing events, e.g. number of calls of each stage."""
 
     def model_post_init(self, context: Any) -> None:
         self.fan_in_region.merged_semantics = False
         self.fan_out_region.merged_semantics = False
         self.waypoints_region.merged_semantics = False
 
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a routing stage.
+
+        The time is added to `timings[name]` and `counters[name]` is increased by
+        one. Stages can be nested, the time of an inner stage is also part of the
+        outer one.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+            self.count(name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increase the counter `name` by `n`."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, name: str, func: Callable[P, T]) -> Callable[P, T]:
+        """Wrap a function to time each of its calls as stage `name`."""
+
+        def timed(*args: P.args, **kwargs: P.kwargs) -> T:
+            with self.stage(name):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def counted_factory(
+        self, name: str, factory: Callable[P, T], kcl: "KCLayout"
+    ) -> Callable[P, T]:
+        """Wrap a cell factory to time its calls and count cache hits.
+
+        A call which doesn't create a new cell in `kcl` counts as cache hit
+        (`counters[f"{name}_cache_hits"]`).
+        """
+
+        def counted(*args: P.args, **kwargs: P.kwargs) -> T:
+            cells = kcl.layout.cells()
+            with self.stage(name):
+                result = factory(*args, **kwargs)
+            if kcl.layout.cells() == cells:
+                self.count(f"{name}_cache_hits")
+            return result
+
+        return counted
+
+    def to_json(self, path: str | Path | None = None) -> str:
+        """Export the timings and counters as JSON.
+
+        Args:
+            path: Also write the JSON to this file.
+        """
+        stats = json.dumps(
+            {"timings": self.timings, "counters": self.counters}, indent=2
+        )
+        if path is not None:
+            Path(path).write_text(stats)
+        return stats
+
     def to_dict(self) -> dict[str, str]:
         return {name: value.to_s() for name, value in iter(self)}
 
@@ -82,3 +156,12 @@ class RouteDebug(BaseModel, arbitrary_types_allowed=True):
                     marker_list.append((text, self.waypoints_marker_config))
 
         return marker_list
+
+
+def route_stage(
+    route_debug: RouteDebug | None, name: str
+) -> contextlib.AbstractContextManager[None]:
+    """[RouteDebug.stage][kfactory.routing.utils.RouteDebug.stage] or a no-op."""
+    if route_debug is None:
+        return contextlib.nullcontext()
+    return route_debug.stage(name)
@@ -969,24 +969,24 @@ class PathLengthMatch(Constraint):
         from klayout import rdb as _rdb
 
         all_routes = [r for name in self.route_names for r in routes.get(name, [])]
-        lengths = [r.length for r in all_routes] if all_routes else []
-        target = max(lengths) if lengths else 0
+        # the length function can be expensive, evaluate it once per route
+        lengths = [r.length for r in all_routes]
+        target = max(lengths, default=0)
 
         db = _rdb.ReportDatabase("PathLengthMatch Constraint Failure")
         cat = db.create_category("Length Mismatch")
         cell = db.create_cell(c.name)
-        for name in self.route_names:
-            for route in routes.get(name, []):
-                delta = target - route.length
-                if delta > self.tolerance and len(route.backbone) >= 2:
-                    item = db.create_item(cell, cat)
-                    item.add_value(
-                        kdb.DPath(
-                            [kdb.DPoint(p) * c.kcl.dbu for p in route.backbone],
-                            route.start_port.dwidth,
-                        ).polygon()
-                    )
-                    item.add_value(f"length={route.length}, delta={delta}")
+        for route, length in zip(all_routes, lengths, strict=True):
+            delta = target - length
+            if delta > self.tolerance and len(route.backbone) >= 2:
+                item = db.create_item(cell, cat)
+                item.add_value(
+                    kdb.DPath(
+                        [kdb.DPoint(p) * c.kcl.dbu for p in route.backbone],
+                        route.start_port.dwidth,
+                    ).polygon()
+                )
+                item.add_value(f"length={length}, delta={delta}")
         return db
 
 
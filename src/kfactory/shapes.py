@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from itertools import chain
+from typing import TYPE_CHECKING
 
 from . import kdb
-from .serialization import dshape_guard, ishape_guard
 
 if TYPE_CHECKING:
     from collections.abc import Iterator, Sequence
@@ -16,49 +16,94 @@ __all__ = ["VShapes"]
 
 
 class VShapes:
-    """Emulate `[klayout.db.Shapes][klayout.db.Shapes]`."""
+    """Emulate `[klayout.db.Shapes][klayout.db.Shapes]`.
+
+    All shapes are stored in um, grouped by category (polygons, paths, texts
+    and edges), so they can be transformed and converted to KLayout's integer
+    containers in bulk. Boxes, simple polygons and regions are stored as
+    polygons.
+
+    Like `kdb.Shapes`, iteration yields the shapes grouped by category (in the
+    order above) and an inserted region adds one shape per polygon to `size`.
+    """
 
     cell: VKCell
-    _shapes: list[ShapeLike]
-    _bbox: kdb.DBox
+    _polygons: list[kdb.DPolygon]
+    _paths: list[kdb.DPath]
+    _texts: list[kdb.DText]
+    _edges: list[kdb.DEdge]
+    _bbox: kdb.DBox | None
 
     def __init__(
         self, cell: VKCell, _shapes: Sequence[ShapeLike] | None = None
     ) -> None:
         """Initialize the shapes."""
         self.cell = cell
-        self._shapes = list(_shapes) if _shapes is not None else []
-        self._bbox = kdb.DBox()
+        self._polygons = []
+        self._paths = []
+        self._texts = []
+        self._edges = []
+        self._bbox = None
+        if _shapes is not None:
+            for shape in _shapes:
+                self.insert(shape)
 
     def insert(self, shape: ShapeLike) -> None:
         """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s insert'`."""
-        if (
-            isinstance(shape, kdb.Shape)
-            and shape.cell.layout().dbu != self.cell.kcl.dbu
+        dbu = self.cell.kcl.dbu
+        self._bbox = None
+        if isinstance(shape, kdb.Shape):
+            if shape.cell.layout().dbu != dbu:
+                raise ValueError
+            if shape.is_text():
+                self._texts.append(shape.dtext)
+            elif shape.is_path():
+                self._paths.append(shape.dpath)
+            elif shape.is_edge():
+                self._edges.append(shape.dedge)
+            elif shape.is_polygon() or shape.is_box() or shape.is_simple_polygon():
+                self._polygons.append(shape.dpolygon)
+            else:
+                raise TypeError(f"Cannot insert {shape!r} into VShapes.")
+            return
+        if isinstance(shape, kdb.Region):
+            self._polygons.extend(poly.to_dtype(dbu) for poly in shape.each())
+            return
+        if isinstance(
+            shape,
+            kdb.Polygon | kdb.SimplePolygon | kdb.Box | kdb.Path | kdb.Text | kdb.Edge,
         ):
-            raise ValueError
-        if isinstance(shape, kdb.Box):
-            shape = self.cell.kcl.to_um(shape)
-        if isinstance(shape, kdb.DBox):
-            shape = kdb.DPolygon(shape)
-        self._shapes.append(shape)
-        b = shape.bbox()
-        if isinstance(b, kdb.Box):
-            self._bbox += self.cell.kcl.to_um(b)
-        else:
-            self._bbox += b
+            shape = shape.to_dtype(dbu)
+        match shape:
+            case kdb.DPolygon():
+                self._polygons.append(shape)
+            case kdb.DBox() | kdb.DSimplePolygon():
+                self._polygons.append(kdb.DPolygon(shape))
+            case kdb.DPath():
+                self._paths.append(shape)
+            case kdb.DText():
+                self._texts.append(shape)
+            case kdb.DEdge():
+                self._edges.append(shape)
+            case _:
+                raise TypeError(f"Cannot insert {shape!r} into VShapes.")
 
     def bbox(self) -> kdb.DBox:
         """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s bbox'`."""
+        if self._bbox is None:
+            bbox = kdb.DBox()
+            for shape in self:
+                bbox += shape.bbox()
+            self._bbox = bbox
         return self._bbox.dup()
 
-    def __iter__(self) -> Iterator[ShapeLike]:
+    def __iter__(self) -> Iterator[DShapeLike]:
         """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s __iter__'`."""
-        yield from self._shapes
+        yield from chain(self._polygons, self._paths, self._texts, self._edges)
 
-    def each(self) -> Iterator[ShapeLike]:
+    def each(self) -> Iterator[DShapeLike]:
         """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s each'`."""
-        yield from self._shapes
+        yield from self
 
     def transform(
         self,
@@ -66,30 +111,47 @@ class VShapes:
         /,
     ) -> VShapes:
         """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s transform'`."""
-        new_shapes: list[DShapeLike] = []
         if isinstance(trans, kdb.Trans):
             trans = trans.to_dtype(self.cell.kcl.dbu)
         elif isinstance(trans, kdb.ICplxTrans):
             trans = trans.to_itrans(self.cell.kcl.dbu)
 
-        for shape in self._shapes:
-            if dshape_guard(shape):
-                new_shapes.append(shape.transformed(trans))
-            elif ishape_guard(shape):
-                if isinstance(shape, kdb.Region):
-                    new_shapes.extend(
-                        poly.to_dtype(self.cell.kcl.dbu).transformed(trans)
-                        for poly in shape.each()
-                    )
-                else:
-                    new_shapes.append(
-                        shape.to_dtype(self.cell.kcl.dbu).transformed(trans)
-                    )
-            else:
-                new_shapes.append(cast("kdb.Shape", shape).dpolygon.transform(trans))
-
-        return VShapes(cell=self.cell, _shapes=new_shapes)
+        shapes = VShapes(cell=self.cell)
+        shapes._polygons = [poly.transformed(trans) for poly in self._polygons]
+        shapes._paths = [path.transformed(trans) for path in self._paths]
+        shapes._texts = [text.transformed(trans) for text in self._texts]
+        shapes._edges = [edge.transformed(trans) for edge in self._edges]
+        return shapes
+
+    def to_region(self, trans: kdb.DCplxTrans, dbu: float) -> kdb.Region:
+        """Transform polygons and paths and convert them to one `kdb.Region`.
+
+        Args:
+            trans: Transformation applied to the shapes (in um).
+            dbu: Database unit of the target layout.
+        """
+        trans_ = kdb.VCplxTrans(1 / dbu) * trans
+        region = kdb.Region([poly.transformed(trans_) for poly in self._polygons])
+        if self._paths:
+            region.insert([path.polygon().transformed(trans_) for path in self._paths])
+        return region
+
+    def to_texts(self, trans: kdb.DCplxTrans, dbu: float) -> kdb.Texts:
+        """Transform the texts and convert them to `kdb.Texts`."""
+        trans_ = kdb.VCplxTrans(1 / dbu) * trans
+        return kdb.Texts([text.transformed(trans_) for text in self._texts])
+
+    def to_edges(self, trans: kdb.DCplxTrans, dbu: float) -> kdb.Edges:
+        """Transform the edges and convert them to `kdb.Edges`."""
+        trans_ = kdb.VCplxTrans(1 / dbu) * trans
+        return kdb.Edges([edge.transformed(trans_) for edge in self._edges])
+
+    def is_empty(self) -> bool:
+        """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s is_empty'`."""
+        return self.size() == 0
 
     def size(self) -> int:
         """Emulate `[klayout.db.Shapes][klayout.db.Shapes]'s size'`."""
-        return len(self._shapes)
+        return (
+            len(self._polygons) + len(self._paths) + len(self._texts) + len(self._edges)
+        )
@@ -3,46 +3,289 @@
 from __future__ import annotations
 
 import heapq
+from itertools import repeat
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from . import kdb
 
 if TYPE_CHECKING:
     from collections.abc import Iterator, Sequence
 
+    import numpy.typing as npt
+
+
+__all__ = [
+    "BoxIndex",
+    "collect_instance_region",
+    "interacting_edge_pairs",
+    "iter_overlapping_bbox_pairs",
+]
+
+_HILBERT_ORDER = 16
+
 
 def collect_instance_region(
     cell: Any,
     layer: int,
     inst: Any,
+    cache: dict[tuple[int, int], kdb.Region] | None = None,
 ) -> kdb.Region:
-    """Collect the actual geometry region for one instance on one layer."""
+    """Collect the actual geometry region for one instance on one layer.
+
+    The flattened region of the instantiated cell is built by KLayout in one
+    go and transformed for each (array) member of the instance.
+
+    Args:
+        cell: Parent cell of the instance.
+        layer: Layer index.
+        inst: The instance.
+        cache: Flattened cell regions by `(cell_index, layer)`. Pass the same
+            dict for all instances (and layers) of a check to flatten each
+            instantiated cell only once.
+    """
+    cache = {} if cache is None else cache
+    key = (inst.cell.cell_index(), layer)
+    cell_region = cache.get(key)
+    if cell_region is None:
+        cell_region = kdb.Region(inst.cell.kdb_cell.begin_shapes_rec(layer))
+        cache[key] = cell_region
+    if cell_region.is_empty():
+        return kdb.Region()
+    cell_inst = inst.instance.cell_inst
+    if cell_inst.size() == 1:
+        return cell_region.transformed(cell_inst.cplx_trans)
     region = kdb.Region()
-    shape_it = cell.begin_shapes_rec_overlapping(layer, inst.bbox(layer))
-    shape_it.select_cells([inst.cell.cell_index()])
-    shape_it.min_depth = 1
-    for _it in shape_it.each():
-        if _it.path()[0].inst() == inst.instance:
-            region.insert(_it.shape().polygon.transformed(_it.trans()))
+    for trans in cell_inst.each_cplx_trans():
+        region.insert(cell_region.transformed(trans))
     return region
 
 
+def _hilbert_index(
+    x: npt.NDArray[np.int64], y: npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    """Position of the (quantized) points along a Hilbert curve."""
+    n = 1 << _HILBERT_ORDER
+    x = x.copy()
+    y = y.copy()
+    d = np.zeros_like(x)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        rotate = ~ry
+        flip = rotate & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(rotate, y, x), np.where(rotate, x, y)
+        s >>= 1
+    return d
+
+
+def _expand(
+    starts: npt.NDArray[np.int64], ends: npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    """Concatenate the ranges `[start, end)`."""
+    counts = ends - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(counts.sum())
+
+
+def _overlaps(
+    a: npt.NDArray[np.float64], b: npt.NDArray[np.float64]
+) -> npt.NDArray[np.bool_]:
+    """Row-wise overlap test of `(left, bottom, right, top)` boxes.
+
+    Touching boxes overlap, like for `kdb.Box.overlaps`.
+    """
+    return (
+        (a[..., 0] <= b[..., 2])
+        & (b[..., 0] <= a[..., 2])
+        & (a[..., 1] <= b[..., 3])
+        & (b[..., 1] <= a[..., 3])
+    )
+
+
+def _distances(
+    boxes: npt.NDArray[np.float64], box: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Euclidean distance between each of `boxes` and `box` (0 if they overlap)."""
+    dx = np.maximum(0, np.maximum(boxes[:, 0] - box[2], box[0] - boxes[:, 2]))
+    dy = np.maximum(0, np.maximum(boxes[:, 1] - box[3], box[1] - boxes[:, 3]))
+    return np.hypot(dx, dy)
+
+
+class BoxIndex:
+    """Static packed R-tree over a list of boxes.
+
+    The boxes are sorted along a Hilbert curve of their centers and packed
+    bottom-up into nodes of `node_size` children. Every level of the tree is
+    stored as numpy arrays, so queries descend the tree one level at a time
+    instead of one node at a time.
+
+    Empty boxes are never reported. All results are indexes into the sequence
+    the index was built from.
+
+    Args:
+        boxes: The boxes to index.
+        node_size: Maximum number of children per node.
+    """
+
+    _boxes: npt.NDArray[np.float64]
+    _ids: npt.NDArray[np.int64]
+    _levels: list[tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]]
+
+    def __init__(
+        self, boxes: Sequence[kdb.Box | kdb.DBox], node_size: int = 16
+    ) -> None:
+        """Bulk-load the index."""
+        n = len(boxes)
+        coords = np.fromiter(
+            (c for b in boxes for c in (b.left, b.bottom, b.right, b.top)),
+            dtype=np.float64,
+            count=4 * n,
+        ).reshape(n, 4)
+        ids = np.flatnonzero(
+            np.fromiter((not b.empty() for b in boxes), dtype=bool, count=n)
+        )
+        if len(ids):
+            centers = (coords[ids, :2] + coords[ids, 2:]) / 2
+            lo = centers.min(axis=0)
+            span = np.maximum(centers.max(axis=0) - lo, 1)
+            q = ((centers - lo) / span * ((1 << _HILBERT_ORDER) - 1)).astype(np.int64)
+            ids = ids[np.argsort(_hilbert_index(q[:, 0], q[:, 1]), kind="stable")]
+        self._ids = ids
+        self._boxes = coords[ids]
+
+        # levels[i] = (node boxes, start of the children of each node + end)
+        self._levels = []
+        level_boxes = self._boxes
+        while len(level_boxes) > 1 or not self._levels:
+            starts = np.arange(0, len(level_boxes), node_size)
+            if len(level_boxes):
+                node_boxes = np.column_stack(
+                    (
+                        np.minimum.reduceat(level_boxes[:, 0], starts),
+                        np.minimum.reduceat(level_boxes[:, 1], starts),
+                        np.maximum.reduceat(level_boxes[:, 2], starts),
+                        np.maximum.reduceat(level_boxes[:, 3], starts),
+                    )
+                )
+            else:
+                node_boxes = np.empty((0, 4), dtype=np.float64)
+            self._levels.append((node_boxes, np.append(starts, len(level_boxes))))
+            level_boxes = node_boxes
+
+    def __len__(self) -> int:
+        """Number of indexed (non-empty) boxes."""
+        return len(self._ids)
+
+    @staticmethod
+    def _as_array(box: kdb.Box | kdb.DBox) -> npt.NDArray[np.float64]:
+        return np.array((box.left, box.bottom, box.right, box.top), dtype=np.float64)
+
+    def query(self, box: kdb.Box | kdb.DBox) -> list[int]:
+        """Indexes of all boxes overlapping or touching `box`, sorted."""
+        if box.empty() or not len(self):
+            return []
+        q = self._as_array(box)
+        nodes = np.arange(len(self._levels[-1][0]))
+        for node_boxes, bounds in reversed(self._levels):
+            nodes = nodes[_overlaps(node_boxes[nodes], q)]
+            nodes = _expand(bounds[nodes], bounds[nodes + 1])
+        nodes = nodes[_overlaps(self._boxes[nodes], q)]
+        return np.sort(self._ids[nodes]).tolist()
+
+    def overlapping_pairs(self) -> npt.NDArray[np.int64]:
+        """All pairs `(i, j)` with `i < j` of overlapping or touching boxes.
+
+        The tree is joined with itself level by level, so only children of
+        overlapping nodes are compared.
+
+        Returns:
+            Array of shape `(n, 2)`, sorted lexicographically.
+        """
+        if not len(self):
+            return np.empty((0, 2), dtype=np.int64)
+        a = b = np.zeros(1, dtype=np.int64)
+        for node_boxes, bounds in reversed(self._levels):
+            keep = _overlaps(node_boxes[a], node_boxes[b])
+            a, b = a[keep], b[keep]
+            a_start, b_start = bounds[a], bounds[b]
+            na, nb = bounds[a + 1] - a_start, bounds[b + 1] - b_start
+            counts = na * nb
+            k = _expand(np.zeros_like(counts), counts)
+            nb_ = np.repeat(nb, counts)
+            a = np.repeat(a_start, counts) + k // nb_
+            b = np.repeat(b_start, counts) + k % nb_
+            keep = a <= b
+            a, b = a[keep], b[keep]
+        keep = (a < b) & _overlaps(self._boxes[a], self._boxes[b])
+        pairs = np.sort(np.column_stack((self._ids[a[keep]], self._ids[b[keep]])))
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def nearest(self, box: kdb.Box | kdb.DBox, k: int = 1) -> list[int]:
+        """Indexes of the `k` boxes closest to `box`, closest first.
+
+        Distances are euclidean distances between the boxes, overlapping boxes
+        have distance 0. Ties are broken by index.
+        """
+        if not len(self) or k < 1:
+            return []
+        q = self._as_array(box)
+        # (distance, is_item, item id or node, level); nodes sort before items
+        # at the same distance, so ties are broken by the item ids.
+        top_boxes = self._levels[-1][0]
+        heap: list[tuple[float, int, int, int]] = [
+            (dist, 0, node, len(self._levels) - 1)
+            for node, dist in enumerate(_distances(top_boxes, q).tolist())
+        ]
+        heapq.heapify(heap)
+        result: list[int] = []
+        while heap and len(result) < k:
+            _, is_item, node, level = heapq.heappop(heap)
+            if is_item:
+                result.append(node)
+                continue
+            bounds = self._levels[level][1]
+            children = np.arange(bounds[node], bounds[node + 1])
+            if level:
+                child_boxes = self._levels[level - 1][0][children]
+                entries = zip(children.tolist(), repeat(0), repeat(level - 1))
+            else:
+                child_boxes = self._boxes[children]
+                entries = zip(self._ids[children].tolist(), repeat(1), repeat(-1))
+            for dist, (child, child_is_item, child_level) in zip(
+                _distances(child_boxes, q).tolist(), entries, strict=False
+            ):
+                heapq.heappush(heap, (dist, child_is_item, child, child_level))
+        return result
+
+
 def iter_overlapping_bbox_pairs(
     boxes: Sequence[kdb.Box],
 ) -> Iterator[tuple[int, int]]:
     """Yield index pairs whose bounding boxes overlap."""
-    ordered = sorted(enumerate(boxes), key=lambda item: (item[1].left, item[1].bottom))
-    active: dict[int, kdb.Box] = {}
-    active_rights: list[tuple[int, int]] = []
+    for i, j in BoxIndex(boxes).overlapping_pairs().tolist():
+        yield j, i
+
 
-    for idx, bbox in ordered:
-        while active_rights and active_rights[0][0] < bbox.left:
-            _, old_idx = heapq.heappop(active_rights)
-            active.pop(old_idx, None)
+def interacting_edge_pairs(edges: Sequence[kdb.Edge]) -> list[tuple[int, int]]:
+    """All pairs `(i, j)` with `i < j` of edges which touch or cross each other.
 
-        for other_idx, other_bbox in active.items():
-            if not (other_bbox & bbox).empty():
-                yield idx, other_idx
+    Candidates are found with a [BoxIndex][kfactory.spatial.BoxIndex] of the edge
+    bboxes. For two axis-aligned edges overlapping bboxes already mean that the
+    edges interact, only other pairs are checked with `kdb.Edge.intersects`.
 
-        active[idx] = bbox
-        heapq.heappush(active_rights, (bbox.right, idx))
+    Returns:
+        The pairs, sorted.
+    """
+    pairs = BoxIndex([e.bbox() for e in edges]).overlapping_pairs().tolist()
+    manhattan = [e.dx() == 0 or e.dy() == 0 for e in edges]
+    return [
+        (i, j)
+        for i, j in pairs
+        if (manhattan[i] and manhattan[j]) or edges[i].intersects(edges[j])
+    ]
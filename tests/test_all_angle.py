@@ -1,6 +1,9 @@
+import gc
+import weakref
 from functools import partial
 
 import numpy as np
+import pytest
 
 import kfactory as kf
 from tests.conftest import Layers
@@ -69,3 +72,40 @@ def test_all_angle_bundle(
         straight_factory=sf,
         bend_factory=bf,
     )
+
+
+def test_effective_radius_table(layers: Layers, kcl: kf.KCLayout) -> None:
+    _p0 = kf.kdb.DPoint(0, 0)
+    _p1 = kf.kdb.DPoint(1, 0)
+    for factory in (
+        kf.factories.virtual.euler.virtual_bend_euler_factory,
+        kf.factories.virtual.circular.virtual_bend_circular_factory,
+    ):
+        bf = partial(factory(kcl=kcl), layer=layers.WG, radius=10)
+        for angle in (2.5, 17.3, 45, 90, 133.7, 179):
+            bend = bf(width=1, angle=angle)
+            radius = kf.routing.aa.optical._get_effective_radius(
+                bend.ports["o1"], bend.ports["o2"], _p0, _p1
+            )
+            assert kf.routing.aa.optical._effective_radius(
+                bf, 1, ("o1", "o2"), angle
+            ) == pytest.approx(radius, rel=1e-5)
+        for angle in (0, 180, -1):
+            with pytest.raises(ValueError, match="between 0 and 180"):
+                kf.routing.aa.optical._effective_radius(bf, 1, ("o1", "o2"), angle)
+
+
+def test_effective_radius_table_releases_factory(
+    layers: Layers, kcl: kf.KCLayout
+) -> None:
+    bf = partial(
+        kf.factories.virtual.euler.virtual_bend_euler_factory(kcl=kcl),
+        layer=layers.WG,
+        radius=10,
+    )
+    table = kf.routing.aa.optical._effective_radius_table(bf, 1, ("o1", "o2"))
+    assert kf.routing.aa.optical._effective_radius_table(bf, 1, ("o1", "o2")) is table
+    ref = weakref.ref(bf)
+    del bf
+    gc.collect()
+    assert ref() is None
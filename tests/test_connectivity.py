@@ -1,6 +1,8 @@
 import pathlib
+from collections.abc import Callable
 
 import kfactory as kf
+from tests.conftest import Layers
 
 
 def test_connectivity_cell_ports() -> None:
@@ -155,3 +157,154 @@ def test_port_mismatch_check_toggle_width() -> None:
     assert typ.num_items() == 1
 
     kf.layout.kcls.pop(cell.kcl.name)
+
+
+def _report_items(
+    rdb: kf.rdb.ReportDatabase,
+) -> list[tuple[str, str, list[str]]]:
+    return [
+        (
+            rdb.cell_by_id(item.cell_id()).qname(),
+            rdb.category_by_id(item.category_id()).path(),
+            [value.to_s() for value in item.each_value()],
+        )
+        for item in rdb.each_item()
+    ]
+
+
+def test_connectivity_check_parallel(
+    kcl: kf.KCLayout, straight_factory: Callable[..., kf.KCell]
+) -> None:
+    top = kcl.kcell("parallel_check_top")
+    for i in range(4):
+        c = kcl.kcell(f"parallel_check_{i}")
+        s1 = c << straight_factory(width=0.5, length=10 + i)
+        s2 = c << straight_factory(width=0.5 + i * 0.1, length=5)
+        s2.connect("o1", s1, "o2", allow_width_mismatch=True)
+        s3 = c << straight_factory(width=0.5, length=3)
+        s3.dmove((1, 0))
+        c.add_port(port=s1.ports["o1"])
+        top << c
+
+    serial = top.connectivity_check(add_cell_ports=True)
+    parallel = top.connectivity_check(add_cell_ports=True, max_workers=2)
+    assert serial.num_items() > 0
+    assert _report_items(parallel) == _report_items(serial)
+
+    cache = kf.checks.CheckCache()
+    cached = top.connectivity_check(add_cell_ports=True, max_workers=2, cache=cache)
+    assert _report_items(cached) == _report_items(serial)
+    assert cache.misses == len(cache) > 0
+    misses = cache.misses
+    top.connectivity_check(add_cell_ports=True, max_workers=2, cache=cache)
+    assert (cache.hits, cache.misses) == (misses, misses)
+
+    dangling = kf.checks.dangling_ports_check(top)
+    assert _report_items(
+        kf.checks.dangling_ports_check(top, max_workers=2)
+    ) == _report_items(dangling)
+
+
+def test_connectivity_check_cache(
+    kcl: kf.KCLayout,
+    straight_factory: Callable[..., kf.KCell],
+    tmp_path: pathlib.Path,
+) -> None:
+    top = kcl.kcell("cached_check_top")
+    s1 = top << straight_factory(width=0.5, length=10)
+    s2 = top << straight_factory(width=0.6, length=5)
+    s2.connect("o1", s1, "o2", allow_width_mismatch=True)
+
+    cache = kf.checks.CheckCache()
+    reference = top.connectivity_check(add_cell_ports=True)
+    first = top.connectivity_check(add_cell_ports=True, cache=cache)
+    assert cache.hits == 0
+    misses = cache.misses
+    assert misses > 0
+    assert _report_items(first) == _report_items(reference)
+
+    cache.save(tmp_path / "check_cache.json")
+    loaded = kf.checks.CheckCache.load(tmp_path / "check_cache.json")
+    assert len(loaded) == len(cache)
+    second = top.connectivity_check(add_cell_ports=True, cache=loaded)
+    assert loaded.hits == misses
+    assert loaded.misses == 0
+    assert _report_items(second) == _report_items(reference)
+
+    s3 = top << straight_factory(width=0.5, length=3)
+    s3.connect("o1", s2, "o2", allow_width_mismatch=True)
+    third = top.connectivity_check(add_cell_ports=True, cache=loaded)
+    assert 0 < loaded.misses < misses
+    assert _report_items(third) == _report_items(
+        top.connectivity_check(add_cell_ports=True)
+    )
+
+
+def test_check_cache_fingerprint_unlock(kcl: kf.KCLayout, layers: Layers) -> None:
+    cache = kf.checks.CheckCache()
+    c = kcl.kcell("fingerprint_unlock")
+    c.shapes(layers.WG).insert(kf.kdb.Box(1000))
+    c.lock()
+    locked = cache.fingerprint(c)
+    assert cache.fingerprint(c) == locked
+
+    c.locked = False
+    c.shapes(layers.WG).insert(kf.kdb.Box(2000))
+    c.lock()
+    edited = cache.fingerprint(c)
+    assert edited != locked
+
+    # unlocked behind kfactory's back, the memo must not be used
+    c.kdb_cell.locked = False
+    c.shapes(layers.WGCLAD).insert(kf.kdb.Text("a", kf.kdb.Trans()))
+    assert cache.fingerprint(c) != edited
+
+
+def test_check_cache_fingerprint_unlocked_child(
+    kcl: kf.KCLayout, layers: Layers
+) -> None:
+    cache = kf.checks.CheckCache()
+    child = kcl.kcell("fingerprint_child")
+    child.shapes(layers.WG).insert(kf.kdb.Box(1000))
+    parent = kcl.kcell("fingerprint_parent")
+    parent << child
+    parent.lock()
+    before = cache.fingerprint(parent)
+
+    child.shapes(layers.WG).insert(kf.kdb.Box(2000))
+    assert cache.fingerprint(parent) != before
+
+
+def test_connectivity_check_report_sinks(
+    kcl: kf.KCLayout,
+    straight_factory: Callable[..., kf.KCell],
+    tmp_path: pathlib.Path,
+) -> None:
+    top = kcl.kcell("sink_check_top")
+    s1 = top << straight_factory(width=0.5, length=10)
+    s2 = top << straight_factory(width=0.6, length=5)
+    s2.connect("o1", s1, "o2", allow_width_mismatch=True)
+    s3 = top << straight_factory(width=0.5, length=3)
+    s3.dmove((1, 0))
+
+    reference = top.connectivity_check(add_cell_ports=True)
+
+    with kf.checks.StreamingReport(tmp_path / "report.lyrdb") as stream:
+        assert top.connectivity_check(add_cell_ports=True, db=stream) is stream
+    assert stream.num_items() == reference.num_items()
+    streamed = kf.rdb.ReportDatabase()
+    streamed.load(str(tmp_path / "report.lyrdb"))
+    assert _report_items(streamed) == _report_items(reference)
+    assert not (tmp_path / "report.lyrdb.items").exists()
+
+    summary = top.connectivity_check(
+        add_cell_ports=True,
+        db=kf.checks.SummaryReport(max_samples=1),
+    )
+    assert summary.num_items() == reference.num_items()
+    expected: dict[str, int] = {}
+    for _, category, _ in _report_items(reference):
+        expected[category] = expected.get(category, 0) + 1
+    summary_dict = summary.to_dict()
+    assert {cat: v["count"] for cat, v in summary_dict.items()} == expected
+    assert all(len(v["samples"]) == 1 for v in summary_dict.values())
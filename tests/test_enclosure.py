@@ -1,6 +1,9 @@
+from typing import Any
+
 import pytest
 
 import kfactory as kf
+from kfactory.enclosure import Section, _minkowski_tiled_script
 from tests.conftest import Layers
 
 
@@ -178,6 +181,324 @@ def test_pdkenclosure(layers: Layers, straight_blank: kf.KCell) -> None:
     ).is_empty()
 
 
+def test_minkowski_tiled_script_shares_distances() -> None:
+    script = _minkowski_tiled_script(
+        [
+            ("ref", "out1", [Section(d_max=2000)]),
+            ("ref", "out2", [Section(d_min=1000, d_max=2000)]),
+            ("ref", "out3", [Section(d_min=-1000, d_max=1000)]),
+        ],
+        2000,
+        64,
+    )
+    # 2000, 1000 and -1000 are each calculated once and share the 1000 circle
+    assert script.count("minkowski_sum") == 3
+    assert script.count("Polygon.ellipse") == 2
+    assert script.count("_output") == 3
+
+
+def test_apply_minkowski_tiled(layers: Layers, kcl: kf.KCLayout) -> None:
+    c = kcl.kcell("APPLY_MINKOWSKI_TILED")
+    c.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(-10_000, -6_000, 10_000, 6_000))
+    c.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(10_000, -250, 30_000, 250))
+    enc = kf.LayerEnclosure(
+        [
+            (layers.WGCLAD, 2000),
+            (layers.WGEX, 1000, 2000),
+            (layers.WGCLADEX, -1000, 1000),
+        ],
+        main_layer=layers.WG,
+    )
+    enc.apply_minkowski_tiled(c, tile_size=25)
+
+    ref = kf.kdb.Region(c.shapes(kcl.layer(layers.WG)))
+
+    def grown(d: int) -> kf.kdb.Region:
+        return ref.minkowski_sum(kf.kdb.Polygon.ellipse(kf.kdb.Box(2 * d, 2 * d), 64))
+
+    shrunk = ref - (kf.kdb.Region(ref.bbox().enlarged(2000)) - ref).minkowski_sum(
+        kf.kdb.Polygon.ellipse(kf.kdb.Box(2000, 2000), 64)
+    )
+    for layer, expected in [
+        (layers.WGCLAD, grown(2000)),
+        (layers.WGEX, grown(2000) - grown(1000)),
+        (layers.WGCLADEX, grown(1000) - shrunk),
+    ]:
+        region = kf.kdb.Region(c.shapes(kcl.layer(layer)))
+        assert not region.is_empty()
+        assert (region ^ expected).is_empty()
+
+
+def test_apply_minkowski_tiled_sizing_mode(layers: Layers, kcl: kf.KCLayout) -> None:
+    c = kcl.kcell("APPLY_MINKOWSKI_TILED_SIZING_MODE")
+    c.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(-10_000, -6_000, 10_000, 6_000))
+    enc = kf.LayerEnclosure(
+        [(layers.WGCLAD, 2000), (layers.WGEX, -1000, 1000)], main_layer=layers.WG
+    )
+    enc.apply_minkowski_tiled(c, tile_size=25, sizing_mode=2)
+
+    ref = kf.kdb.Region(c.shapes(kcl.layer(layers.WG)))
+    for layer, expected in [
+        (layers.WGCLAD, ref.sized(2000, 2)),
+        (layers.WGEX, ref.sized(1000, 2) - ref.sized(-1000, 2)),
+    ]:
+        assert (kf.kdb.Region(c.shapes(kcl.layer(layer))) ^ expected).is_empty()
+
+
+def _hierarchical_top(kcl: kf.KCLayout, name: str, child: kf.KCell) -> kf.KCell:
+    c = kcl.kcell(name)
+    c.shapes(kcl.layer(Layers().WG)).insert(kf.kdb.Box(-50_000, -50_000, 0, -49_000))
+    for trans in [
+        kf.kdb.Trans(0, 0),
+        kf.kdb.Trans(100_000, 0),
+        kf.kdb.Trans(101_000, 2_000),  # overlaps the previous one
+        kf.kdb.Trans(1, False, 300_000, 0),
+    ]:
+        (c << child).transform(trans)
+    c.create_inst(
+        child, a=kf.kdb.Vector(50_000, 0), b=kf.kdb.Vector(0, 50_000), na=3, nb=2
+    ).transform(kf.kdb.Trans(0, 200_000))
+    return c
+
+
+def test_apply_minkowski_tiled_negative_d_max(layers: Layers, kcl: kf.KCLayout) -> None:
+    sections = [(layers.WGEX, -2000, -1000), (layers.WGCLAD, -1000)]
+    cells = {}
+    for mode in ("tiled", "enc"):
+        c = kcl.kcell(f"APPLY_MINKOWSKI_NEGATIVE_D_MAX_{mode.upper()}")
+        c.shapes(kcl.layer(layers.WG)).insert(
+            kf.kdb.Box(-10_000, -6_000, 10_000, 6_000)
+        )
+        enc = kf.LayerEnclosure(sections, main_layer=layers.WG)
+        if mode == "tiled":
+            enc.apply_minkowski_tiled(c, tile_size=25)
+        else:
+            enc.apply_minkowski_enc(c, ref=layers.WG)
+        cells[mode] = c
+    # the reference is shrunk like in apply_minkowski_enc
+    assert kf.kdb.Region(
+        cells["tiled"].shapes(kcl.layer(layers.WGCLAD))
+    ).bbox() == kf.kdb.Box(-9_000, -5_000, 9_000, 5_000)
+    for layer in (layers.WGEX, layers.WGCLAD):
+        _assert_same_enclosure(kcl, cells["enc"], cells["tiled"], layer)
+
+
+def test_apply_minkowski_tiled_n_pts(layers: Layers, kcl: kf.KCLayout) -> None:
+    c = kcl.kcell("APPLY_MINKOWSKI_TILED_N_PTS")
+    c.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(-10_000, -6_000, 10_000, 6_000))
+    enc = kf.LayerEnclosure([(layers.WGEX, 1000, 2000)], main_layer=layers.WG)
+    enc.apply_minkowski_tiled(c, tile_size=25, n_pts=8)
+
+    ref = kf.kdb.Region(c.shapes(kcl.layer(layers.WG)))
+
+    def grown(d: int) -> kf.kdb.Region:
+        return ref.minkowski_sum(kf.kdb.Polygon.ellipse(kf.kdb.Box(2 * d, 2 * d), 8))
+
+    # both circles of the section use n_pts
+    assert (
+        kf.kdb.Region(c.shapes(kcl.layer(layers.WGEX))) ^ (grown(2000) - grown(1000))
+    ).is_empty()
+
+
+def test_kcell_enclosure_tiled_inputs_once(
+    layers: Layers, kcl: kf.KCLayout, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inputs: list[str] = []
+
+    class TilingProcessor(kf.kdb.TilingProcessor):
+        def input(self, name: str, *args: Any) -> None:
+            inputs.append(name)
+            super().input(name, *args)
+
+    monkeypatch.setattr(kf.kdb, "TilingProcessor", TilingProcessor)
+    c = kcl.kcell("KCELL_ENCLOSURE_TILED_INPUTS_ONCE")
+    c.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(-10_000, -6_000, 10_000, 6_000))
+    kf.KCellEnclosure(
+        enclosures=[
+            kf.LayerEnclosure([(layers.WGEX, 1000)], main_layer=layers.WG),
+            kf.LayerEnclosure([(layers.WGCLAD, 2000)], main_layer=layers.WG),
+        ]
+    ).apply_minkowski_tiled(c, tile_size=25)
+    assert inputs == [f"main_layer_{kcl.layer(layers.WG)}"]
+    assert not c.bbox(kcl.layer(layers.WGCLAD)).empty()
+
+
+def test_kcell_enclosure_tiled_shared_sections(
+    layers: Layers, kcl: kf.KCLayout
+) -> None:
+    c = kcl.kcell("KCELL_ENCLOSURE_TILED_SHARED_SECTIONS")
+    box = kf.kdb.Box(-10_000, -250, 10_000, 250)
+    c.shapes(kcl.layer(layers.WG)).insert(box)
+    c.create_port(
+        name="o1",
+        trans=kf.kdb.Trans(0, False, box.right, 0),
+        width=box.height(),
+        layer=kcl.layer(layers.WG),
+    )
+    kf.KCellEnclosure(
+        enclosures=[
+            kf.LayerEnclosure(
+                [(layers.WGEX, 1000), (layers.WGCLADEX, 1000)], main_layer=layers.WG
+            )
+        ]
+    ).apply_minkowski_tiled(c, tile_size=25, carve_out_ports=True)
+
+    hole = kf.kdb.Region(
+        kf.kdb.Box(0, -1250, 1250, 1250).transformed(c.ports["o1"].trans)
+    )
+    expected = (
+        kf.kdb.Region(box).minkowski_sum(
+            kf.kdb.Polygon.ellipse(kf.kdb.Box(2000, 2000), 64)
+        )
+        - hole
+    )
+    # both layers sharing the section get the enclosure
+    for layer in (layers.WGEX, layers.WGCLADEX):
+        assert (kf.kdb.Region(c.shapes(kcl.layer(layer))) ^ expected).is_empty()
+
+
+def _assert_same_enclosure(
+    kcl: kf.KCLayout, flat: kf.KCell, hier: kf.KCell, layer: kf.kdb.LayerInfo
+) -> None:
+    li = kcl.layer(layer)
+    assert not hier.bbox(li).empty()
+    assert (
+        kf.kdb.Region(flat.begin_shapes_rec(li))
+        ^ kf.kdb.Region(hier.begin_shapes_rec(li))
+    ).is_empty()
+
+
+@pytest.mark.parametrize(
+    "direction", [kf.enclosure.Direction.BOTH, kf.enclosure.Direction.X]
+)
+def test_apply_minkowski_hierarchical(
+    layers: Layers, kcl: kf.KCLayout, direction: kf.enclosure.Direction
+) -> None:
+    child = kcl.kcell(f"HIERARCHICAL_CHILD_{direction.name}")
+    child.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(0, 0, 10_000, 1_000))
+    enc = kf.LayerEnclosure(
+        [
+            (layers.WGCLAD, 2000),
+            (layers.WGEX, 1000, 3000),
+            (layers.WGEX, 4000, 5000),
+            (layers.WGCLADEX, -200, 0),
+        ],
+        main_layer=layers.WG,
+    )
+    flat = _hierarchical_top(kcl, f"HIERARCHICAL_FLAT_{direction.name}", child)
+    hier = _hierarchical_top(kcl, f"HIERARCHICAL_{direction.name}", child)
+    enc.apply_minkowski_enc(flat, layers.WG, direction)
+    enc.apply_minkowski_enc(hier, layers.WG, direction, hierarchical=True)
+
+    for layer in (layers.WGCLAD, layers.WGEX, layers.WGCLADEX):
+        _assert_same_enclosure(kcl, flat, hier, layer)
+    # the isolated instances and the array share one companion cell, the
+    # overlapping ones are enclosed flat, the rotated one only keeps a box
+    companions = [inst for inst in hier.insts if "_ENC_" in inst.cell.name]
+    assert len({inst.cell.cell_index() for inst in companions}) == 1
+    assert len(companions) == (3 if direction == kf.enclosure.Direction.BOTH else 2)
+
+
+def test_apply_minkowski_hierarchical_changed_child(
+    layers: Layers, kcl: kf.KCLayout
+) -> None:
+    """Companions of an earlier call aren't reused for a changed child."""
+    child = kcl.kcell("HIERARCHICAL_CHANGED_CHILD")
+    child.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(0, 0, 10_000, 1_000))
+    enc = kf.LayerEnclosure([(layers.WGCLAD, 2000)], main_layer=layers.WG)
+    first = kcl.kcell("HIERARCHICAL_CHANGED_FIRST")
+    first << child
+    enc.apply_minkowski_enc(first, layers.WG, hierarchical=True)
+
+    child.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(0, 0, 1_000, 10_000))
+    flat = kcl.kcell("HIERARCHICAL_CHANGED_FLAT")
+    flat << child
+    hier = kcl.kcell("HIERARCHICAL_CHANGED_HIER")
+    hier << child
+    enc.apply_minkowski_enc(flat, layers.WG)
+    enc.apply_minkowski_enc(hier, layers.WG, hierarchical=True)
+    _assert_same_enclosure(kcl, flat, hier, layers.WGCLAD)
+
+
+def test_apply_minkowski_hierarchical_array(layers: Layers, kcl: kf.KCLayout) -> None:
+    """An isolated array gets one companion array of the same size."""
+    child = kcl.kcell("HIERARCHICAL_ARRAY_CHILD")
+    child.shapes(kcl.layer(layers.WG)).insert(kf.kdb.Box(0, 0, 10_000, 1_000))
+    enc = kf.LayerEnclosure([(layers.WGCLAD, 2000)], main_layer=layers.WG)
+    tops = []
+    for name in ("HIERARCHICAL_ARRAY_FLAT", "HIERARCHICAL_ARRAY"):
+        c = kcl.kcell(name)
+        c.create_inst(
+            child, a=kf.kdb.Vector(20_000, 0), b=kf.kdb.Vector(0, 10_000), na=50, nb=40
+        )
+        # the elements of this one are within reach of each other
+        c.create_inst(
+            child, a=kf.kdb.Vector(12_000, 0), b=kf.kdb.Vector(0, 10_000), na=3, nb=2
+        ).transform(kf.kdb.Trans(0, -100_000))
+        tops.append(c)
+    flat, hier = tops
+    enc.apply_minkowski_enc(flat, layers.WG)
+    enc.apply_minkowski_enc(hier, layers.WG, hierarchical=True)
+
+    _assert_same_enclosure(kcl, flat, hier, layers.WGCLAD)
+    (companion,) = (inst for inst in hier.insts if "_ENC_" in inst.cell.name)
+    assert (companion.na, companion.nb) == (50, 40)
+
+
+def test_apply_minkowski_hierarchical_region_ref(
+    layers: Layers, kcl: kf.KCLayout
+) -> None:
+    enc = kf.LayerEnclosure([(layers.WGCLAD, 2000)], main_layer=layers.WG)
+    with pytest.raises(ValueError, match="layer as reference"):
+        enc.apply_minkowski_enc(
+            kcl.kcell("HIERARCHICAL_REGION_REF"), kf.kdb.Region(), hierarchical=True
+        )
+
+
+def test_enclosure_cache(layers: Layers, kcl: kf.KCLayout) -> None:
+    enc = kf.LayerEnclosure(
+        [(layers.WGCLAD, 2000), (layers.WGEX, 1000, 3000), (layers.WGEX, 4000, 5000)],
+        main_layer=layers.WG,
+    )
+    cache = kf.enclosure.EnclosureCache(maxsize=2)
+    cells = []
+    for i, offset in enumerate([0, 12_345, 0]):
+        c = kcl.kcell(f"ENCLOSURE_CACHE_{i}")
+        c.shapes(kcl.layer(layers.WG)).insert(
+            kf.kdb.Box(0, 0, 10_000, 500).moved(offset, offset)
+        )
+        c.shapes(kcl.layer(layers.WG)).insert(
+            kf.kdb.Box(0, 0, 500, 10_000).moved(offset, offset)
+        )
+        enc.apply_minkowski_enc(c, layers.WG, cache=cache)
+        cells.append(c)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # a hit is moved to the new reference geometry
+    ref = cells[1].dup()
+    for layer in (layers.WGCLAD, layers.WGEX):
+        ref.shapes(kcl.layer(layer)).clear()
+    enc.apply_minkowski_enc(ref, layers.WG)
+    for layer in (layers.WGCLAD, layers.WGEX):
+        li = kcl.layer(layer)
+        assert (
+            kf.kdb.Region(ref.shapes(li)) ^ kf.kdb.Region(cells[1].shapes(li))
+        ).is_empty()
+
+    # a KCellEnclosure of the same enclosure shares the results
+    kf.KCellEnclosure([enc]).apply_minkowski_enc(cells[0], cache=cache)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    # other shapes are misses, the least recently used result is dropped
+    for direction in (kf.enclosure.Direction.X, kf.enclosure.Direction.Y):
+        enc.apply_minkowski_enc(cells[0], layers.WG, direction, cache=cache)
+    assert len(cache) == 2
+    enc.apply_minkowski_enc(cells[0], layers.WG, cache=cache)
+    assert (cache.hits, cache.misses) == (3, 4)
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
 def test_extrude_path_cross_section_symmetric_matches_legacy(
     kcl: kf.KCLayout, layers: Layers
 ) -> None:
@@ -235,3 +556,22 @@ def test_extrude_path_cross_section_asymmetric(
     assert kf.kdb.Region(c.shapes(kcl.layer(layers.WGCLAD))).bbox() == kf.kdb.Box(
         0, -100, length_dbu, 900
     )
+
+
+def test_enclosure_cache_same_digest(layers: Layers, kcl: kf.KCLayout) -> None:
+    """Geometry with the same digest but other shapes isn't taken from the cache."""
+    enc = kf.LayerEnclosure([(layers.WGCLAD, 2000)], main_layer=layers.WG)
+    cache = kf.enclosure.EnclosureCache()
+    corners = [
+        [kf.kdb.Box(0, 0, 1000, 1000), kf.kdb.Box(9000, 9000, 10_000, 10_000)],
+        [kf.kdb.Box(0, 9000, 1000, 10_000), kf.kdb.Box(9000, 0, 10_000, 1000)],
+    ]
+    for i, boxes in enumerate(corners):
+        c = kcl.kcell(f"ENCLOSURE_CACHE_DIGEST_{i}")
+        ref = kf.kdb.Region(boxes)
+        c.shapes(kcl.layer(layers.WG)).insert(ref)
+        enc.apply_minkowski_enc(c, layers.WG, cache=cache)
+        assert (
+            kf.kdb.Region(c.shapes(kcl.layer(layers.WGCLAD))) ^ ref.sized(2000)
+        ).is_empty()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 2, 2)
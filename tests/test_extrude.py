@@ -1,7 +1,12 @@
 import numpy as np
+import pytest
 
 import kfactory as kf
-from kfactory.enclosure import extrude_path_dynamic
+from kfactory.enclosure import (
+    extrude_path_dynamic,
+    extrude_path_dynamic_points,
+    extrude_path_offsets,
+)
 from tests.conftest import Layers
 
 
@@ -73,3 +78,52 @@ def test_enc_extrude_static(layers: Layers, wg_enc: kf.LayerEnclosure) -> None:
     _width = [width + np.sin(x * np.pi / 2) for x in [_x / 20 for _x in range(21)]]
 
     enclosure.extrude_path_dynamic(c, path, layer, _width)
+
+
+def test_extrude_path_offsets() -> None:
+    path = np.array([[0, 0], [10, 0], [10, 10]])
+    top, bot = extrude_path_offsets(path, [1, -1])
+    # the corner point is offset along the diagonal between its neighbours
+    np.testing.assert_allclose(
+        top, [[0, 1], [10 - np.sqrt(0.5), np.sqrt(0.5)], [9, 10]], atol=1e-12
+    )
+    np.testing.assert_allclose(
+        bot, [[0, -1], [10 + np.sqrt(0.5), -np.sqrt(0.5)], [11, 10]], atol=1e-12
+    )
+
+    # one offset per point
+    (band,) = extrude_path_offsets(path, [[1, 2, 3]], start_angle=0, end_angle=90)
+    np.testing.assert_allclose(band[[0, 2]], [[0, 1], [7, 10]], atol=1e-12)
+
+
+def test_extrude_dynamic_vectorized(layers: Layers, wg_enc: kf.LayerEnclosure) -> None:
+    path = [kf.kdb.DPoint(x, np.sin(x / 5)) for x in range(41)]
+
+    def _width(x: float) -> float:
+        return float(1 + np.sin(x * np.pi / 2))
+
+    def _width_vectorized(x: np.ndarray) -> np.ndarray:
+        return 1 + np.sin(x * np.pi / 2)
+
+    kcl = kf.KCLayout("EXTRUDE_DYNAMIC_VECTORIZED", infos=Layers)
+    c_scalar = kcl.kcell("scalar")
+    c_vectorized = kcl.kcell("vectorized")
+    extrude_path_dynamic(c_scalar, layers.WG, path, _width, wg_enc)
+    extrude_path_dynamic(c_vectorized, layers.WG, path, _width_vectorized, wg_enc)
+
+    for layer in (layers.WG, layers.WGCLAD):
+        li = kcl.layer(layer)
+        assert not kf.kdb.Region(c_scalar.shapes(li)).is_empty()
+        assert (
+            kf.kdb.Region(c_scalar.shapes(li)) ^ kf.kdb.Region(c_vectorized.shapes(li))
+        ).is_empty()
+
+    top, bot = extrude_path_dynamic_points(path, _width_vectorized, start_angle=0)
+    assert len(top) == len(bot) == len(path)
+    assert top[0] == kf.kdb.DPoint(0, 0.5)
+
+
+def test_extrude_dynamic_widths_length_mismatch(layers: Layers) -> None:
+    path = [kf.kdb.DPoint(x, 0) for x in range(5)]
+    with pytest.raises(ValueError, match="5 points"):
+        extrude_path_dynamic_points(path, [1, 1, 1])
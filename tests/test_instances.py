@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 import kfactory as kf
 from tests.conftest import Layers
 
@@ -92,3 +95,92 @@ def test_to_dtype(kcl: kf.KCLayout) -> None:
     ref = dref.to_itype()
     assert ref.bbox() == kf.kdb.Box(-5000, -5000, 5000, 5000)
     assert isinstance(ref, kf.Instance)
+
+
+def test_instances_name_index(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell(name="test_instances_name_index")
+    s = kf.cells.straight.straight(width=0.5, length=1, layer=layers.WG)
+    refs = [c << s for _ in range(5)]
+    for i, ref in enumerate(refs):
+        ref.name = f"s{i}"
+    assert c.insts["s3"].instance == refs[3].instance
+
+    refs[3].name = "renamed"
+    assert "s3" not in c.insts
+    assert c.insts["renamed"].instance == refs[3].instance
+
+    del c.insts[refs[1]]
+    assert "s1" not in c.insts
+    assert "s2" in c.insts
+
+    # bypass kfactory, the index has to pick up the change
+    raw = c.kdb_cell.insert(kf.kdb.CellInstArray(refs[0].cell_index, kf.kdb.Trans()))
+    raw.set_property(kf.conf.PROPID.NAME, "raw")
+    assert c.insts["raw"].instance == raw
+
+    # renames through KLayout keep the instance count, misses are trusted until
+    # the index is rebuilt explicitly
+    refs[4].instance.set_property(kf.conf.PROPID.NAME, "kdb_renamed")
+    assert "kdb_renamed" not in c.insts
+    c.insts.reindex()
+    assert c.insts["kdb_renamed"].instance == refs[4].instance
+    # a stale hit is detected
+    refs[4].instance.set_property(kf.conf.PROPID.NAME, "s2")
+    assert "kdb_renamed" not in c.insts
+
+
+def test_instances_name_index_duplicates(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell(name="test_instances_name_index_duplicates")
+    s = kf.cells.straight.straight(width=0.5, length=1, layer=layers.WG)
+    ref1 = c << s
+    ref2 = c << s
+    ref1.name = "dup"
+    ref2.name = "dup"
+    assert c.insts["dup"].instance == ref1.instance
+    c.insts.remove(ref1)
+    assert c.insts["dup"].instance == ref2.instance
+
+
+def test_create_insts_lattice(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell(name="test_create_insts_lattice")
+    s = kcl.kcell(name="test_create_insts_lattice_child")
+    s.shapes(layers.WG).insert(kf.kdb.Box(100))
+    xs, ys = np.meshgrid(np.arange(4) * 1000, np.arange(3) * 500)
+    group = c.create_insts(s, np.c_[xs.ravel(), ys.ravel()])
+    assert isinstance(group, kf.InstanceGroup)
+    assert len(group.insts) == 1
+    inst = group.insts[0]
+    assert (inst.na, inst.nb) == (4, 3)
+    assert inst.a == kf.kdb.Vector(1000, 0)
+    assert inst.b == kf.kdb.Vector(0, 500)
+    assert c.ibbox() == kf.kdb.Box(-50, -50, 3050, 1050)
+
+
+def test_create_insts_irregular_named(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.dkcell(name="test_create_insts_irregular_named")
+    s = kcl.kcell(name="test_create_insts_irregular_named_child")
+    s.shapes(layers.WG).insert(kf.kdb.Box(100))
+    transforms = [kf.kdb.DTrans(0, False, 0, 0), kf.kdb.DTrans(1, False, 5, 2)]
+    group = c.create_insts(s, transforms, names=["a", "b"])
+    assert isinstance(group, kf.DInstanceGroup)
+    assert len(c.insts) == 2
+    assert c.insts["b"].dtrans == transforms[1]
+    with pytest.raises(ValueError, match="names"):
+        c.create_insts(s, transforms, names=["c"])
+
+
+def test_create_insts_irregular_view(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell(name="test_create_insts_irregular_view")
+    s = kcl.kcell(name="test_create_insts_irregular_view_child")
+    s.shapes(layers.WG).insert(kf.kdb.Box(100))
+    transforms = [kf.kdb.Trans(1, False, 0, 0), kf.kdb.Trans(1, False, 700, 300)]
+    group = c.create_insts(s, transforms)
+    assert isinstance(group.insts, kf.instance_group.InstanceView)
+    assert len(group.insts) == len(c.insts) == 2
+    assert [inst.trans for inst in group] == transforms
+    assert group.insts[-1].trans == transforms[-1]
+    group.add(c.create_inst(s, kf.kdb.Trans(900, 0)))
+    assert len(group.insts) == 3
+    assert isinstance(group.insts[2], kf.Instance)
+    group.transform(kf.kdb.Trans(0, 1000))
+    assert c.insts[0].trans == kf.kdb.Trans(1, False, 0, 1000)
@@ -90,6 +90,94 @@ def test_place_straight_basic(
     assert route.length_straights == 50_000
 
 
+def test_place_straight_polygon(
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+    layers: Layers,
+) -> None:
+    c = kcl.kcell("place_straight_polygon")
+    p1 = _make_o_port(kcl, layers, "p1", 0, 0, 0)
+    p2 = _make_o_port(kcl, layers, "p2", 2, 50_000, 0)
+    route = ManhattanRoute(
+        backbone=[],
+        start_port=p1,
+        end_port=p2,
+        instances=[],
+    )
+    new_p1, new_p2 = _place_straight(
+        c=c,
+        straight_factory=straight_factory_dbu,
+        purpose=None,
+        w=500,
+        route=route,
+        p1=p1,
+        p2=p2,
+        route_width=None,
+        port_type="optical",
+        allow_width_mismatch=False,
+        allow_layer_mismatch=False,
+        allow_type_mismatch=False,
+        straight_templates={},
+    )
+    assert not route.instances
+    assert route.length_straights == 50_000
+    assert route.polygons[layers.WG] == [
+        kf.kdb.Polygon(kf.kdb.Box(0, -250, 50_000, 250))
+    ]
+    assert new_p1.trans == kf.kdb.Trans.R180
+    assert new_p2.trans == kf.kdb.Trans(50_000, 0)
+    assert c.bbox(kcl.layer(layers.WGCLAD)) == kf.kdb.Box(0, -2250, 50_000, 2250)
+
+
+def test_place_straight_polygon_not_a_box(
+    kcl: kf.KCLayout,
+    layers: Layers,
+) -> None:
+    def straight_factory(width: int, length: int) -> kf.KCell:
+        c = kcl.kcell(f"tapered_{width}_{length}")
+        c.shapes(kcl.layer(layers.WG)).insert(
+            kf.kdb.Polygon(
+                [
+                    kf.kdb.Point(0, -width // 2),
+                    kf.kdb.Point(length, -width),
+                    kf.kdb.Point(length, width),
+                    kf.kdb.Point(0, width // 2),
+                ]
+            )
+        )
+        c.create_port(
+            name="o1", trans=kf.kdb.Trans.R180, width=width, layer_info=layers.WG
+        )
+        c.create_port(
+            name="o2",
+            trans=kf.kdb.Trans(length, 0),
+            width=2 * width,
+            layer_info=layers.WG,
+        )
+        return c
+
+    c = kcl.kcell("place_straight_polygon_not_a_box")
+    p1 = _make_o_port(kcl, layers, "p1", 0, 0, 0)
+    p2 = _make_o_port(kcl, layers, "p2", 2, 50_000, 0)
+    route = ManhattanRoute(backbone=[], start_port=p1, end_port=p2, instances=[])
+    with pytest.raises(ValueError, match="consisting of boxes"):
+        _place_straight(
+            c=c,
+            straight_factory=straight_factory,
+            purpose=None,
+            w=500,
+            route=route,
+            p1=p1,
+            p2=p2,
+            route_width=None,
+            port_type="optical",
+            allow_width_mismatch=False,
+            allow_layer_mismatch=False,
+            allow_type_mismatch=False,
+            straight_templates={},
+        )
+
+
 # _place_tapered_straight
 
 
@@ -1,3 +1,5 @@
+import itertools
+import tracemalloc
 from collections.abc import Callable, Sequence
 from functools import partial
 from typing import Any
@@ -154,6 +156,99 @@ def test_route_bundle(
     oas_regression(c)
 
 
+def test_route_bundle_straight_mode_polygon(
+    optical_port: kf.Port,
+    bend90_euler: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+) -> None:
+    p_start = [
+        optical_port.copy(kf.kdb.Trans(1, False, i * 20_000, 0)) for i in range(5)
+    ]
+    p_end = [
+        optical_port.copy(kf.kdb.Trans(2, False, 400_000, 240_000 - i * 10_000))
+        for i in range(5)
+    ]
+    get_length_from_area = kf.routing.length_functions.get_length_from_area()
+    cells = {}
+    lengths = {}
+    for mode in ("instance", "polygon"):
+        c = kcl.kcell(f"TEST_ROUTE_BUNDLE_STRAIGHT_MODE_{mode.upper()}")
+        routes = kf.routing.optical.route_bundle(
+            c,
+            p_start,
+            p_end,
+            5_000,
+            straight_factory=straight_factory_dbu,
+            bend90_cell=bend90_euler,
+            on_collision="error",
+            straight_mode=mode,
+        )
+        cells[mode] = c
+        lengths[mode] = [
+            (route.length, get_length_from_area(route)) for route in routes
+        ]
+
+    assert lengths["polygon"] == lengths["instance"]
+    polygon_cell = cells["polygon"]
+    # only the bends are instances
+    assert all(inst.cell.name == bend90_euler.name for inst in polygon_cell.insts)
+    assert len(polygon_cell.insts) < len(cells["instance"].insts)
+    for layer in kcl.layer_indexes():
+        assert (
+            kf.kdb.Region(polygon_cell.begin_shapes_rec(layer))
+            ^ kf.kdb.Region(cells["instance"].begin_shapes_rec(layer))
+        ).is_empty()
+
+
+def test_route_bundle_straight_mode_polygon_checks(
+    optical_port: kf.Port,
+    bend90_euler: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+    layers: Layers,
+) -> None:
+    start = optical_port.copy(kf.kdb.Trans(0, False, 0, 0))
+    end = optical_port.copy(kf.kdb.Trans(2, False, 100_000, 0))
+    for mode in ("instance", "polygon"):
+        c = kcl.kcell(f"TEST_ROUTE_STRAIGHT_MODE_CHECKS_{mode.upper()}")
+        wrong_layer = kf.Port(
+            name="o1",
+            width=start.width,
+            trans=start.trans,
+            layer_info=layers.WGCLAD,
+            kcl=kcl,
+        )
+        with pytest.raises(kf.routing.generic.PlacerError):
+            kf.routing.optical.route_bundle(
+                c,
+                [wrong_layer],
+                [end],
+                5_000,
+                straight_factory=straight_factory_dbu,
+                bend90_cell=bend90_euler,
+                on_placer_error="error",
+                straight_mode=mode,
+            )
+
+    c = kcl.kcell("TEST_ROUTE_STRAIGHT_MODE_POLYGON_PURPOSE")
+    kf.routing.optical.route_bundle(
+        c,
+        [start],
+        [end],
+        5_000,
+        straight_factory=straight_factory_dbu,
+        bend90_cell=bend90_euler,
+        straight_mode="polygon",
+        purpose="test_purpose",
+    )
+    shapes = list(c.shapes(kcl.find_layer(layers.WG)).each())
+    assert shapes
+    assert all(
+        shape.property(kf.kcell.PROPID.PURPOSE) == "test_purpose" for shape in shapes
+    )
+
+
 def test_route_length_straight(
     optical_port: kf.Port,
     bend90_euler: kf.KCell,
@@ -1528,3 +1623,398 @@ def test_route_bundle_multi_return_opposite(
         bboxes=[b1, b2],
     )[0]
     oas_regression(c)
+
+
+def test_route_around_obstacles(
+    bend90: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+    layers: Layers,
+) -> None:
+    c = kcl.kcell("route_around_obstacles")
+    b90r = kf.routing.generic.get_radius(list(bend90.ports))
+    obstacles = [
+        kf.kdb.Box(50_000, -30_000, 100_000, 60_000),
+        kf.kdb.Box(150_000, 20_000, 200_000, 200_000),
+    ]
+    for box in obstacles:
+        c.shapes(c.kcl.find_layer(layers.WGCLAD)).insert(box)
+    start_ports = [
+        kf.Port(
+            name=f"in{i}",
+            width=500,
+            layer_info=layers.WG,
+            trans=kf.kdb.Trans(0, False, 0, i * 10_000),
+            kcl=c.kcl,
+        )
+        for i in range(3)
+    ]
+    end_ports = [
+        kf.Port(
+            name=f"out{i}",
+            width=500,
+            layer_info=layers.WG,
+            trans=kf.kdb.Trans(2, False, 300_000, 100_000 + i * 10_000),
+            kcl=c.kcl,
+        )
+        for i in range(3)
+    ]
+    routes = kf.routing.generic.route_bundle(
+        c=c,
+        start_ports=[p.base for p in start_ports],
+        end_ports=[p.base for p in end_ports],
+        ends=[],
+        starts=[],
+        routing_function=kf.routing.manhattan.route_around_obstacles,
+        routing_kwargs={
+            "bend90_radius": b90r,
+            "separation": 2000,
+            "obstacles": obstacles,
+        },
+        placer_function=kf.routing.optical.place_manhattan,
+        placer_kwargs={"bend90_cell": bend90, "straight_factory": straight_factory_dbu},
+    )
+    assert len(routes) == 3
+    wg = kf.kdb.Region(c.begin_shapes_rec(c.kcl.find_layer(layers.WG)))
+    blocked = kf.kdb.Region(obstacles)
+    assert (wg & blocked).is_empty()
+    for route in routes:
+        pts = route.backbone
+        assert pts[0] == route.start_port.trans.disp.to_p()
+        assert pts[-1] == route.end_port.trans.disp.to_p()
+        assert all(
+            (p1 - p2).length() >= 2 * b90r for p1, p2 in itertools.pairwise(pts[1:-1])
+        )
+
+
+def test_route_around_obstacles_escape_and_errors() -> None:
+    start = kf.kdb.Trans(0, False, 0, 0)
+    end = kf.kdb.Trans(2, False, 200_000, 0)
+    # the start lies inside an obstacle, e.g. the bbox of its instance
+    (router,) = kf.routing.manhattan.route_around_obstacles(
+        start_ports=[start],
+        end_ports=[end],
+        widths=[1000],
+        bend90_radius=10_000,
+        separation=1000,
+        obstacles=kf.kdb.Region(kf.kdb.Box(-10_000, -10_000, 0, 10_000)),
+    )
+    assert router.finished
+    assert router.start.pts == [start.disp.to_p(), end.disp.to_p()]
+
+    # the end is enclosed by four walls
+    walled = [
+        kf.kdb.Box(100_000, -100_000, 110_000, 100_000),
+        kf.kdb.Box(300_000, -100_000, 310_000, 100_000),
+        kf.kdb.Box(100_000, 100_000, 310_000, 110_000),
+        kf.kdb.Box(100_000, -110_000, 310_000, -100_000),
+    ]
+    with pytest.raises(ValueError, match="Could not find a route"):
+        kf.routing.manhattan.route_around_obstacles(
+            start_ports=[start],
+            end_ports=[end],
+            widths=[1000],
+            bend90_radius=10_000,
+            separation=1000,
+            obstacles=walled,
+        )
+    with pytest.raises(ValueError, match="bend90_radius"):
+        kf.routing.manhattan.route_around_obstacles(
+            start_ports=[start], end_ports=[end], widths=[1000]
+        )
+
+
+def test_route_around_obstacles_memory() -> None:
+    """The search memory follows the searched part of a large obstacle field."""
+    rng = np.random.default_rng(42)
+    cols, cell = 20, 80_000
+    obstacles = [
+        kf.kdb.Box(ox, oy, ox + w, oy + h).moved((i % cols) * cell, (i // cols) * cell)
+        for i, (w, h, ox, oy) in enumerate(
+            rng.integers(10_000, 30_000, (cols * cols, 4)).tolist()
+        )
+    ]
+    x = (cols // 2 - 3) * cell - 5_000
+    ys = [(cols // 2 - 2 + i) * cell - 5_000 for i in range(4)]
+    tracemalloc.start()
+    try:
+        routers = kf.routing.manhattan.route_around_obstacles(
+            start_ports=[kf.kdb.Trans(0, False, x, y) for y in ys],
+            end_ports=[kf.kdb.Trans(2, False, x + 6 * cell, y + cell) for y in ys],
+            widths=[500] * 4,
+            bend90_radius=10_000,
+            separation=2_000,
+            obstacles=obstacles,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert all(router.finished for router in routers)
+    # a cost array over all states of the track grid needs ~80MiB here
+    assert peak < 20 * 2**20
+
+
+def test_check_collisions(
+    bend90: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+    layers: Layers,
+) -> None:
+    c = kcl.kcell("check_collisions")
+
+    def port(name: str, trans: kf.kdb.Trans) -> kf.Port:
+        return kf.Port(name=name, width=500, layer_info=layers.WG, trans=trans, kcl=kcl)
+
+    start_ports = [
+        port("a0", kf.kdb.Trans(0, False, 0, 0)),
+        port("b0", kf.kdb.Trans(1, False, 100_000, -100_000)),
+        port("c0", kf.kdb.Trans(0, False, 0, 200_000)),
+    ]
+    end_ports = [
+        port("a1", kf.kdb.Trans(2, False, 200_000, 0)),
+        port("b1", kf.kdb.Trans(3, False, 100_000, 100_000)),
+        port("c1", kf.kdb.Trans(2, False, 200_000, 200_000)),
+    ]
+    routers: list[kf.routing.manhattan.ManhattanRouter] = []
+    routes: list[kf.routing.generic.ManhattanRoute] = []
+    for ps, pe in zip(start_ports, end_ports, strict=True):
+        router = kf.routing.manhattan.ManhattanRouter(
+            bend90_radius=10_000,
+            separation=2000,
+            start_transformation=ps.trans,
+            end_transformation=pe.trans,
+            start_points=[ps.trans.disp.to_p(), pe.trans.disp.to_p()],
+            width=500,
+        )
+        router.finished = True
+        routers.append(router)
+        routes.append(
+            kf.routing.optical.place_manhattan(
+                c,
+                ps,
+                pe,
+                router.start.pts,
+                straight_factory=straight_factory_dbu,
+                bend90_cell=bend90,
+            )
+        )
+    check = partial(
+        kf.routing.generic.check_collisions,
+        c=c,
+        start_ports=[p.base for p in start_ports],
+        end_ports=[p.base for p in end_ports],
+        on_collision="error",
+        collision_check_layers=[layers.WG, layers.WGCLAD],
+    )
+    # the third route does not cross any other
+    check(routers=routers[2:], routes=routes[2:])
+    with pytest.raises(RuntimeError, match="Routing collision"):
+        check(routers=routers, routes=routes)
+
+
+def test_router_collisions() -> None:
+    def old_collisions(pts: list[kf.kdb.Point]) -> kf.kdb.Edges:
+        p_start = pts[1]
+        edges = kf.kdb.Edges()
+        last_edge = kf.kdb.Edge(pts[0], p_start)
+        collisions = kf.kdb.Edges()
+        for p in pts[2:]:
+            new_edge = kf.kdb.Edges([kf.kdb.Edge(p_start, p)])
+            potential_collisions = edges.interacting(other=new_edge)
+            if not potential_collisions.is_empty():
+                collisions.join_with(potential_collisions).join_with(new_edge)
+            edges.insert(last_edge)
+            last_edge = kf.kdb.Edge(p_start, p)
+            p_start = p
+        return collisions
+
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        p = kf.kdb.Point(0, 0)
+        pts = [p]
+        for i, d in enumerate(rng.integers(1, 50, 60).tolist()):
+            p += kf.kdb.Vector(d * 1000, 0) if i % 2 else kf.kdb.Vector(0, d * 1000)
+            if rng.random() < 0.5:
+                p -= 2 * (p - pts[-1])
+            pts.append(p)
+        router = kf.routing.manhattan.ManhattanRouter(
+            bend90_radius=0,
+            separation=0,
+            start_transformation=kf.kdb.Trans(),
+            end_transformation=kf.kdb.Trans(pts[-1].to_v()),
+            start_points=pts,
+        )
+        collisions, edges = router.collisions(log_errors=None)
+        segments = list(itertools.starmap(kf.kdb.Edge, itertools.pairwise(pts)))
+        expected = {
+            s
+            for i, s in enumerate(segments)
+            for j, t in enumerate(segments)
+            if abs(i - j) > 1 and s.intersects(t)
+        }
+        assert edges.count() == len(segments)
+        assert set(collisions.each()) == expected
+        assert collisions.is_empty() == old_collisions(pts).is_empty()
+
+
+@pytest.mark.parametrize(
+    "loop_side",
+    [
+        kf.routing.optical.LoopSide.left,
+        kf.routing.optical.LoopSide.right,
+        kf.routing.optical.LoopSide.center,
+    ],
+)
+def test_path_length_match_batch(loop_side: kf.routing.optical.LoopSide) -> None:
+    n = 32
+    routers = kf.routing.manhattan.route_smart(
+        start_ports=[kf.kdb.Trans(1, False, i * 50_000, 0) for i in range(n)],
+        end_ports=[
+            kf.kdb.Trans(3, False, 700_000 + i * 5_000, 900_000 + (i % 3))
+            for i in range(n)
+        ],
+        widths=[500] * n,
+        bend90_radius=10_000,
+        separation=4_500,
+        starts=[[]] * n,
+        ends=[[]] * n,
+    )
+    lengths = kf.routing.manhattan._path_lengths(routers)
+    assert lengths.tolist() == [r.path_length for r in routers]
+    assert len(set(lengths.tolist())) > 1
+
+    kf.routing.optical.path_length_match(routers, loops=2, loop_side=loop_side)
+    matched = kf.routing.manhattan._path_lengths(routers)
+    assert matched.tolist() == [r.path_length for r in routers]
+    # odd lengths can only be matched to 1 dbu
+    assert matched.max() - matched.min() <= 1
+
+
+def test_route_template_cache(
+    optical_port: kf.Port,
+    bend90_euler: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+) -> None:
+    def route(
+        c: kf.KCell,
+        offset: kf.kdb.Vector,
+        route_cache: kf.routing.manhattan.RouteTemplateCache | None,
+    ) -> list[list[kf.kdb.Point]]:
+        t = kf.kdb.Trans(offset)
+        start_ports = [
+            optical_port.copy(t * kf.kdb.Trans(1, False, i * 20_000, 0))
+            for i in range(5)
+        ]
+        end_ports = [
+            optical_port.copy(t * kf.kdb.Trans(3, False, 300_000 + i * 5_000, 200_000))
+            for i in range(5)
+        ]
+        routes = kf.routing.optical.route_bundle(
+            c,
+            start_ports,
+            end_ports,
+            5_000,
+            straight_factory=straight_factory_dbu,
+            bend90_cell=bend90_euler,
+            bboxes=[t * kf.kdb.Box(-10_000, -20_000, 100_000, 0)],
+            on_collision="error",
+            route_cache=route_cache,
+        )
+        return [route.backbone for route in routes]
+
+    cache = kf.routing.manhattan.RouteTemplateCache()
+    c_cached = kcl.kcell("TEST_ROUTE_TEMPLATE_CACHE")
+    c_routed = kcl.kcell("TEST_ROUTE_TEMPLATE_CACHE_REF")
+    offsets = [kf.kdb.Vector(x, y) for x in (0, 1_000_000) for y in (0, -700_000)]
+    for offset in offsets:
+        assert route(c_cached, offset, cache) == route(c_routed, offset, None)
+    assert (cache.misses, cache.hits, len(cache)) == (1, 3, 1)
+
+    route(c_cached, kf.kdb.Vector(2_000_000, 0), cache)
+    assert cache.hits == 4
+    # a different configuration is a new template
+    bundle = kf.routing.optical.route_bundle(
+        c_cached,
+        [optical_port.copy(kf.kdb.Trans(1, False, 3_000_000, 0))],
+        [optical_port.copy(kf.kdb.Trans(3, False, 3_100_000, 100_000))],
+        5_000,
+        straight_factory=straight_factory_dbu,
+        bend90_cell=bend90_euler,
+        route_cache=cache,
+    )
+    assert len(bundle) == 1
+    assert (cache.misses, len(cache)) == (2, 2)
+
+
+@pytest.mark.parametrize("mirror", [False, True])
+@pytest.mark.parametrize("rot", range(4))
+def test_route_template_cache_rotated(
+    optical_port: kf.Port,
+    bend90_euler: kf.KCell,
+    straight_factory_dbu: Callable[..., kf.KCell],
+    kcl: kf.KCLayout,
+    rot: int,
+    mirror: bool,
+) -> None:
+    def route(
+        c: kf.KCell,
+        t: kf.kdb.Trans,
+        route_cache: kf.routing.manhattan.RouteTemplateCache | None,
+    ) -> list[list[kf.kdb.Point]]:
+        start_ports = [
+            optical_port.copy(t * kf.kdb.Trans(0, False, 0, i * 20_000))
+            for i in range(5)
+        ] + [optical_port.copy(t * kf.kdb.Trans(1, False, 50_000, 200_000))]
+        end_ports = [
+            optical_port.copy(t * kf.kdb.Trans(2, False, 300_000, -50_000 + i * 7_000))
+            for i in range(6)
+        ]
+        routes = kf.routing.optical.route_bundle(
+            c,
+            start_ports,
+            end_ports,
+            5_000,
+            straight_factory=straight_factory_dbu,
+            bend90_cell=bend90_euler,
+            bboxes=[t * kf.kdb.Box(-10_000, -20_000, 30_000, 100_000)],
+            on_collision="error",
+            route_cache=route_cache,
+        )
+        return [route.backbone for route in routes]
+
+    cache = kf.routing.manhattan.RouteTemplateCache()
+    c_cached = kcl.kcell(f"TEST_ROUTE_TEMPLATE_CACHE_R{rot}_M{mirror:d}")
+    c_routed = kcl.kcell(f"TEST_ROUTE_TEMPLATE_CACHE_R{rot}_M{mirror:d}_REF")
+    route(c_cached, kf.kdb.Trans(), cache)
+    t = kf.kdb.Trans(rot, mirror, 1_000_000, -500_000)
+    assert route(c_cached, t, cache) == route(c_routed, t, None)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_route_smart_max_workers() -> None:
+    start_ports: list[kf.kdb.Trans] = []
+    end_ports: list[kf.kdb.Trans] = []
+    for bundle in range(6):
+        x0 = bundle * 2_000_000
+        for i in range(4):
+            start_ports.append(kf.kdb.Trans(1, False, x0 + i * 20_000, 0))
+            end_ports.append(
+                kf.kdb.Trans(3, False, x0 + 300_000 + i * 20_000, 500_000 + bundle)
+            )
+
+    def route(max_workers: int) -> list[tuple[list[kf.kdb.Point], ...]]:
+        routers = kf.routing.manhattan.route_smart(
+            start_ports=start_ports,
+            end_ports=end_ports,
+            widths=[1000] * len(start_ports),
+            bend90_radius=10_000,
+            separation=5000,
+            starts=[[]] * len(start_ports),
+            ends=[[]] * len(start_ports),
+            max_workers=max_workers,
+        )
+        assert all(router.finished for router in routers)
+        return [(router.start.pts, router.end.pts) for router in routers]
+
+    assert route(2) == route(1)
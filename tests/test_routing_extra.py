@@ -9,7 +9,9 @@ import pytest
 import kfactory as kf
 from kfactory.routing.electrical import (
     place_dual_rails,
+    place_dual_rails_bundle,
     place_single_wire,
+    place_single_wire_bundle,
     route_bundle,
     route_bundle_dual_rails,
     route_dual_rails,
@@ -93,6 +95,22 @@ def test_place_single_wire_basic(kcl: kf.KCLayout, layers: Layers) -> None:
     assert route.length_straights == 50_000
 
 
+def test_place_single_wire_length_multi_segment(
+    kcl: kf.KCLayout, layers: Layers
+) -> None:
+    c = kcl.kcell("psw_multi_segment")
+    p1 = _e_port(kcl, layers, "in", 0, 0, 0)
+    p2 = _e_port(kcl, layers, "out", 2, 50_000, 30_000)
+    pts = [
+        kf.kdb.Point(0, 0),
+        kf.kdb.Point(20_000, 0),
+        kf.kdb.Point(20_000, 30_000),
+        kf.kdb.Point(50_000, 30_000),
+    ]
+    route = place_single_wire(c, p1, p2, pts)
+    assert route.length_straights == 80_000
+
+
 def test_place_single_wire_extra_kwargs_raises(
     kcl: kf.KCLayout, layers: Layers
 ) -> None:
@@ -158,6 +176,89 @@ def test_place_dual_rails_extra_kwargs_raises(kcl: kf.KCLayout, layers: Layers)
         place_dual_rails(c, p1, p2, pts, separation_rails=1000, junk=1)
 
 
+def _e_bundle(
+    kcl: kf.KCLayout, layers: Layers, n: int, width: int = 4000
+) -> tuple[list[kf.Port], list[kf.Port], list[list[kf.kdb.Point]]]:
+    start_ports = [
+        _e_port(kcl, layers, f"in{i}", 0, 0, i * 10_000, width) for i in range(n)
+    ]
+    end_ports = [
+        _e_port(kcl, layers, f"out{i}", 3, 50_000 + i * 10_000, -50_000, width)
+        for i in range(n)
+    ]
+    backbones = [
+        [
+            kf.kdb.Point(0, i * 10_000),
+            kf.kdb.Point(50_000 + i * 10_000, i * 10_000),
+            kf.kdb.Point(50_000 + i * 10_000, -50_000),
+        ]
+        for i in range(n)
+    ]
+    return start_ports, end_ports, backbones
+
+
+def test_place_single_wire_bundle(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell("psw_bundle")
+    c_ref = kcl.kcell("psw_bundle_ref")
+    start_ports, end_ports, backbones = _e_bundle(kcl, layers, 5)
+    routes = place_single_wire_bundle(
+        c, start_ports, end_ports, backbones, route_width=[1000, 2000] * 2 + [1000]
+    )
+    ref = [
+        place_single_wire(c_ref, p1, p2, pts, route_width=w)
+        for p1, p2, pts, w in zip(
+            start_ports, end_ports, backbones, [1000, 2000] * 2 + [1000], strict=True
+        )
+    ]
+    assert [r.length_straights for r in routes] == [r.length_straights for r in ref]
+    assert [r.polygons for r in routes] == [r.polygons for r in ref]
+    layer = c.layer(layers.METAL1)
+    assert (
+        kf.kdb.Region(c.shapes(layer)) ^ kf.kdb.Region(c_ref.shapes(layer))
+    ).is_empty()
+
+    with pytest.raises(ValueError, match="one width per route"):
+        place_single_wire_bundle(c, start_ports, end_ports, backbones, [1000])
+
+
+def test_place_single_wire_bundle_merge(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell("psw_bundle_merge")
+    p1 = _e_port(kcl, layers, "in", 0, 0, 0)
+    p2 = _e_port(kcl, layers, "out", 2, 50_000, 0)
+    pts = [kf.kdb.Point(0, 0), kf.kdb.Point(50_000, 0)]
+    routes = place_single_wire_bundle(c, [p1, p1], [p2, p2], [pts, pts], merge=True)
+    assert len(routes) == 2
+    assert c.shapes(c.layer(layers.METAL1)).size() == 1
+
+
+def test_place_dual_rails_bundle(kcl: kf.KCLayout, layers: Layers) -> None:
+    c = kcl.kcell("pdr_bundle")
+    c_ref = kcl.kcell("pdr_bundle_ref")
+    start_ports, end_ports, backbones = _e_bundle(kcl, layers, 4)
+    routes = place_dual_rails_bundle(
+        c, start_ports, end_ports, backbones, separation_rails=1000
+    )
+    ref = [
+        place_dual_rails(c_ref, p1, p2, pts, separation_rails=1000)
+        for p1, p2, pts in zip(start_ports, end_ports, backbones, strict=True)
+    ]
+    for route, ref_route in zip(routes, ref, strict=True):
+        assert (
+            kf.kdb.Region(route.polygons[layers.METAL1])
+            ^ kf.kdb.Region(ref_route.polygons[layers.METAL1])
+        ).is_empty()
+    layer = c.layer(layers.METAL1)
+    assert (
+        kf.kdb.Region(c.shapes(layer)) ^ kf.kdb.Region(c_ref.shapes(layer))
+    ).is_empty()
+    assert all(shape.prop_id == 0 for shape in c.shapes(layer).each())
+
+    with pytest.raises(ValueError, match="must be smaller"):
+        place_dual_rails_bundle(
+            c, start_ports, end_ports, backbones, separation_rails=5000
+        )
+
+
 def test_route_dual_rails(kcl: kf.KCLayout, layers: Layers) -> None:
     c = kcl.kcell("rdr_basic")
     p1 = _e_port(kcl, layers, "in", 0, 0, 0, width=4000)
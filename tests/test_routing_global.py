@@ -0,0 +1,184 @@
+"""Tests for kfactory.routing.global_routing module."""
+
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+
+import kfactory as kf
+from kfactory.routing.global_routing import GlobalRouter, route_bundles_global
+from kfactory.spatial import collect_instance_region
+from tests.conftest import Layers
+
+FLOORPLAN = kf.kdb.Box(-100_000, -300_000, 700_000, 320_000)
+
+
+def _ports(
+    kcl: kf.KCLayout, prefix: str, x: int, y: int, angle: int, n: int = 4
+) -> list[kf.Port]:
+    """Ports stacked along y for horizontal angles and along x for vertical ones."""
+    dx, dy = (0, 2500) if angle % 2 == 0 else (2500, 0)
+    return [
+        kf.Port(
+            name=f"{prefix}{i}",
+            width=500,
+            layer_info=Layers().WG,
+            kcl=kcl,
+            trans=kf.kdb.Trans(angle, False, x + i * dx, y + i * dy),
+        )
+        for i in range(n)
+    ]
+
+
+def _gap_cell(name: str) -> tuple[kf.KCell, list[tuple[list[kf.Port], list[kf.Port]]]]:
+    """Two blocks with a gap which only fits one of two bundles."""
+    kcl = kf.KCLayout(name, infos=Layers)
+    c = kcl.kcell("top")
+    block = kcl.kcell("block")
+    block.shapes(kcl.layer(Layers().WG)).insert(kf.kdb.Box(0, 0, 200_000, 200_000))
+    (c << block).transform(kf.kdb.Trans(200_000, -200_000))
+    (c << block).transform(kf.kdb.Trans(200_000, 20_000))
+    bundles = [
+        (_ports(kcl, "a", 0, 5_000, 0), _ports(kcl, "b", 600_000, 5_000, 2)),
+        (_ports(kcl, "c", 0, 42_000, 0), _ports(kcl, "d", 600_000, 42_000, 2)),
+    ]
+    return c, bundles
+
+
+def test_global_router_congestion() -> None:
+    c, bundles = _gap_cell("GLOBAL_ROUTER_CONGESTION")
+    router = GlobalRouter(
+        FLOORPLAN, 20_000, [inst.bbox() for inst in c.insts], separation=2_000
+    )
+    gap, detour = router.route(bundles)
+
+    assert not router.overflow().any()
+    # the second bundle was ripped up and rerouted around the upper block
+    assert router.iterations > 1
+    assert gap.waypoints is not None
+    assert detour.waypoints is not None
+    assert [p.y for p in gap.waypoints] == [8_750, 8_750]
+    assert max(p.y for p in detour.waypoints) >= 220_000
+    # the bundles stay in line with their ports
+    assert detour.waypoints[0].y == detour.waypoints[-1].y == 45_750
+
+
+def test_route_bundles_global() -> None:
+    c, bundles = _gap_cell("ROUTE_BUNDLES_GLOBAL")
+    kcl = c.kcl
+    route_debug = kf.routing.utils.RouteDebug()
+    routes = route_bundles_global(
+        c,
+        bundles,
+        partial(
+            kf.routing.optical.route_bundle,
+            straight_factory=partial(
+                kf.factories.straight.straight_dbu_factory(kcl=kcl),
+                layer=Layers().WG,
+            ),
+            bend90_cell=kf.factories.circular.bend_circular_factory(kcl=kcl)(
+                width=0.5, radius=5, layer=Layers().WG, angle=90
+            ),
+            on_collision="error",
+        ),
+        separation=2_000,
+        gcell_size=20_000,
+        floorplan=FLOORPLAN,
+        route_debug=route_debug,
+    )
+    assert [len(bundle_routes) for bundle_routes in routes] == [4, 4]
+    assert route_debug.counters["global_routing_iterations"] > 1
+    assert route_debug.counters["waypoints"] == 2
+
+
+def test_global_router_blocked() -> None:
+    kcl = kf.KCLayout("GLOBAL_ROUTER_BLOCKED", infos=Layers)
+    # a wall across the whole floorplan
+    router = GlobalRouter(
+        FLOORPLAN, 20_000, [kf.kdb.Box(200_000, -300_000, 220_000, 320_000)]
+    )
+    with pytest.raises(ValueError, match="No global route found"):
+        router.route([(_ports(kcl, "a", 0, 0, 0), _ports(kcl, "b", 600_000, 0, 2))])
+
+
+def test_global_router_same_gcell() -> None:
+    kcl = kf.KCLayout("GLOBAL_ROUTER_SAME_GCELL", infos=Layers)
+    router = GlobalRouter(FLOORPLAN, 100_000)
+    (route,) = router.route(
+        [(_ports(kcl, "a", 0, 0, 0), _ports(kcl, "b", 50_000, 0, 2))]
+    )
+    assert route.waypoints is None
+
+
+def _crossing_cell(
+    name: str,
+) -> tuple[kf.KCell, list[tuple[list[kf.Port], list[kf.Port]]]]:
+    """Two bundles which cross unless the second one turns before the first."""
+    kcl = kf.KCLayout(name, infos=Layers)
+    c = kcl.kcell("top")
+    # the end ports are reversed, the bundles turn left once
+    bundles = [
+        (
+            _ports(kcl, "a", 390_000, 126_250, 2),
+            _ports(kcl, "b", 166_250, 10_000, 1)[::-1],
+        ),
+        (
+            _ports(kcl, "c", 10_000, 106_250, 0),
+            _ports(kcl, "d", 226_250, 390_000, 3)[::-1],
+        ),
+    ]
+    return c, bundles
+
+
+def test_global_router_crossing() -> None:
+    _, bundles = _crossing_cell("GLOBAL_ROUTER_CROSSING")
+    router = GlobalRouter(kf.kdb.Box(0, 0, 400_000, 400_000), 20_000, separation=2_000)
+    routes = router.route(bundles)
+
+    assert not router.crossings().any()
+    regions = []
+    for route in routes:
+        assert route.waypoints is not None
+        regions.append(
+            kf.kdb.Region(kf.kdb.Path(route.waypoints, route.demand).polygon())
+        )
+    assert (regions[0] & regions[1]).is_empty()
+
+
+def test_route_bundles_global_crossing() -> None:
+    c, bundles = _crossing_cell("ROUTE_BUNDLES_GLOBAL_CROSSING")
+    kcl = c.kcl
+    routes = route_bundles_global(
+        c,
+        bundles,
+        partial(
+            kf.routing.optical.route_bundle,
+            straight_factory=partial(
+                kf.factories.straight.straight_dbu_factory(kcl=kcl),
+                layer=Layers().WG,
+            ),
+            bend90_cell=kf.factories.circular.bend_circular_factory(kcl=kcl)(
+                width=0.5, radius=5, layer=Layers().WG, angle=90
+            ),
+            on_collision="error",
+        ),
+        separation=2_000,
+        gcell_size=20_000,
+        floorplan=kf.kdb.Box(0, 0, 400_000, 400_000),
+    )
+    assert [len(bundle_routes) for bundle_routes in routes] == [4, 4]
+    # the detailed router only checks each bundle on its own
+    layer = kcl.layer(Layers().WG)
+    first, second = (
+        sum(
+            (
+                collect_instance_region(c, layer, inst)
+                for route in bundle_routes
+                for inst in route.instances
+            ),
+            kf.kdb.Region(),
+        )
+        for bundle_routes in routes
+    )
+    assert (first & second).is_empty()
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import json
+from typing import TYPE_CHECKING
+
 import kfactory as kf
 from kfactory.routing.utils import RouteDebug
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 def test_route_debug_defaults() -> None:
     rd = RouteDebug()
@@ -103,3 +109,146 @@ def test_route_debug_to_markers_with_text_properties() -> None:
     markers = rd.to_markers(dbu=kcl.dbu)
     # markers list should include polygons + their parsed text labels
     assert len(markers) > 3
+
+
+def test_route_debug_stage_and_count(tmp_path: Path) -> None:
+    rd = RouteDebug()
+    with rd.stage("routing"):
+        pass
+    with rd.stage("routing"):
+        rd.count("routes", 3)
+    assert rd.counters == {"routes": 3, "routing": 2}
+    assert rd.timings["routing"] >= 0
+
+    path = tmp_path / "route_debug.json"
+    stats = json.loads(rd.to_json(path))
+    assert stats == json.loads(path.read_text())
+    assert stats["counters"] == rd.counters
+    assert stats["timings"] == rd.timings
+
+
+def test_route_debug_stage_timings() -> None:
+    """route_bundle records the time and counts of each stage."""
+    from tests.conftest import Layers
+
+    rd = RouteDebug()
+    layers = Layers()
+    kcl = kf.KCLayout("ROUTE_DEBUG_TIMINGS", infos=Layers)
+    c = kcl.kcell(name="route_debug_timings")
+    transformations = [kf.kdb.Trans(0, False, 0, i * 50_000) for i in range(3)]
+    start_ports = [
+        kf.Port(name=f"in{i}", width=500, layer_info=layers.WG, kcl=kcl, trans=trans)
+        for i, trans in enumerate(transformations)
+    ]
+    end_ports = [
+        kf.Port(
+            name=f"out_{i}",
+            width=500,
+            layer_info=layers.WG,
+            kcl=kcl,
+            trans=kf.kdb.Trans(2, False, 500_000, 200_000 + i * 50_000),
+        )
+        for i in range(3)
+    ]
+    bend90 = kf.factories.circular.bend_circular_factory(kcl=kcl)(
+        width=0.5, radius=5, layer=layers.WG, angle=90
+    )
+    sf = kf.factories.straight.straight_dbu_factory(kcl=kcl)
+
+    routes = kf.routing.optical.route_bundle(  # ty:ignore[no-matching-overload]
+        c,
+        start_ports,
+        end_ports,
+        separation=4000,
+        straight_factory=lambda **kwargs: sf(layer=layers.WG, **kwargs),
+        bend90_cell=bend90,
+        route_debug=rd,
+    )
+
+    for stage in ("routing", "bundle_routing", "placement", "collision_check"):
+        assert stage in rd.timings
+        assert rd.counters[stage] == 1
+    assert rd.counters["routes"] == 3
+    assert rd.counters["bend90"] == sum(route.n_bend90 for route in routes)
+    # the routes are all the same shape, so only the first one creates straights
+    n_straights = rd.counters["straight_factory"]
+    assert 0 < rd.counters["straight_factory_cache_hits"] < n_straights
+    assert "straight_factory" in json.loads(rd.to_json())["timings"]
+
+
+def test_route_debug_sbend_and_placer_stages() -> None:
+    """The placer and the S-bend fallback are recorded as their own stages."""
+    from tests.conftest import Layers
+
+    rd = RouteDebug()
+    layers = Layers()
+    kcl = kf.KCLayout("ROUTE_DEBUG_SBEND", infos=Layers)
+    c = kcl.kcell(name="route_debug_sbend")
+    start_port = kf.Port(
+        name="in", width=500, layer_info=layers.WG, kcl=kcl, trans=kf.kdb.Trans.R0
+    )
+    end_port = kf.Port(
+        name="out",
+        width=500,
+        layer_info=layers.WG,
+        kcl=kcl,
+        trans=kf.kdb.Trans(2, False, 200_000, 5_000),
+    )
+    bend90 = kf.factories.circular.bend_circular_factory(kcl=kcl)(
+        width=0.5, radius=5, layer=layers.WG, angle=90
+    )
+    sf = kf.factories.straight.straight_dbu_factory(kcl=kcl)
+
+    def sbend_factory(
+        c: kf.KCell, offset: int, length: int, width: int
+    ) -> kf.InstanceGroup:
+        ig = kf.InstanceGroup()
+        sbend = c << kf.cells.euler.bend_s_euler(
+            offset=c.kcl.to_um(offset),
+            width=c.kcl.to_um(width),
+            radius=10,
+            layer=layers.WG,
+        )
+        ig.add(sbend)
+        ig.add_port(name="o1", port=sbend.ports["o1"])
+        ig.add_port(name="o2", port=sbend.ports["o2"])
+        return ig
+
+    kf.routing.optical.route_bundle(  # ty:ignore[no-matching-overload]
+        c,
+        [start_port],
+        [end_port],
+        separation=4000,
+        straight_factory=lambda **kwargs: sf(layer=layers.WG, **kwargs),
+        bend90_cell=bend90,
+        sbend_factory=sbend_factory,
+        route_debug=rd,
+    )
+
+    assert rd.counters["sbend_routes"] == 1
+    assert rd.counters["sbend_factory"] == 1
+    assert rd.counters["placement.place_manhattan_with_sbends"] == 1
+    assert (
+        rd.timings["placement.place_manhattan_with_sbends"] <= (rd.timings["placement"])
+    )
+
+
+def test_route_debug_port_sorting() -> None:
+    """Only the sorting calls of route_smart are timed as port_sorting."""
+    rd = RouteDebug()
+    n = 4
+    kf.routing.manhattan.route_smart(
+        start_ports=[kf.kdb.Trans(1, False, i * 20_000, 0) for i in range(n)],
+        end_ports=[kf.kdb.Trans(3, False, i * 20_000, 500_000) for i in range(n)],
+        widths=[1000] * n,
+        bend90_radius=10_000,
+        separation=5000,
+        starts=[[]] * n,
+        ends=[[]] * n,
+        bboxes=[],
+        sort_ports=True,
+        route_debug=rd,
+    )
+    # one sorting call for the start and one for the end bundle
+    assert rd.counters["port_sorting"] == 2
+    assert rd.timings["port_sorting"] >= 0
@@ -0,0 +1,132 @@
+import numpy as np
+
+import kfactory as kf
+from kfactory.spatial import (
+    BoxIndex,
+    collect_instance_region,
+    interacting_edge_pairs,
+    iter_overlapping_bbox_pairs,
+)
+from tests.conftest import Layers
+
+
+def _random_boxes(n: int, seed: int = 0) -> list[kf.kdb.Box]:
+    rng = np.random.default_rng(seed)
+    x, y = rng.integers(0, 10_000, (2, n))
+    w, h = rng.integers(0, 500, (2, n))
+    boxes = [
+        kf.kdb.Box(int(x_), int(y_), int(x_ + w_), int(y_ + h_))
+        for x_, y_, w_, h_ in zip(x, y, w, h, strict=True)
+    ]
+    # long horizontal buses sharing one x-range
+    boxes.extend(kf.kdb.Box(0, i * 300, 10_000, i * 300 + 100) for i in range(30))
+    boxes.append(kf.kdb.Box())
+    return boxes
+
+
+def test_box_index_overlapping_pairs() -> None:
+    boxes = _random_boxes(500)
+    expected = sorted(
+        (i, j)
+        for i, a in enumerate(boxes)
+        for j in range(i + 1, len(boxes))
+        if not (a & boxes[j]).empty()
+    )
+    index = BoxIndex(boxes, node_size=4)
+    assert len(index) == len(boxes) - 1
+    assert [tuple(p) for p in index.overlapping_pairs().tolist()] == expected
+    assert (
+        sorted((min(p), max(p)) for p in iter_overlapping_bbox_pairs(boxes)) == expected
+    )
+
+
+def test_box_index_query() -> None:
+    boxes = _random_boxes(300, seed=1)
+    index = BoxIndex(boxes)
+    for query in (
+        kf.kdb.Box(2000, 2000, 2500, 4000),
+        kf.kdb.Box(9_999, 0, 20_000, 100),
+        kf.kdb.Box(-100, -100, -50, -50),
+    ):
+        assert index.query(query) == [
+            i for i, b in enumerate(boxes) if not (b & query).empty()
+        ]
+    assert index.query(kf.kdb.Box()) == []
+
+
+def test_box_index_nearest() -> None:
+    boxes = _random_boxes(300, seed=2)
+    index = BoxIndex(boxes)
+    query = kf.kdb.Box(5000, 12_000, 5100, 12_100)
+
+    def distance(box: kf.kdb.Box) -> float:
+        dx = max(0, box.left - query.right, query.left - box.right)
+        dy = max(0, box.bottom - query.top, query.bottom - box.top)
+        return float(np.hypot(dx, dy))
+
+    expected = sorted(
+        (i for i, b in enumerate(boxes) if not b.empty()),
+        key=lambda i: (distance(boxes[i]), i),
+    )
+    assert index.nearest(query, k=10) == expected[:10]
+    assert BoxIndex([]).nearest(query) == []
+
+
+def test_box_index_dbox() -> None:
+    boxes = [kf.kdb.DBox(0, 0, 1.5, 1), kf.kdb.DBox(1.5, 0.5, 2, 2)]
+    index = BoxIndex(boxes)
+    assert index.overlapping_pairs().tolist() == [[0, 1]]
+    assert index.query(kf.kdb.DBox(1.75, 1.75, 3, 3)) == [1]
+
+
+def test_collect_instance_region(kcl: kf.KCLayout, layers: Layers) -> None:
+    layer = kcl.layer(layers.WG)
+    child = kcl.kcell("region_child")
+    child.shapes(layer).insert(kf.kdb.Box(0, 0, 1000, 500))
+    nested = kcl.kcell("region_nested")
+    nested.shapes(layer).insert(kf.kdb.Box(0, 0, 100, 100))
+    child.create_inst(nested, kf.kdb.Trans(2000, 0))
+    parent = kcl.kcell("region_parent")
+    array = parent.create_inst(
+        child,
+        kf.kdb.Trans(1, False, 0, 0),
+        a=kf.kdb.Vector(0, 3000),
+        b=kf.kdb.Vector(5000, 0),
+        na=2,
+        nb=3,
+    )
+    single = parent.create_inst(child, kf.kdb.ICplxTrans(2, 45, False, 100, 100))
+
+    cache: dict[tuple[int, int], kf.kdb.Region] = {}
+    for inst in (array, single):
+        expected = kf.kdb.Region()
+        for cplx_trans in inst.instance.cell_inst.each_cplx_trans():
+            expected.insert(
+                kf.kdb.Region(child.begin_shapes_rec(layer)).transformed(cplx_trans)
+            )
+        region = collect_instance_region(parent, layer, inst, cache)
+        assert (region ^ expected).is_empty()
+    assert list(cache) == [(child.cell_index(), layer)]
+
+
+def test_interacting_edge_pairs() -> None:
+    rng = np.random.default_rng(1)
+    edges: list[kf.kdb.Edge] = []
+    for x, y, length, kind in zip(
+        *rng.integers(0, 1000, (3, 300)), rng.integers(0, 3, 300), strict=True
+    ):
+        p = kf.kdb.Point(int(x), int(y))
+        match kind:
+            case 0:
+                edges.append(kf.kdb.Edge(p, p + kf.kdb.Vector(int(length), 0)))
+            case 1:
+                edges.append(kf.kdb.Edge(p, p + kf.kdb.Vector(0, int(length))))
+            case _:
+                edges.append(kf.kdb.Edge(p, p + kf.kdb.Vector(int(length), 50)))
+    expected = [
+        (i, j)
+        for i, a in enumerate(edges)
+        for j in range(i + 1, len(edges))
+        if a.intersects(edges[j])
+    ]
+    assert interacting_edge_pairs(edges) == expected
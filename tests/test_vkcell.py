@@ -1,4 +1,5 @@
 import klayout.db as kdb
+import pytest
 
 import kfactory as kf
 
@@ -156,3 +157,69 @@ def test_vkcell_flatten_is_idempotent() -> None:
     parent.flatten()
 
     assert parent.shapes(layer).size() == 1
+
+
+def test_vinstance_insert_into_reuses_materialized_cell() -> None:
+    kcl = kf.KCLayout("test_vinstance_insert_into_reuses_materialized_cell")
+    layer = kcl.layer(kdb.LayerInfo(1, 0))
+    trans = kdb.DCplxTrans(1.0, 30, False, 0.0, 0.0)
+
+    src = kcl.vkcell("src")
+    src.shapes(layer).insert(kdb.DBox(0, 0, 10, 1))
+    src.shapes(layer).insert(kdb.DBox(5, 0, 15, 1))
+    src.locked = True
+
+    parent_a = kcl.kcell("parent_a")
+    parent_b = kcl.kcell("parent_b")
+    inst_a = kf.VInstance(src, trans=trans).insert_into(parent_a)
+    inst_b = kf.VInstance(src, trans=trans).insert_into(parent_b)
+
+    assert inst_a.cell_index == inst_b.cell_index
+    assert inst_a.cell.virtual
+    assert inst_a.cell.shapes(layer).size() == 1
+    assert inst_a.dbbox() == inst_b.dbbox()
+
+
+def test_vshapes_categories() -> None:
+    kcl = kf.KCLayout("test_vshapes_categories")
+    layer = kcl.layer(kdb.LayerInfo(1, 0))
+    c = kcl.vkcell("c")
+    shapes = c.shapes(layer)
+    shapes.insert(kdb.DBox(0, 0, 10, 1))
+    shapes.insert(kdb.Box(0, 0, 1000, 20_000))
+    shapes.insert(kdb.Region(kdb.Box(-5000, 0, 0, 1000)))
+    shapes.insert(kdb.DPath([kdb.DPoint(0, 0), kdb.DPoint(0, -5)], 1))
+    shapes.insert(kdb.DText("a", kdb.DTrans(1, 1)))
+    assert shapes.size() == 5
+    assert shapes.bbox() == kdb.DBox(-5, -5, 10, 20)
+
+    trans = kdb.DCplxTrans(1, 90, False, 1, 0)
+    transformed = shapes.transform(trans)
+    assert transformed.bbox() == shapes.bbox().transformed(trans)
+
+    region = shapes.to_region(trans, kcl.dbu)
+    assert region.count() == 4
+    assert region.bbox() == kcl.to_dbu(transformed.bbox())
+    assert shapes.to_texts(trans, kcl.dbu).count() == 1
+
+
+def test_vshapes_insert_shape() -> None:
+    kcl = kf.KCLayout("test_vshapes_insert_shape")
+    layer = kcl.layer(kdb.LayerInfo(1, 0))
+    src = kcl.kcell("src").shapes(layer)
+    edge = src.insert(kdb.Edge(0, 0, 1000, 0))
+    path = src.insert(kdb.Path([kdb.Point(0, 0), kdb.Point(0, 2000)], 100))
+    box = src.insert(kdb.Box(0, 0, 500, 500))
+    edge_pair = src.insert(kdb.EdgePair(kdb.Edge(0, 0, 1, 0), kdb.Edge(0, 1, 1, 1)))
+
+    shapes = kcl.vkcell("c").shapes(layer)
+    for shape in (edge, path, box):
+        shapes.insert(shape)
+    assert list(shapes) == [
+        kdb.DPolygon(kdb.DBox(0, 0, 0.5, 0.5)),
+        kdb.DPath([kdb.DPoint(0, 0), kdb.DPoint(0, 2)], 0.1),
+        kdb.DEdge(0, 0, 1, 0),
+    ]
+    assert shapes.bbox() == kdb.DBox(-0.05, 0, 1, 2)
+    with pytest.raises(TypeError):
+        shapes.insert(edge_pair)